@@ -0,0 +1,110 @@
+"""Action encodings that name a whole move rather than just a piece.
+
+``OriginsEnv`` takes a square and plays that piece's first valid move, so the
+agent never chooses where a slider stops, which capture to make or where a
+man/woman steps. These envs decode an action into a (from, to) pair with one
+table lookup:
+
+- ``FromToOriginsEnv``: ``from_square * 80 + to_square``
+- ``DirectionOriginsEnv``: ``(from_square * 8 + direction) * 9 + distance - 1``
+  over ``SLIDE_DIRECTIONS``; men/women only ever use distance 1
+
+An action naming a piece of the side to move that can move, but not to that
+square, costs -1 and changes nothing, like selecting an empty square; a piece
+with no moves at all behaves as in ``OriginsEnv``. ``action_masks()`` marks
+exactly the legal moves. With ``perspective="side_to_move"`` actions and
+masks are flipped along with the observation (see ``FLIPPED_ACTIONS``).
+"""
+
+import numpy as np
+from gym.spaces import Discrete
+
+from origins_env import GRID_ROWS, GRID_COLS, SLIDE_DIRECTIONS, FACTION_CODES, FACTION_SIGN, FLIP_SQUARES, OriginsEnv
+
+SIZE = GRID_ROWS * GRID_COLS
+MAX_DISTANCE = max(GRID_ROWS, GRID_COLS) - 1
+
+# FROM_TO_MOVES[action] = (from, to); FROM_TO_ACTIONS[from, to] = action
+FROM_TO_MOVES = np.array([divmod(action, SIZE) for action in range(SIZE * SIZE)], dtype=np.intp)
+FROM_TO_ACTIONS = np.arange(SIZE * SIZE, dtype=np.intp).reshape(SIZE, SIZE)
+
+
+def _direction_tables():
+    # DIRECTION_MOVES[action] = (from, to), to -1 off the board;
+    # DIRECTION_ACTIONS[from, to] = action, -1 if to is not on a line from from
+    moves = np.full((SIZE * len(SLIDE_DIRECTIONS) * MAX_DISTANCE, 2), -1, dtype=np.intp)
+    actions = np.full((SIZE, SIZE), -1, dtype=np.intp)
+    action = 0
+    for square in range(SIZE):
+        row, col = divmod(square, GRID_COLS)
+        for dr, dc in SLIDE_DIRECTIONS:
+            for distance in range(1, MAX_DISTANCE + 1):
+                r, c = row + dr * distance, col + dc * distance
+                moves[action, 0] = square
+                if 0 <= r < GRID_ROWS and 0 <= c < GRID_COLS:
+                    moves[action, 1] = r * GRID_COLS + c
+                    actions[square, r * GRID_COLS + c] = action
+                action += 1
+    return moves, actions
+
+
+DIRECTION_MOVES, DIRECTION_ACTIONS = _direction_tables()
+
+# Each encoding's actions seen from the other side (see OriginsEnv.FLIPPED_ACTIONS):
+# both squares flipped top to bottom, directions with their row step negated
+FLIP_DIRECTIONS = np.array([SLIDE_DIRECTIONS.index((-dr, dc)) for dr, dc in SLIDE_DIRECTIONS], dtype=np.intp)
+FROM_TO_FLIPPED = FLIP_SQUARES[FROM_TO_MOVES[:, 0]] * SIZE + FLIP_SQUARES[FROM_TO_MOVES[:, 1]]
+DIRECTION_FLIPPED = np.arange(len(DIRECTION_MOVES)).reshape(
+    SIZE, len(SLIDE_DIRECTIONS), MAX_DISTANCE
+)[FLIP_SQUARES][:, FLIP_DIRECTIONS].reshape(-1)
+
+
+class _MoveActionEnv(OriginsEnv):
+    # Subclasses set the (action -> move) and ((from, to) -> action) tables
+    MOVES = ACTIONS = None
+
+    def __init__(self, movegen="scalar", **kwargs):
+        super(_MoveActionEnv, self).__init__(movegen, **kwargs)
+        self.action_space = Discrete(len(self.MOVES))
+
+    def decode_action(self, action):
+        """(from square, to square) of an action; to is -1 off the board."""
+        start, end = self.MOVES[int(action)]
+        return int(start), int(end)
+
+    def encode_move(self, start, end):
+        """Action for a move between two (row, col) squares."""
+        return int(self.ACTIONS[start[0] * GRID_COLS + start[1], end[0] * GRID_COLS + end[1]])
+
+    def step(self, action):
+        action = self._absolute_action(action)
+        if not 0 <= action < len(self.MOVES):
+            return self.get_observation(), -1, False, {}
+        return self._play_square(*self.decode_action(action))
+
+    def action_masks(self):
+        """Legal moves of the side to move as a bool array over the action space.
+
+        If there are none, every action from one of its pieces is left valid,
+        since choosing one ends the game.
+        """
+        mask = np.zeros(len(self.MOVES), dtype=bool)
+        moves = self.legal_moves()
+        if len(moves):
+            mask[self.ACTIONS[moves[:, 0], moves[:, 1]]] = True
+        else:
+            own = np.isin(self._flat, FACTION_CODES[FACTION_SIGN[self.turn]])
+            mask[own[self.MOVES[:, 0]]] = True
+        return self._perspective_mask(mask)
+
+
+class FromToOriginsEnv(_MoveActionEnv):
+    """``OriginsEnv`` with ``Discrete(80 * 80)`` (from, to) actions."""
+
+    MOVES, ACTIONS, FLIPPED_ACTIONS = FROM_TO_MOVES, FROM_TO_ACTIONS, FROM_TO_FLIPPED
+
+
+class DirectionOriginsEnv(_MoveActionEnv):
+    """``OriginsEnv`` with piece, direction and distance actions."""
+
+    MOVES, ACTIONS, FLIPPED_ACTIONS = DIRECTION_MOVES, DIRECTION_ACTIONS, DIRECTION_FLIPPED
@@ -0,0 +1,390 @@
+"""Batched Origins engine: N games stepped together with NumPy array operations.
+
+``BatchedOriginsEngine`` holds every board in one (N, GRID_ROWS, GRID_COLS) int8
+array, using the piece codes of ``OriginsEnv``, plus per-game turn, Man/Woman
+position and arrival arrays. A step applies one action per game with the same
+rules and rewards as ``OriginsEnv.step`` and resets finished games.
+``OriginsVecEnv`` exposes it to Stable-Baselines3 as a ``VecEnv``.
+"""
+
+import numpy as np
+from stable_baselines3.common.vec_env.base_vec_env import VecEnv
+
+from origins_env import (
+    GRID_ROWS, GRID_COLS, TABLES, ARRIVED_SLOTS, TURN_SLOT, OBS_SIZE,
+    SLIDE_DIRECTIONS, CREATIONIST, EVOLUTIONIST, DOMINATED, FACTION_OF, TYPE_OF, IS_ELEMENT, IS_HUMAN,
+    OriginsEnv, GameOutcome, WINNER_NAMES, OBSERVATIONS, observation_planes,
+)
+
+SIZE = GRID_ROWS * GRID_COLS
+
+# Code-indexed lookup tables as arrays; negative codes index from the end
+# exactly like the tuples in origins_env
+FACTION_T = np.array(FACTION_OF, dtype=np.int8)
+TYPE_T = np.array(TYPE_OF, dtype=np.int8)
+IS_ELEMENT_T = np.array(IS_ELEMENT, dtype=bool)
+IS_HUMAN_T = np.array(IS_HUMAN, dtype=bool)
+DOMINATED_T = np.array(DOMINATED, dtype=np.int8)
+
+# Man/Woman slots in the position/arrival arrays, in observation flag order
+HUMAN_ORDER = tuple(sorted(ARRIVED_SLOTS, key=ARRIVED_SLOTS.get))
+HUMAN_SLOT_T = np.full(len(TYPE_OF), -1, dtype=np.intp)
+for _slot, _code in enumerate(HUMAN_ORDER):
+    HUMAN_SLOT_T[_code] = _slot
+
+# Game-over reasons as reported in GameOutcome
+REASONS = ("stalemate", "arrival", "capture", "turn_limit")
+STALEMATE, ARRIVAL, CAPTURE, TURN_LIMIT = range(len(REASONS))
+
+
+def _padded(rows, width):
+    # Ragged per-square tuples as a (SIZE, width) index array plus a validity mask
+    index = np.zeros((len(rows), width), dtype=np.intp)
+    valid = np.zeros((len(rows), width), dtype=bool)
+    for square, row in enumerate(rows):
+        index[square, :len(row)] = row
+        valid[square, :len(row)] = True
+    return index, valid
+
+
+# First square of each slide ray; by the rules the first valid move of an
+# element is always one of these
+RAY_NEXT, RAY_NEXT_OK = _padded([[ray[0] for ray in rays if ray] for rays in TABLES.rays], 8)
+
+# Man/Woman steps, [0] for the Creationist side (moving down), [1] for the Evolutionist side
+_STEP_TABLES = [_padded(TABLES.steps[sign], 8) for sign in (CREATIONIST, EVOLUTIONIST)]
+STEPS = np.stack([index for index, _ in _STEP_TABLES])
+STEPS_OK = np.stack([valid for _, valid in _STEP_TABLES])
+
+ADJACENT, ADJACENT_OK = _padded(TABLES.adjacent, 4)
+
+# BETWEEN[s, t]: squares strictly between s and t (padded), BETWEEN_LEN[s, t] their count
+_PATH_WIDTH = max(GRID_ROWS, GRID_COLS) - 2
+BETWEEN = np.zeros((SIZE, SIZE, _PATH_WIDTH), dtype=np.intp)
+BETWEEN_LEN = np.zeros((SIZE, SIZE), dtype=np.intp)
+for _s in range(SIZE):
+    for _t, _path in TABLES.between[_s].items():
+        BETWEEN[_s, _t, :len(_path)] = _path
+        BETWEEN_LEN[_s, _t] = len(_path)
+
+
+class BatchedOriginsEngine:
+    """``num_envs`` Origins games advanced in lock-step.
+
+    Mirrors ``OriginsEnv``: an action picks a square, the mover's piece there
+    plays its first valid move, selecting a square without an own piece costs
+    -1 and keeps the turn, and a finished game pays +/-100 to the side that
+    just moved. As in ``OriginsEnv.reset``, a reset leaves the turn as it is.
+    ``max_plies`` ends a game as a draw after that many turns, and
+    ``observation`` picks the encoding as for ``OriginsEnv``.
+    """
+
+    render_mode = None  # headless
+
+    def __init__(self, num_envs, max_plies=None, observation="flat"):
+        if observation not in OBSERVATIONS:
+            raise ValueError(f"observation must be one of {OBSERVATIONS}, got {observation!r}")
+        self.num_envs = num_envs
+        self.max_plies = max_plies
+        self.observation = observation
+        template = OriginsEnv()
+        self._start_board = template._board.copy()
+        self._start_pos = np.array(
+            [template._pos[code][0] * GRID_COLS + template._pos[code][1] for code in HUMAN_ORDER],
+            dtype=np.intp,
+        )
+        self._dest_rows = np.array([template._dest[code] for code in HUMAN_ORDER], dtype=np.intp)
+
+        self.boards = np.empty((num_envs, GRID_ROWS, GRID_COLS), dtype=np.int8)
+        self._flat = self.boards.reshape(num_envs, SIZE)  # view, indexed by square
+        self.turn = np.full(num_envs, CREATIONIST, dtype=np.int8)
+        self.pos = np.empty((num_envs, len(HUMAN_ORDER)), dtype=np.intp)  # -1 once captured
+        self.arrived = np.empty((num_envs, len(HUMAN_ORDER)), dtype=bool)
+        self.plies = np.zeros(num_envs, dtype=np.int64)
+        self.last_outcomes = []  # GameOutcome of each game finished by the last step
+        self._obs = np.zeros((num_envs, OBS_SIZE), dtype=np.int8)
+        self._rows = np.arange(num_envs)
+        self.reset()
+
+    def reset(self, envs=None):
+        envs = self._rows if envs is None else envs
+        self.boards[envs] = self._start_board
+        self.pos[envs] = self._start_pos
+        self.arrived[envs] = False
+        self.plies[envs] = 0
+
+    def observations(self, envs=None):
+        """Observations of the listed games (default all), one row each."""
+        envs = self._rows if envs is None else envs
+        if self.observation == "planes":
+            dest = np.broadcast_to(self._dest_rows, (len(envs), len(HUMAN_ORDER)))
+            return observation_planes(self._flat[envs], self.turn[envs], self.arrived[envs], dest)
+        obs = self._obs
+        obs[:, :SIZE] = self._flat
+        obs[:, TURN_SLOT] = self.turn
+        obs[:, TURN_SLOT + 1:TURN_SLOT + 1 + len(HUMAN_ORDER)] = self.arrived
+        return obs[envs]
+
+    def step(self, actions):
+        """Play one action per game.
+
+        Returns rewards, dones and the final observations of the games that
+        finished (rows in ``np.flatnonzero(dones)`` order, as are their
+        ``last_outcomes``); finished games are already reset.
+        """
+        rows = self._rows
+        squares = np.asarray(actions, dtype=np.intp).reshape(self.num_envs)
+        turn = self.turn.copy()
+        pieces = self._flat[rows, squares]
+
+        # Only a square holding one of the mover's pieces is a real action,
+        # except for a side with no pieces left, whose every action is a
+        # stalemated turn
+        own = FACTION_T[pieces] == turn
+        targets, has_move = self._first_moves(rows[own], squares[own], pieces[own])
+        movers = rows[own][has_move]
+        self.apply_moves(movers, squares[movers], targets[has_move])
+        own |= ~(FACTION_T[self._flat] == turn[:, None]).any(axis=1)
+
+        moved = np.zeros(self.num_envs, dtype=bool)
+        moved[movers] = True
+        rewards = np.where(moved, 1.0, -1.0).astype(np.float32)
+        dones = np.zeros(self.num_envs, dtype=bool)
+        dones[own] = self._game_over(rows[own], turn[own])
+        rewards[dones] = np.where(turn[dones] == CREATIONIST, 100.0, -100.0)
+
+        # Switch turns
+        self.turn[own] = -turn[own]
+        self.plies[own] += 1
+
+        over = dones.copy()
+        if self.max_plies is not None:
+            dones |= own & (self.plies >= self.max_plies)
+
+        finished = np.flatnonzero(dones)
+        winners, reasons = self._outcomes(finished)
+        limited = ~over[finished]
+        winners[limited], reasons[limited] = 0, TURN_LIMIT
+        self.last_outcomes = [
+            GameOutcome(WINNER_NAMES[winner], REASONS[reason], plies)
+            for winner, reason, plies in zip(winners.tolist(), reasons.tolist(), self.plies[finished].tolist())
+        ]
+        terminal = self.observations(finished) if len(finished) else None
+        if len(finished):
+            self.reset(finished)
+        return rewards, dones, terminal
+
+    def _blocked(self, envs):
+        # Squares of arrived pieces, which nothing can move onto or through
+        blocked = np.zeros((len(envs), SIZE), dtype=bool)
+        pos = self.pos[envs]
+        hit = self.arrived[envs] & (pos >= 0)
+        which, slot = np.nonzero(hit)
+        blocked[which, pos[which, slot]] = True
+        return blocked
+
+    def _first_moves(self, envs, squares, pieces):
+        # Target of the first move get_valid_moves would list, per game
+        k = np.arange(len(envs))[:, None]
+        flat = self._flat[envs]
+        blocked = self._blocked(envs)
+
+        # Elements: first direction whose nearest square is passable or prey
+        nxt = RAY_NEXT[squares]
+        codes = flat[k, nxt]
+        prey = DOMINATED_T[TYPE_T[pieces]][:, None]
+        slide_ok = RAY_NEXT_OK[squares] & ~blocked[k, nxt] & (
+            (codes == 0) | (codes == pieces[:, None]) | IS_HUMAN_T[codes] | (TYPE_T[codes] == prey)
+        )
+
+        # Man/Woman: first forward step onto an element, unless arrived
+        side = (FACTION_T[pieces] != CREATIONIST).astype(np.intp)
+        steps = STEPS[side, squares]
+        step_codes = flat[k, steps]
+        slot = HUMAN_SLOT_T[pieces]
+        still = ~self.arrived[envs, np.maximum(slot, 0)]
+        step_ok = STEPS_OK[side, squares] & IS_ELEMENT_T[step_codes] & ~blocked[k, steps] & still[:, None]
+
+        is_element = IS_ELEMENT_T[pieces][:, None]
+        valid = np.where(is_element, slide_ok, IS_HUMAN_T[pieces][:, None] & step_ok)
+        first = valid.argmax(axis=1)
+        candidates = np.where(is_element, nxt, steps)
+        return candidates[k[:, 0], first], valid.any(axis=1)
+
+    def apply_moves(self, envs, starts, ends):
+        """``OriginsEnv.move_piece`` for one (start, end) square pair per listed game."""
+        flat = self._flat
+        pieces = flat[envs, starts]
+        elements = IS_ELEMENT_T[pieces]
+        prey = DOMINATED_T[TYPE_T[pieces]]
+        paths = BETWEEN[starts, ends]
+        lengths = np.where(elements, BETWEEN_LEN[starts, ends], 0)
+
+        # Convert neutral squares along the path
+        on_path = np.arange(paths.shape[1]) < lengths[:, None]
+        which, step = np.nonzero(on_path & (flat[envs[:, None], paths] == 0))
+        flat[envs[which], paths[which, step]] = pieces[which]
+
+        # Male/female arrival and position
+        humans = np.flatnonzero(IS_HUMAN_T[pieces])
+        slot = HUMAN_SLOT_T[pieces[humans]]
+        arrive = ends[humans] // GRID_COLS == self._dest_rows[slot]
+        self.arrived[envs[humans[arrive]], slot[arrive]] = True
+        self.pos[envs[humans], slot] = ends[humans]
+
+        # Captures, walked in path order as capture_elements does
+        for i in range(int(lengths.max(initial=0))):
+            active = np.flatnonzero(lengths > i)
+            env, square = envs[active], paths[active, i]
+            target = flat[env, square]
+            human = IS_HUMAN_T[target]
+            hit = np.where(human, self._element_under(env, square) == prey[active], TYPE_T[target] == prey[active])
+            flat[env[hit], square[hit]] = 0
+            caught = hit & human
+            self.pos[env[caught], HUMAN_SLOT_T[target[caught]]] = -1
+
+        # Move the piece
+        flat[envs, ends] = pieces
+        flat[envs, starts] = 0
+
+    def _element_under(self, envs, squares):
+        # Type of the first orthogonally adjacent element, 0 if none
+        adjacent = ADJACENT[squares]
+        codes = self._flat[envs[:, None], adjacent]
+        element = ADJACENT_OK[squares] & IS_ELEMENT_T[codes]
+        first = element.argmax(axis=1)
+        under = TYPE_T[codes[np.arange(len(envs)), first]]
+        return np.where(element.any(axis=1), under, 0)
+
+    def _outcomes(self, envs):
+        # OriginsEnv.outcome() of finished games, as winner signs and REASONS indices
+        arrived = self.arrived[envs]
+        lost = (self.pos[envs] < 0) & ~arrived
+        creationist_home, evolutionist_home = arrived[:, :2].all(axis=1), arrived[:, 2:].all(axis=1)
+        creationist_lost, evolutionist_lost = lost[:, :2].any(axis=1), lost[:, 2:].any(axis=1)
+        winners = np.select(
+            [creationist_home, evolutionist_home, creationist_lost & evolutionist_lost,
+             creationist_lost, evolutionist_lost],
+            [CREATIONIST, EVOLUTIONIST, 0, EVOLUTIONIST, CREATIONIST], 0,
+        )
+        reasons = np.select(
+            [creationist_home | evolutionist_home, creationist_lost | evolutionist_lost],
+            [ARRIVAL, CAPTURE], STALEMATE,
+        )
+        return winners, reasons
+
+    def _game_over(self, envs, turn):
+        # check_game_over for the listed games, with turn the side that just moved
+        arrived = self.arrived[envs]
+        present = (self.pos[envs] >= 0) | arrived
+        over = (
+            (arrived[:, 0] & arrived[:, 1]) | (arrived[:, 2] & arrived[:, 3])
+            | ~(present[:, 0] & present[:, 1]) | ~(present[:, 2] & present[:, 3])
+        )
+        # Stalemate: the side to move has no valid move
+        pending = ~over
+        over[pending] = ~self.has_moves(envs[pending], turn[pending])
+        return over
+
+    def has_moves(self, envs, sides):
+        """Whether side ``sides[i]`` has any valid move in game ``envs[i]``."""
+        return self.movable_squares(envs, sides).any(axis=1)
+
+    def action_masks(self, envs=None):
+        """``OriginsEnv.action_masks`` for the listed games (default all), one row each."""
+        envs = self._rows if envs is None else np.asarray(envs, dtype=np.intp)
+        sides = self.turn[envs]
+        masks = self.movable_squares(envs, sides)
+        stalemated = ~masks.any(axis=1)
+        masks[stalemated] = FACTION_T[self._flat[envs[stalemated]]] == sides[stalemated, None]
+        masks[~masks.any(axis=1)] = True
+        return masks
+
+    def movable_squares(self, envs, sides):
+        """(len(envs), SIZE) bool: squares of side ``sides[i]``'s pieces that can move.
+
+        A piece that can move at all can move to a neighbouring square, so
+        this only looks one square in each direction.
+        """
+        n = len(envs)
+        flat = self._flat[envs]
+        blocked = self._blocked(envs)
+        own = FACTION_T[flat] == sides[:, None]
+
+        # Elements: compare every square with its neighbours through shifted
+        # slices of a board padded with blocked squares
+        boards = flat.reshape(n, GRID_ROWS, GRID_COLS)
+        padded = np.zeros((n, GRID_ROWS + 2, GRID_COLS + 2), dtype=np.int8)
+        padded[:, 1:-1, 1:-1] = boards
+        unblocked = np.zeros(padded.shape, dtype=bool)
+        unblocked[:, 1:-1, 1:-1] = ~blocked.reshape(n, GRID_ROWS, GRID_COLS)
+        passable = unblocked & ((padded == 0) | IS_HUMAN_T[padded])
+        prey = DOMINATED_T[TYPE_T[boards]]
+        slides = np.zeros(boards.shape, dtype=bool)
+        for dr, dc in SLIDE_DIRECTIONS:
+            window = (slice(None), slice(1 + dr, GRID_ROWS + 1 + dr), slice(1 + dc, GRID_COLS + 1 + dc))
+            codes = padded[window]
+            slides |= passable[window] | (unblocked[window] & ((codes == boards) | (TYPE_T[codes] == prey)))
+        movable = IS_ELEMENT_T[flat] & slides.reshape(n, SIZE)
+
+        # Men/women: at most four per game, looked up by position
+        k = np.arange(n)[:, None]
+        pos = np.maximum(self.pos[envs], 0)
+        present = (self.pos[envs] >= 0) & (flat[k, pos] == np.array(HUMAN_ORDER)) & ~self.arrived[envs]
+        side = (FACTION_T[np.array(HUMAN_ORDER)] != CREATIONIST).astype(np.intp)
+        steps = STEPS[side[None, :], pos]
+        stepping = STEPS_OK[side[None, :], pos] & IS_ELEMENT_T[flat[k[:, :, None], steps]] & ~blocked[k[:, :, None], steps]
+        which, slot = np.nonzero(present & stepping.any(axis=2))
+        movable[which, pos[which, slot]] = True
+        return own & movable
+
+
+class OriginsVecEnv(VecEnv):
+    """Stable-Baselines3 ``VecEnv`` backed by one ``BatchedOriginsEngine``."""
+
+    def __init__(self, num_envs, max_plies=None, observation="flat"):
+        self.engine = BatchedOriginsEngine(num_envs, max_plies, observation)
+        template = OriginsEnv(observation=observation)
+        super(OriginsVecEnv, self).__init__(num_envs, template.observation_space, template.action_space)
+        self._actions = None
+
+    def reset(self):
+        self.engine.reset()
+        return self.engine.observations()
+
+    def step_async(self, actions):
+        self._actions = actions
+
+    def step_wait(self):
+        rewards, dones, terminal = self.engine.step(self._actions)
+        infos = [{} for _ in range(self.num_envs)]
+        for i, env in enumerate(np.flatnonzero(dones)):
+            infos[env]["terminal_observation"] = terminal[i]
+            infos[env]["outcome"] = self.engine.last_outcomes[i]
+        return self.engine.observations(), rewards, dones, infos
+
+    def close(self):
+        pass
+
+    def seed(self, seed=None):
+        # The engine has no randomness
+        return [None for _ in range(self.num_envs)]
+
+    def get_attr(self, attr_name, indices=None):
+        return [getattr(self.engine, attr_name) for _ in self._get_indices(indices)]
+
+    def set_attr(self, attr_name, value, indices=None):
+        setattr(self.engine, attr_name, value)
+
+    def action_masks(self):
+        return self.engine.action_masks()
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        if method_name == "action_masks":
+            # One row per game, as MaskablePPO's get_action_masks expects
+            return list(self.engine.action_masks(self._get_indices(indices)))
+        result = getattr(self.engine, method_name)(*method_args, **method_kwargs)
+        return [result for _ in self._get_indices(indices)]
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for _ in self._get_indices(indices)]
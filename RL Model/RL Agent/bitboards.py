@@ -0,0 +1,157 @@
+"""Bitboard move generation for the Origins board.
+
+Square ``(row, col)`` is bit ``row * cols + col`` of a Python int, so any set of
+squares (one piece type, one faction, the empty squares) fits in a single int
+and whole-board questions become a handful of shifts, ANDs and ORs.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+
+def iter_bits(bb, reverse=False):
+    """Yield the squares set in ``bb``, lowest index first (highest if ``reverse``)."""
+    if reverse:
+        while bb:
+            square = bb.bit_length() - 1
+            yield square
+            bb ^= 1 << square
+    else:
+        while bb:
+            low = bb & -bb
+            yield low.bit_length() - 1
+            bb ^= low
+
+
+def bitboard_to_mask(bb, size):
+    """``bb`` as a (size,) bool array, square i at index i."""
+    raw = np.frombuffer(bb.to_bytes((size + 7) // 8, "little"), dtype=np.uint8)
+    return np.unpackbits(raw, count=size, bitorder="little").astype(bool)
+
+
+class BitboardGeometry:
+    """Masks and ray tables for one board size.
+
+    ``directions`` fixes the order in which slide targets are produced, so the
+    output can match a scalar generator walking the same directions.
+    """
+
+    def __init__(self, rows, cols, directions):
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
+        self.full = (1 << self.size) - 1
+        self.directions = list(directions)
+
+        first_col = sum(1 << (r * cols) for r in range(rows))
+        last_col = first_col << (cols - 1)
+        self.row_masks = [((1 << cols) - 1) << (r * cols) for r in range(rows)]
+
+        # (delta, keep) per direction: shifting by delta moves every square one
+        # step, keep drops squares that wrapped around a side edge
+        self.shifts = []
+        for dr, dc in self.directions:
+            keep = self.full
+            if dc > 0:
+                keep &= ~first_col
+            elif dc < 0:
+                keep &= ~last_col
+            self.shifts.append((dr * cols + dc, keep))
+
+        # rays[d][s]: squares on the ray from s in direction d, s excluded
+        self.rays = [[0] * self.size for _ in self.directions]
+        for d, (dr, dc) in enumerate(self.directions):
+            for s in range(self.size):
+                r, c = divmod(s, cols)
+                r, c = r + dr, c + dc
+                while 0 <= r < rows and 0 <= c < cols:
+                    self.rays[d][s] |= 1 << (r * cols + c)
+                    r, c = r + dr, c + dc
+        # Along a ray with a positive delta the nearest square is the lowest bit
+        self._ray_tables = [
+            (rays, delta > 0) for rays, (delta, _) in zip(self.rays, self.shifts)
+        ]
+
+        self.neighbours = [0] * self.size
+        for s in range(self.size):
+            r, c = divmod(s, cols)
+            for dr in (-1, 0, 1):
+                for dc in (-1, 0, 1):
+                    if (dr or dc) and 0 <= r + dr < rows and 0 <= c + dc < cols:
+                        self.neighbours[s] |= 1 << ((r + dr) * cols + c + dc)
+
+        # advance[+1][row]: rows a piece moving down may step onto from row,
+        # i.e. further down or the opponent's home row (and the mirror for -1)
+        self.advance = {
+            1: [sum(self.row_masks[r + 1:]) | self.row_masks[-1] for r in range(rows)],
+            -1: [sum(self.row_masks[:r]) | self.row_masks[0] for r in range(rows)],
+        }
+
+    def shift(self, bb, d):
+        delta, keep = self.shifts[d]
+        return (bb << delta if delta > 0 else bb >> -delta) & keep
+
+    def slide_mask(self, square, empty, prey):
+        """Slide targets of the piece on ``square`` as a bitboard.
+
+        The piece passes over ``empty`` squares and stops on the first square
+        that is not, landing on it only if it is in ``prey``. Each direction
+        costs one ray lookup, independent of the ray length.
+        """
+        targets = 0
+        for rays, nearest_low in self._ray_tables:
+            ray = rays[square]
+            blockers = ray & ~empty
+            if blockers:
+                if nearest_low:
+                    first = (blockers & -blockers).bit_length() - 1
+                else:
+                    first = blockers.bit_length() - 1
+                ray ^= rays[first]
+                if not prey >> first & 1:
+                    ray ^= 1 << first
+            targets |= ray
+        return targets
+
+    def slide_targets(self, square, empty, prey):
+        """Same as ``slide_mask`` but as a list, direction by direction, nearest first."""
+        targets = []
+        for rays, nearest_low in self._ray_tables:
+            ray = rays[square]
+            blockers = ray & ~empty
+            if blockers:
+                if nearest_low:
+                    first = (blockers & -blockers).bit_length() - 1
+                else:
+                    first = blockers.bit_length() - 1
+                ray ^= rays[first]
+                if not prey >> first & 1:
+                    ray ^= 1 << first
+            targets.extend(iter_bits(ray, reverse=not nearest_low))
+        return targets
+
+    def fill_targets(self, sliders, empty, prey):
+        """Union of the slide targets of every piece in ``sliders``.
+
+        Shift-and-mask flood fill: all pieces advance together one step per
+        iteration, so the cost depends on ray length, not on the piece count.
+        """
+        targets = 0
+        reachable = empty | prey
+        for delta, keep in self.shifts:
+            gen = sliders
+            while gen:
+                gen = (gen << delta if delta > 0 else gen >> -delta) & keep
+                targets |= gen & reachable
+                gen &= empty
+        return targets
+
+    def step_targets(self, square, allowed):
+        """Neighbouring squares of ``square`` in ``allowed``, lowest index first."""
+        return list(iter_bits(self.neighbours[square] & allowed))
+
+
+@lru_cache(maxsize=None)
+def geometry(rows, cols, directions):
+    return BitboardGeometry(rows, cols, directions)
@@ -0,0 +1,73 @@
+"""Per-square move tables for the Origins board.
+
+Built once per board size so the move generator, the capture walk and the
+neutral-square conversion never redo direction or bounds arithmetic. Squares
+are flat indices ``row * cols + col``.
+"""
+
+from functools import lru_cache
+
+
+class BoardTables:
+    """Precomputed rays, neighbours and paths for a ``rows`` x ``cols`` board.
+
+    - ``rays[s]``: for each slide direction, the squares along it, nearest first
+    - ``neighbours[s]``: the squares around ``s`` in step-direction order
+    - ``steps[sign][s]``: the neighbours a male/female moving towards larger
+      (sign 1) or smaller (sign -1) rows may step onto; no backwards or
+      sideways steps, except onto the opponent's home row
+    - ``adjacent[s]``: the orthogonal neighbours used to find the element
+      under a male/female
+    - ``between[s][t]``: the squares strictly between ``s`` and any ``t`` on
+      one of its rays
+    """
+
+    def __init__(self, rows, cols, slide_directions, step_directions, adjacent_directions):
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
+        self.coords = [divmod(s, cols) for s in range(self.size)]
+
+        self.rays = [
+            tuple(self._walk(s, dr, dc) for dr, dc in slide_directions)
+            for s in range(self.size)
+        ]
+        self.neighbours = [self._around(s, step_directions) for s in range(self.size)]
+        self.adjacent = [self._around(s, adjacent_directions) for s in range(self.size)]
+
+        self.steps = {1: [], -1: []}
+        for s in range(self.size):
+            row = s // cols
+            self.steps[1].append(tuple(
+                t for t in self.neighbours[s] if t // cols > row or t // cols == rows - 1
+            ))
+            self.steps[-1].append(tuple(
+                t for t in self.neighbours[s] if t // cols < row or t // cols == 0
+            ))
+
+        self.between = [
+            {ray[i]: ray[:i] for ray in self.rays[s] for i in range(len(ray))}
+            for s in range(self.size)
+        ]
+
+    def _walk(self, square, dr, dc):
+        r, c = self.coords[square]
+        squares = []
+        r, c = r + dr, c + dc
+        while 0 <= r < self.rows and 0 <= c < self.cols:
+            squares.append(r * self.cols + c)
+            r, c = r + dr, c + dc
+        return tuple(squares)
+
+    def _around(self, square, directions):
+        r, c = self.coords[square]
+        return tuple(
+            (r + dr) * self.cols + c + dc
+            for dr, dc in directions
+            if 0 <= r + dr < self.rows and 0 <= c + dc < self.cols
+        )
+
+
+@lru_cache(maxsize=None)
+def board_tables(rows, cols, slide_directions, step_directions, adjacent_directions):
+    return BoardTables(rows, cols, slide_directions, step_directions, adjacent_directions)
@@ -0,0 +1,130 @@
+"""Rollout buffers that store Origins observations in their own compact dtype.
+
+The observation space is int8 (flat) or uint8 (planes), but older
+Stable-Baselines3 releases allocate rollout observations as float32, and
+sb3-contrib keeps action masks as float32 too. These buffers hold
+observations in the observation space's dtype and masks as bool; the policy
+casts observations to float only as it reads them (``preprocess_obs``), so
+nothing changes for the network:
+
+    model = MaskablePPO("MlpPolicy", env, rollout_buffer_class=CompactMaskableRolloutBuffer)
+
+Off-policy replay buffers already store observations in the space's dtype.
+
+The ``Mirrored`` variants can also double each rollout with its left-right
+mirror image (see ``symmetry.py``): the ``MirrorAugment`` callback adds it
+when the rollout ends, with values and log probabilities of the mirrored
+samples from the policy that collected it, and returns and advantages
+recomputed over both halves. Pass the action ``encoding`` ("from_to" or
+"direction") and ``observation`` through ``rollout_buffer_kwargs``.
+"""
+
+import numpy as np
+import torch as th
+from stable_baselines3.common.buffers import RolloutBuffer
+from stable_baselines3.common.callbacks import BaseCallback
+from stable_baselines3.common.utils import obs_as_tensor
+from sb3_contrib.common.maskable.buffers import MaskableRolloutBuffer
+
+from symmetry import mirror_actions, mirror_masks, mirror_observation
+
+
+class CompactRolloutBuffer(RolloutBuffer):
+    def reset(self):
+        super(CompactRolloutBuffer, self).reset()
+        self.observations = np.zeros(
+            (self.buffer_size, self.n_envs, *self.obs_shape), dtype=self.observation_space.dtype
+        )
+
+
+class CompactMaskableRolloutBuffer(MaskableRolloutBuffer):
+    def reset(self):
+        super(CompactMaskableRolloutBuffer, self).reset()
+        self.observations = np.zeros(
+            (self.buffer_size, self.n_envs, *self.obs_shape), dtype=self.observation_space.dtype
+        )
+        self.action_masks = np.ones((self.buffer_size, self.n_envs, self.mask_dims), dtype=bool)
+
+
+class _MirrorAugmented:
+    def __init__(self, *args, encoding="from_to", observation="flat", **kwargs):
+        self.encoding = encoding
+        self.observation = observation
+        self._collected_envs = None
+        super(_MirrorAugmented, self).__init__(*args, **kwargs)
+
+    def reset(self):
+        # Back to the real number of envs after a doubled rollout
+        if self._collected_envs is not None:
+            self.n_envs, self._collected_envs = self._collected_envs, None
+        super(_MirrorAugmented, self).reset()
+
+    def compute_returns_and_advantage(self, last_values, dones):
+        # Kept to recompute both halves once the mirror image is added
+        self._last_values = last_values.clone().cpu().numpy().flatten()
+        super(_MirrorAugmented, self).compute_returns_and_advantage(last_values, dones)
+
+    def add_mirror_image(self, policy, last_obs, dones):
+        """Append the mirror image of the full rollout as extra envs.
+
+        Its values and log probabilities come from ``policy``, and returns
+        and advantages are recomputed for both halves, bootstrapping the
+        mirrored half from the mirror image of ``last_obs``.
+        """
+        mirrored = {
+            "observations": mirror_observation(self.observations, self.observation),
+            "actions": mirror_actions(self.actions, self.encoding).astype(self.actions.dtype),
+            "rewards": self.rewards,
+            "episode_starts": self.episode_starts,
+        }
+        masks = None
+        if hasattr(self, "action_masks"):
+            mirrored["action_masks"] = masks = mirror_masks(self.action_masks, self.encoding)
+            masks = masks.reshape(-1, self.mask_dims)
+        samples = self.buffer_size * self.n_envs
+        with th.no_grad():
+            observations = obs_as_tensor(mirrored["observations"].reshape(samples, *self.obs_shape), self.device)
+            actions = th.as_tensor(mirrored["actions"].reshape(samples), device=self.device).long()
+            if masks is None:
+                values, log_probs, _ = policy.evaluate_actions(observations, actions)
+            else:
+                values, log_probs, _ = policy.evaluate_actions(observations, actions, action_masks=masks)
+            last_values = policy.predict_values(
+                obs_as_tensor(mirror_observation(last_obs, self.observation), self.device)
+            )
+        mirrored["values"] = values.cpu().numpy().reshape(self.buffer_size, self.n_envs)
+        mirrored["log_probs"] = log_probs.cpu().numpy().reshape(self.buffer_size, self.n_envs)
+        # Mirrored samples go in as extra envs
+        for name, array in mirrored.items():
+            setattr(self, name, np.concatenate([getattr(self, name), array], axis=1))
+        self.advantages = np.concatenate([self.advantages, self.advantages], axis=1)
+        self._collected_envs = self.n_envs
+        self.n_envs *= 2
+        # GAE runs per env, so the original half comes out as before
+        last_values = np.concatenate([self._last_values, last_values.cpu().numpy().flatten()])
+        self.compute_returns_and_advantage(th.as_tensor(last_values), np.concatenate([dones, dones]))
+
+
+class MirroredRolloutBuffer(_MirrorAugmented, CompactRolloutBuffer):
+    pass
+
+
+class MirroredMaskableRolloutBuffer(_MirrorAugmented, CompactMaskableRolloutBuffer):
+    pass
+
+
+class MirrorAugment(BaseCallback):
+    """Adds each finished rollout's mirror image to a ``Mirrored`` rollout buffer."""
+
+    def _on_step(self):
+        return True
+
+    def _on_rollout_end(self):
+        model = self.model
+        model.rollout_buffer.add_mirror_image(model.policy, model._last_obs, model._last_episode_starts)
+
+
+def bytes_per_transition(buffer):
+    """Bytes a rollout buffer spends on each stored (env, step) transition."""
+    arrays = [value for value in vars(buffer).values() if isinstance(value, np.ndarray)]
+    return sum(array.nbytes for array in arrays) / (buffer.buffer_size * buffer.n_envs)
@@ -0,0 +1,47 @@
+"""Optional game logging that never touches the console by default.
+
+Everything logs to the ``"origins"`` logger, which starts with a
+``NullHandler`` and level WARNING, so a training run pays one level check per
+message and does no I/O. ``enable_game_log`` attaches a ring buffer keeping
+the last ``capacity`` records in memory, to read back after a run or when
+something goes wrong.
+"""
+
+import logging
+from collections import deque
+
+logger = logging.getLogger("origins")
+logger.addHandler(logging.NullHandler())
+logger.setLevel(logging.WARNING)
+logger.propagate = False
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the last ``capacity`` log records in memory."""
+
+    def __init__(self, capacity=1000, level=logging.NOTSET):
+        super(RingBufferHandler, self).__init__(level)
+        self.records = deque(maxlen=capacity)
+
+    def emit(self, record):
+        self.records.append(record)
+
+    def messages(self):
+        return [record.getMessage() for record in self.records]
+
+    def clear(self):
+        self.records.clear()
+
+
+def enable_game_log(level=logging.INFO, capacity=1000):
+    """Record game events at ``level`` and above into a new ring buffer, and return it."""
+    handler = RingBufferHandler(capacity)
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    return handler
+
+
+def disable_game_log(handler):
+    logger.removeHandler(handler)
+    if not any(isinstance(h, RingBufferHandler) for h in logger.handlers):
+        logger.setLevel(logging.WARNING)
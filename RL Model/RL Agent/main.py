@@ -11,13 +11,23 @@ register(
 )
 
 
+# Train with MaskablePPO on the env's action masks, so no rollout step is
+# spent on a square without a movable piece of the side to move
+USE_ACTION_MASKS = True
 
 # Create the environment
 env = gym.make("Origins-v0")
 env = DummyVecEnv([lambda: env])  # Vectorized wrapper for PPO
 
 # Define the PPO model
-model = PPO(
+if USE_ACTION_MASKS:
+    # sb3-contrib is only needed for masked training
+    from sb3_contrib import MaskablePPO
+    from sb3_contrib.common.maskable.utils import get_action_masks
+    algorithm = MaskablePPO
+else:
+    algorithm = PPO
+model = algorithm(
     "MlpPolicy",  
     env,
     learning_rate=0.0003,
@@ -35,12 +45,15 @@ model = PPO(
 model.learn(total_timesteps=100000)
 
 # Save the trained model
-model.save("ppo_origins")
+model.save("maskable_ppo_origins" if USE_ACTION_MASKS else "ppo_origins")
 
 # Test the model
 obs = env.reset()
 for _ in range(10):
-    action, _states = model.predict(obs)  # Get action from trained model
+    if USE_ACTION_MASKS:
+        action, _states = model.predict(obs, action_masks=get_action_masks(env))
+    else:
+        action, _states = model.predict(obs)  # Get action from trained model
     obs, reward, done, info = env.step(action)
     if done:
         obs = env.reset()
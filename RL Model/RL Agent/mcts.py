@@ -0,0 +1,234 @@
+"""Monte Carlo tree search over ``OriginsEnv`` with PUCT selection.
+
+Priors and values come from an evaluator called on a batch of observations
+at once. ``PolicyEvaluator`` wraps the PPO ``MlpPolicy`` trained by
+``main.py``: one forward pass scores every leaf queued in a batch, and a
+virtual loss on the path to each queued leaf steers the following
+selections elsewhere so a batch holds different leaves.
+
+The policy picks a square (the env then plays that piece's first move), so
+a move's prior is the probability of its from-square shared evenly among
+that piece's moves. The value head estimates the Creationist's return,
+squashed to [-1, 1].
+"""
+
+import math
+import time
+
+import numpy as np
+import torch
+
+VALUE_SCALE = 100  # reward of a won game
+DEFAULT_BATCH = 16
+
+
+class PolicyEvaluator:
+    """Batched (square probabilities, value) from an SB3 actor-critic policy."""
+
+    def __init__(self, model):
+        self.policy = model.policy
+
+    def __call__(self, observations):
+        with torch.no_grad():
+            tensor, _ = self.policy.obs_to_tensor(observations)
+            probs = self.policy.get_distribution(tensor).distribution.probs
+            values = self.policy.predict_values(tensor).flatten()
+        return probs.cpu().numpy(), np.tanh(values.cpu().numpy() / VALUE_SCALE)
+
+
+class UniformEvaluator:
+    """Uniform priors and a zero value, for pure tree search without a network."""
+
+    def __init__(self, squares=80):
+        self.squares = squares
+
+    def __call__(self, observations):
+        n = len(observations)
+        return np.full((n, self.squares), 1.0 / self.squares), np.zeros(n)
+
+
+class Node:
+    """A position in the tree. Edge statistics live on the parent, per move,
+    from the point of view of the side to move at the parent."""
+
+    __slots__ = ("key", "moves", "priors", "visits", "value_sum", "children", "terminal", "pending")
+
+    def __init__(self, key):
+        self.key = key
+        self.moves = None  # None until expanded
+        self.children = {}
+        self.terminal = None  # value for the side to move once known to be final
+        self.pending = False
+
+    def expand(self, moves, priors):
+        self.moves = moves
+        self.priors = priors
+        self.visits = np.zeros(len(moves))
+        self.value_sum = np.zeros(len(moves))
+
+    def select(self, c_puct, priors=None):
+        # priors stand in for the node's own, e.g. the root's with noise mixed in
+        if priors is None:
+            priors = self.priors
+        total = self.visits.sum()
+        q = np.divide(self.value_sum, self.visits, out=np.zeros_like(self.value_sum), where=self.visits > 0)
+        u = c_puct * priors * math.sqrt(total + 1) / (1 + self.visits)
+        return int(np.argmax(q + u))
+
+
+class MCTS:
+    """PUCT search for the side to move.
+
+    Each ``choose_move`` runs ``simulations`` playouts, or as many as fit in
+    ``time_limit`` seconds when that is set, evaluating leaves ``batch_size``
+    at a time. The tree is kept between calls: if the position handed to the
+    next call is already in it (our move followed by an opponent reply we
+    had explored), that subtree becomes the new root. ``root_noise`` mixes
+    that share of Dirichlet noise into the root priors, so searches of the
+    same position (e.g. one per process) explore differently. The noise is
+    drawn afresh for each search and never stored on the node, so a reused
+    root starts again from the network's priors.
+    """
+
+    def __init__(self, evaluator, simulations=800, time_limit=None, batch_size=DEFAULT_BATCH,
+                 c_puct=1.5, virtual_loss=1.0, root_noise=0.0, noise_alpha=0.3, seed=None):
+        self.evaluator = evaluator
+        self.simulations = simulations
+        self.time_limit = time_limit
+        self.batch_size = batch_size
+        self.c_puct = c_puct
+        self.virtual_loss = virtual_loss
+        self.root_noise = root_noise
+        self.noise_alpha = noise_alpha
+        self.rng = np.random.default_rng(seed)
+        self.root = None
+        self.root_priors = None  # the root's priors with this search's noise
+        self.playouts = 0
+
+    def choose_move(self, env):
+        """Return ((row, col), (row, col)) for the side to move, or None if it has no move."""
+        root = self.search(env)
+        if not root.moves:
+            return None
+        start, end = root.moves[int(np.argmax(root.visits))]
+        return divmod(start, self._cols), divmod(end, self._cols)
+
+    def search(self, env):
+        """Run one move's worth of playouts from the position in ``env``; returns the root."""
+        self._cols = env._board.shape[1]
+        self.root = self._find_root(env)
+        deadline = None if self.time_limit is None else time.perf_counter() + self.time_limit
+        self.playouts = 0
+        self.root_priors = None
+        if self.root_noise:
+            if self.root.moves is None:
+                self._run_batch(env, 1)
+            if self.root.moves:
+                noise = self.rng.dirichlet([self.noise_alpha] * len(self.root.moves))
+                self.root_priors = (1 - self.root_noise) * self.root.priors + self.root_noise * noise
+        while True:
+            if deadline is not None:
+                if time.perf_counter() >= deadline:
+                    break
+            elif self.playouts >= self.simulations:
+                break
+            budget = self.batch_size if deadline is not None else min(self.batch_size, self.simulations - self.playouts)
+            self._run_batch(env, budget)
+        return self.root
+
+    def _find_root(self, env):
+        # Reuse the subtree for this position if it is within two plies of the old root
+        key = env.position_hash()
+        root = self.root
+        if root is not None:
+            if root.key == key:
+                return root
+            for child in root.children.values():
+                if child.key == key:
+                    return child
+                for grandchild in child.children.values():
+                    if grandchild.key == key:
+                        return grandchild
+        return Node(key)
+
+    def _run_batch(self, env, budget):
+        leaves = []
+        for _ in range(budget):
+            path, node = self._descend(env)
+            if node.terminal is not None:
+                self._revert(path)
+                self._backup(path, node.terminal)
+            elif node.pending:
+                # Virtual loss did not divert this playout; evaluate what we have
+                self._revert(path)
+                self._unwind(env, path)
+                break
+            else:
+                node.pending = True
+                moves = [tuple(move) for move in env.legal_moves().tolist()]
+                if not moves:
+                    node.terminal = 0.0  # stalemate
+                    node.pending = False
+                    self._revert(path)
+                    self._backup(path, 0.0)
+                else:
+                    side = 1 if env.turn == "Creationist" else -1
+                    leaves.append((path, node, moves, side, env.get_observation()))
+            self._unwind(env, path)
+            self.playouts += 1
+
+        if leaves:
+            probs, values = self.evaluator(np.stack([leaf[4] for leaf in leaves]))
+            for (path, node, moves, side, _), square_probs, value in zip(leaves, probs, values):
+                node.expand(moves, _move_priors(moves, square_probs))
+                node.pending = False
+                self._revert(path)
+                self._backup(path, float(value) * side)
+
+    def _descend(self, env):
+        # Walk down by PUCT to an unexpanded or final node, applying virtual loss
+        node, path = self.root, []
+        while node.moves is not None and node.terminal is None:
+            index = node.select(self.c_puct, self.root_priors if node is self.root else None)
+            start, end = node.moves[index]
+            env.make_move(divmod(start, self._cols), divmod(end, self._cols))
+            node.visits[index] += self.virtual_loss
+            node.value_sum[index] -= self.virtual_loss
+            path.append((node, index))
+            child = node.children.get(index)
+            if child is None:
+                child = node.children[index] = Node(env.position_hash())
+                result = env.outcome(check_moves=False)
+                if result is not None:
+                    winner = result[0]
+                    side = 1 if env.turn == "Creationist" else -1
+                    child.terminal = float(winner * side)
+            node = child
+        return path, node
+
+    def _unwind(self, env, path):
+        for _ in path:
+            env.unmake_move()
+
+    def _revert(self, path):
+        for node, index in path:
+            node.visits[index] -= self.virtual_loss
+            node.value_sum[index] += self.virtual_loss
+
+    def _backup(self, path, value):
+        # value is for the side to move at the end of the path; each edge
+        # is scored for the side that chose it
+        for node, index in reversed(path):
+            value = -value
+            node.visits[index] += 1
+            node.value_sum[index] += value
+
+
+def _move_priors(moves, square_probs):
+    starts = np.array([start for start, _ in moves])
+    counts = np.bincount(starts, minlength=len(square_probs))
+    priors = square_probs[starts] / counts[starts]
+    total = priors.sum()
+    if total <= 0:
+        return np.full(len(moves), 1.0 / len(moves))
+    return priors / total
@@ -0,0 +1,187 @@
+"""Opponents that play one side of ``OriginsEnv`` games against a learning agent.
+
+Every opponent has ``play(envs)``: it makes one move for the side to move in
+each env and returns the ``(observation, reward, done, info)`` of each, as
+``env.step`` would. Taking a list lets a policy opponent answer all of them
+with one batched forward pass; the scripted bots just loop.
+
+- ``RandomOpponent``: a uniformly random legal move
+- ``GreedyCaptureOpponent``: the most valuable capture, else a random move
+- ``SearchOpponent``: a shallow ``AlphaBetaSearch``
+- ``PolicyOpponent``: a frozen Stable-Baselines3 model, e.g. a checkpoint
+
+A side with no legal move plays one of its pieces anyway, which ends the
+game as a stalemate exactly as it would for the agent.
+
+``VersusOpponentEnv`` wraps an env so that one ``step`` is the agent's move
+followed by the opponent's reply: the agent only ever sees its own turn, and
+rewards are its own.
+"""
+
+import inspect
+
+import gym
+import numpy as np
+
+from origins_env import FACTION_SIGN, IS_HUMAN, OriginsEnv, flip_perspective
+from search import AlphaBetaSearch, ELEMENT_VALUE, HUMAN_VALUE, capture_victims
+
+WIN_REWARD = 100
+
+
+def outcome_reward(outcome, side):
+    """Final reward for ``side`` of a finished game's ``GameOutcome``."""
+    if outcome.winner is None:
+        return 0
+    return WIN_REWARD if outcome.winner == side else -WIN_REWARD
+
+
+def play_move(env, move):
+    """Play a (from, to) square move, or for None any piece of the side to move."""
+    if move is None:
+        return env.step(np.flatnonzero(env.action_masks())[0])
+    return env._play_square(int(move[0]), int(move[1]))
+
+
+class RandomOpponent:
+    def __init__(self, seed=None):
+        self.rng = np.random.default_rng(seed)
+
+    def choose(self, env):
+        moves = env.legal_moves()
+        return moves[self.rng.integers(len(moves))] if len(moves) else None
+
+    def play(self, envs):
+        return [play_move(env, self.choose(env)) for env in envs]
+
+
+class GreedyCaptureOpponent(RandomOpponent):
+    """Takes the most valuable enemy piece it can, Man/Woman first."""
+
+    def choose(self, env):
+        moves = env.legal_moves()
+        if not len(moves):
+            return None
+        sign = FACTION_SIGN[env.turn]
+        values = np.array([
+            (HUMAN_VALUE if IS_HUMAN[victim] else ELEMENT_VALUE) if victim else 0
+            for victim in capture_victims(env, moves.tolist(), sign)
+        ])
+        best = np.flatnonzero(values == values.max())
+        return moves[self.rng.choice(best)]
+
+
+class SearchOpponent:
+    """``AlphaBetaSearch`` limited to ``depth`` plies and ``time_limit`` seconds a move."""
+
+    def __init__(self, depth=2, time_limit=0.05):
+        self.search = AlphaBetaSearch(time_limit=time_limit, max_depth=depth, tt_size_mb=1)
+
+    def play(self, envs):
+        results = []
+        for env in envs:
+            move = self.search.choose_move(env)
+            if move is not None:
+                move = [row * env._board.shape[1] + col for row, col in move]
+            results.append(play_move(env, move))
+        return results
+
+
+class PolicyOpponent:
+    """A fixed Stable-Baselines3 (or sb3-contrib Maskable) model.
+
+    Actions are in the model's action space, so it must have been trained on
+    the same env class it plays in. ``name`` identifies it in an
+    ``OpponentPool``, e.g. by checkpoint path.
+    """
+
+    def __init__(self, model, deterministic=False, name=None):
+        self.model = model
+        self.deterministic = deterministic
+        self.name = name
+        self._masked = "action_masks" in inspect.signature(model.predict).parameters
+
+    @classmethod
+    def load(cls, path, algorithm, deterministic=False):
+        return cls(algorithm.load(path, device="cpu"), deterministic, name=str(path))
+
+    def play(self, envs, flip=False):
+        """With ``flip`` the model sees each position as the other side would
+        (``flip_perspective``), for a model trained on the other side of
+        absolute-perspective envs."""
+        observations = np.stack([env.get_observation(copy=False) for env in envs])
+        flipped = envs[0].FLIPPED_ACTIONS if flip else None
+        if flip:
+            observations = flip_perspective(observations, envs[0].observation)
+        if self._masked:
+            masks = np.stack([env.action_masks() for env in envs])
+            if flip:
+                masks = masks[:, flipped]
+            actions, _ = self.model.predict(observations, deterministic=self.deterministic, action_masks=masks)
+        else:
+            actions, _ = self.model.predict(observations, deterministic=self.deterministic)
+        if flip:
+            # Out-of-range actions stay as they are and count as wasted turns
+            actions = [flipped[action] if 0 <= action < len(flipped) else action for action in actions]
+        return [env.step(action) for env, action in zip(envs, actions)]
+
+
+OPPONENTS = {
+    "random": RandomOpponent,
+    "greedy": GreedyCaptureOpponent,
+    "search": SearchOpponent,
+}
+
+
+class VersusOpponentEnv(gym.Wrapper):
+    """One ``step`` plays the agent's move and then ``opponent``'s reply.
+
+    ``opponent`` is a name from ``OPPONENTS`` or any object with
+    ``play(envs)``, e.g. a ``PolicyOpponent``. Observations are always at the
+    agent's (``agent_side``) turn; if the agent plays Evolutionist the
+    opponent moves first on reset. Rewards are +1/-1 for the agent's own
+    move, and +100/-100/0 for a won, lost or drawn game, whichever move
+    ended it.
+    """
+
+    def __init__(self, env, opponent="random", agent_side="Creationist"):
+        super(VersusOpponentEnv, self).__init__(env)
+        self.opponent = OPPONENTS[opponent]() if isinstance(opponent, str) else opponent
+        self.agent_side = agent_side
+        self._fallback = RandomOpponent()
+
+    def reset(self, **kwargs):
+        observation = self.env.reset(**kwargs)
+        if self.env.turn != self.agent_side:
+            observation, _, done, _ = self._reply()
+            if done:
+                return self.reset(**kwargs)
+        return observation
+
+    def step(self, action):
+        observation, reward, done, info = self.env.step(action)
+        if not done and self.env.turn != self.agent_side:
+            observation, _, done, info = self._reply()
+        if done:
+            reward = outcome_reward(info["outcome"], self.agent_side)
+        return observation, reward, done, info
+
+    def seed(self, seed=None):
+        # The env is deterministic; only the opponent's choices are random
+        for opponent in (self.opponent, self._fallback):
+            if hasattr(opponent, "rng"):
+                opponent.rng = np.random.default_rng(seed)
+        return [seed]
+
+    def _reply(self):
+        result = self.opponent.play([self.env])[0]
+        if not result[2] and self.env.turn != self.agent_side:
+            # The opponent picked an action that doesn't count (an unmasked
+            # policy can); a random legal move stands in for it
+            result = self._fallback.play([self.env])[0]
+        return result
+
+
+def make_versus_env(opponent="random", agent_side="Creationist", env_class=OriginsEnv, **env_kwargs):
+    """Entry point for the ``OriginsVersus-v0`` registration."""
+    return VersusOpponentEnv(env_class(**env_kwargs), opponent, agent_side)
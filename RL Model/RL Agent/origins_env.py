@@ -1,18 +1,22 @@
-import pygame
+"""Origins rules engine: ``OriginsEnv`` and the tables it runs on.
+
+Importing this module has no side effects and needs only NumPy and the gym
+spaces; the pygame UI lives in ``play.py`` and PPO training in ``main.py``
+and ``train.py``.
+"""
+
+from collections import namedtuple
+
 import numpy as np
-import random
 from gym import Env
 from gym.spaces import Discrete, Box
-from stable_baselines3 import PPO
-
-# Initialize Pygame
-pygame.init()
+from bitboards import bitboard_to_mask, geometry, iter_bits
+from board_tables import board_tables
+from game_log import logger
 
 # Constants
-SCREEN_SIZE = 600
 GRID_ROWS = 8
 GRID_COLS = 10
-CELL_SIZE = SCREEN_SIZE // GRID_COLS
 
 # Power hierarchy
 ELEMENT_POWER = {
@@ -39,501 +43,974 @@ COLORS = {
     "Evolutionist_Woman": (147, 112, 219),
 }
 
+# Piece codes (the board array and the observation share this encoding)
+PIECE_CODES = {
+    "Neutral": 0,
+    "Creationist_Earth": 1, "Creationist_Water": 2,
+    "Creationist_Fire": 3, "Creationist_Air": 4,
+    "Creationist_Woman": 5, "Creationist_Man": 6,
+    "Evolutionist_Earth": -1, "Evolutionist_Water": -2,
+    "Evolutionist_Fire": -3, "Evolutionist_Air": -4,
+    "Evolutionist_Woman": -5, "Evolutionist_Man": -6
+}
+PIECE_NAMES = {code: name for name, code in PIECE_CODES.items()}
+
+# Piece types (absolute codes) and faction signs
+NEUTRAL = 0
+EARTH, WATER, FIRE, AIR, WOMAN, MAN = 1, 2, 3, 4, 5, 6
+ELEMENT_TYPES = {"Earth": EARTH, "Water": WATER, "Fire": FIRE, "Air": AIR}
+CREATIONIST, EVOLUTIONIST = 1, -1
+FACTION_SIGN = {"Creationist": CREATIONIST, "Evolutionist": EVOLUTIONIST}
+
+# Starting row from column 0 to 9, Creationist signs
+HOME_ROW = np.array([EARTH, WATER, FIRE, AIR, WOMAN, MAN, AIR, FIRE, WATER, EARTH], dtype=np.int8)
+
+
+def _code_table(fn):
+    # Slot i holds the value for code i (0..6) or i - 13 (-6..-1), so that
+    # table[code] also works for negative codes through negative indexing.
+    return tuple(fn(i if i <= MAN else i - 2 * MAN - 1) for i in range(2 * MAN + 1))
+
+
+# Lookup tables indexed directly by piece code
+FACTION_OF = _code_table(lambda code: (code > 0) - (code < 0))
+TYPE_OF = _code_table(abs)
+IS_ELEMENT = _code_table(lambda code: EARTH <= abs(code) <= AIR)
+IS_HUMAN = _code_table(lambda code: abs(code) >= WOMAN)
+HUMAN_CODES = (MAN, WOMAN, -MAN, -WOMAN)
+FACTION_CODES = {
+    sign: tuple(sign * piece_type for piece_type in (EARTH, WATER, FIRE, AIR, WOMAN, MAN))
+    for sign in (CREATIONIST, EVOLUTIONIST)
+}
+
+# DOMINATED[piece_type] is the element type it captures (ELEMENT_POWER in codes)
+DOMINATED = tuple(
+    ELEMENT_TYPES[ELEMENT_POWER[name]] if name in ELEMENT_POWER else NEUTRAL
+    for name in ["Neutral", "Earth", "Water", "Fire", "Air", "Woman", "Man"]
+)
+
+KING_DIRECTIONS = [(-1,-1), (-1,0), (-1,1), (0,-1), (0,1), (1,-1), (1,0), (1,1)]
+SLIDE_DIRECTIONS = [(-1,0), (1,0), (0,-1), (0,1), (-1,-1), (-1,1), (1,-1), (1,1)]
+ADJACENT_DIRECTIONS = [(-1,0), (1,0), (0,-1), (0,1)]
+
+# Per-square rays, neighbours and paths for the scalar move generator
+TABLES = board_tables(
+    GRID_ROWS, GRID_COLS,
+    tuple(SLIDE_DIRECTIONS), tuple(KING_DIRECTIONS), tuple(ADJACENT_DIRECTIONS)
+)
+SQUARES = TABLES.coords
+
+# Bitboard masks and rays, slide targets come out in SLIDE_DIRECTIONS order
+BITBOARDS = geometry(GRID_ROWS, GRID_COLS, tuple(SLIDE_DIRECTIONS))
+MOVEGENS = ("scalar", "bitboard")
+
+# A square and its neighbours: the squares whose mobility a write can change
+AROUND = [BITBOARDS.neighbours[square] | 1 << square for square in range(GRID_ROWS * GRID_COLS)]
+
+# Zobrist keys for position_hash: one per (square, piece code), NEUTRAL
+# contributing nothing, plus the side to move and each male/female's
+# arrived and captured flags
+_zobrist = np.random.default_rng(1859).integers(
+    0, 2 ** 64, size=(GRID_ROWS * GRID_COLS + 1, len(TYPE_OF), 2), dtype=np.uint64
+).tolist()
+ZOBRIST = [[keys[0] if code else 0 for code, keys in zip(_code_table(lambda code: code), row)]
+           for row in _zobrist[:-1]]
+TURN_KEY = _zobrist[-1][0][0]
+# The left-right mirror image of each square, and ZOBRIST indexed by it, to
+# keep the hash of the mirrored board alongside
+MIRROR_SQUARES = [row * GRID_COLS + GRID_COLS - 1 - col
+                  for row in range(GRID_ROWS) for col in range(GRID_COLS)]
+MIRROR_ZOBRIST = [ZOBRIST[MIRROR_SQUARES[square]] for square in range(GRID_ROWS * GRID_COLS)]
+ARRIVED_KEYS = {code: _zobrist[-1][code][0] for code in HUMAN_CODES}
+CAPTURED_KEYS = {code: _zobrist[-1][code][1] for code in HUMAN_CODES}
+
+# How a game ended, as put in the step info under "outcome": winner is
+# "Creationist", "Evolutionist" or None for a draw, reason one of "arrival",
+# "capture", "stalemate" or "turn_limit", plies the turns played
+GameOutcome = namedtuple("GameOutcome", ["winner", "reason", "plies"])
+WINNER_NAMES = {CREATIONIST: "Creationist", EVOLUTIONIST: "Evolutionist", 0: None}
+
+# check_game_over log message per outcome()
+GAME_OVER_MESSAGES = {
+    (CREATIONIST, "arrival"): "Creationists win by reaching destination!",
+    (EVOLUTIONIST, "arrival"): "Evolutionists win by reaching destination!",
+    (0, "capture"): "Game is a draw - both sides lost male or female!",
+    (EVOLUTIONIST, "capture"): "Evolutionists win - Creationists lost male or female!",
+    (CREATIONIST, "capture"): "Creationists win - Evolutionists lost male or female!",
+    (0, "stalemate"): "Game is a draw - no valid moves!",
+    (0, "turn_limit"): "Game is a draw - turn limit reached!",
+}
+
+# Observation layout: one int8 slot per square holding its piece code, then
+# turn (+1/-1) and arrived (0/1) flags, all within OBS_LOW..OBS_HIGH
+OBS_SIZE = GRID_ROWS * GRID_COLS + 20
+OBS_LOW, OBS_HIGH = -MAN, MAN
+TURN_SLOT = GRID_ROWS * GRID_COLS
+ARRIVED_SLOTS = {
+    CREATIONIST * MAN: TURN_SLOT + 1, CREATIONIST * WOMAN: TURN_SLOT + 2,
+    EVOLUTIONIST * MAN: TURN_SLOT + 3, EVOLUTIONIST * WOMAN: TURN_SLOT + 4,
+}
+OBSERVATIONS = ("flat", "planes")
+
+# Plane observation layout (observation="planes"), (NUM_PLANES, GRID_ROWS,
+# GRID_COLS) of 0/1: one plane per piece code in PLANE_CODES order, a plane
+# of ones when the Creationists are to move, then per Man/Woman (in
+# ARRIVED_SLOTS order) a plane of ones once arrived and its destination row
+PLANE_CODES = np.array([CREATIONIST * t for t in range(EARTH, MAN + 1)]
+                       + [EVOLUTIONIST * t for t in range(EARTH, MAN + 1)], dtype=np.int8)
+PIECE_PLANE = _code_table(lambda code: int(np.flatnonzero(PLANE_CODES == code)[0]) if code else -1)
+TURN_PLANE = len(PLANE_CODES)
+PLANE_HUMANS = sorted(ARRIVED_SLOTS, key=ARRIVED_SLOTS.get)
+ARRIVED_PLANES = {code: TURN_PLANE + 1 + i for i, code in enumerate(PLANE_HUMANS)}
+DEST_PLANES = {code: TURN_PLANE + 1 + len(PLANE_HUMANS) + i for i, code in enumerate(PLANE_HUMANS)}
+NUM_PLANES = TURN_PLANE + 1 + 2 * len(PLANE_HUMANS)
+_SQUARE_ROWS = np.arange(GRID_ROWS * GRID_COLS) // GRID_COLS
+
+# Side-to-move perspective (perspective="side_to_move"): when the
+# Evolutionists are to move, observations, actions and masks are flipped top
+# to bottom with the factions swapped, so the side to move always looks like
+# the Creationists moving down the board. The rules are symmetric under this
+# swap except for the Man/Woman capture tie-break (see symmetry.py) and the
+# square actions' first move, which follows SLIDE_DIRECTIONS order
+# FLIP_SQUARES[square] is where a square is shown; flipping twice gives back
+# the original
+PERSPECTIVES = ("absolute", "side_to_move")
+FLIP_SQUARES = np.array([(GRID_ROWS - 1 - row) * GRID_COLS + col
+                         for row in range(GRID_ROWS) for col in range(GRID_COLS)], dtype=np.intp)
+
+
+def _flip_tables():
+    # Flat slots read (negated for squares and turn) and planes read by a
+    # flipped observation
+    slots = np.arange(OBS_SIZE)
+    slots[:TURN_SLOT] = FLIP_SQUARES
+    signs = np.ones(OBS_SIZE, dtype=np.int8)
+    signs[:TURN_SLOT + 1] = -1
+    planes = np.arange(NUM_PLANES)
+    planes[:TURN_PLANE] = [PIECE_PLANE[-code] for code in PLANE_CODES.tolist()]
+    for code in HUMAN_CODES:
+        slots[ARRIVED_SLOTS[code]] = ARRIVED_SLOTS[-code]
+        planes[ARRIVED_PLANES[code]] = ARRIVED_PLANES[-code]
+        planes[DEST_PLANES[code]] = DEST_PLANES[-code]
+    return slots, signs, planes
+
+
+FLIP_SLOTS, FLIP_SIGNS, FLIP_PLANES = _flip_tables()
+
+
+def flip_perspective(observations, observation="flat"):
+    """One observation or a batch as the other side would see it: rows
+    flipped, factions and the side to move swapped."""
+    observations = np.asarray(observations)
+    if observation == "planes":
+        flipped = observations[..., FLIP_PLANES, ::-1, :]
+        flipped[..., TURN_PLANE, :, :] ^= 1
+        return flipped
+    return observations[..., FLIP_SLOTS] * FLIP_SIGNS
+
+
+def observation_planes(flat, turn, arrived, dest):
+    """Plane observations of N games at once.
+
+    ``flat`` is (N, squares) piece codes, ``turn`` (N,) CREATIONIST or
+    EVOLUTIONIST, ``arrived`` and ``dest`` (N, 4) flags and destination rows
+    in ``PLANE_HUMANS`` order; returns (N, NUM_PLANES, GRID_ROWS, GRID_COLS)
+    uint8.
+    """
+    flat = np.asarray(flat)
+    n = len(flat)
+    planes = np.empty((n, NUM_PLANES, GRID_ROWS * GRID_COLS), dtype=np.uint8)
+    planes[:, :TURN_PLANE] = flat[:, None, :] == PLANE_CODES[None, :, None]
+    planes[:, TURN_PLANE] = (np.asarray(turn) == CREATIONIST)[:, None]
+    humans = len(PLANE_HUMANS)
+    planes[:, TURN_PLANE + 1:TURN_PLANE + 1 + humans] = np.asarray(arrived, dtype=bool)[:, :, None]
+    planes[:, TURN_PLANE + 1 + humans:] = _SQUARE_ROWS[None, None, :] == np.asarray(dest)[:, :, None]
+    return planes.reshape(n, NUM_PLANES, GRID_ROWS, GRID_COLS)
+
+
+class _BoardRow:
+    def __init__(self, env, row):
+        self._env = env
+        self._row = row
+
+    def __len__(self):
+        return GRID_COLS
+
+    def __getitem__(self, col):
+        return PIECE_NAMES[int(self._env._board[self._row, col])]
+
+    def __setitem__(self, col, piece):
+        self._env.set_piece(self._row, col, piece)
+
+    def __iter__(self):
+        return (PIECE_NAMES[code] for code in self._env._board[self._row].tolist())
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class BoardView:
+    """String view of the int8 board, e.g. ``board[0][0] == "Creationist_Earth"``.
+
+    Kept for the pygame UI and the validators. Writes go through
+    ``OriginsEnv.set_piece`` so the engine state stays consistent.
+    """
+
+    def __init__(self, env):
+        self._env = env
+
+    def __len__(self):
+        return GRID_ROWS
+
+    def __getitem__(self, row):
+        return _BoardRow(self._env, range(GRID_ROWS)[row])
+
+    def __setitem__(self, row, pieces):
+        # Whole-row assignment, e.g. board[0] = [...]
+        row = range(GRID_ROWS)[row]
+        for col, piece in enumerate(pieces):
+            self._env.set_piece(row, col, piece)
+
+    def __iter__(self):
+        return (self[row] for row in range(GRID_ROWS))
+
+    def __eq__(self, other):
+        return [list(row) for row in self] == [list(row) for row in other]
+
+    def __repr__(self):
+        return repr([list(row) for row in self])
+
+
+def _human_slot(store, code):
+    # Expose one Man/Woman entry of a code-indexed list as a plain attribute
+    def fget(self):
+        return getattr(self, store)[code]
+
+    def fset(self, value):
+        getattr(self, store)[code] = value
+
+    return property(fget, fset)
+
+
+def _dest_row(code):
+    return property(lambda self: self._dest[code], lambda self, value: self._set_dest(code, value))
+
+
+def _arrived_flag(code):
+    return property(lambda self: self._arrived[code], lambda self, value: self._set_arrived(code, value))
+
+
 class OriginsEnv(Env):
-    def __init__(self):
+    # FLIPPED_ACTIONS[action] is the action seen from the other side
+    FLIPPED_ACTIONS = FLIP_SQUARES
+
+    def __init__(self, movegen="scalar", max_plies=None, check_mobility=False, observation="flat",
+                 perspective="absolute"):
         super(OriginsEnv, self).__init__()
+        if movegen not in MOVEGENS:
+            raise ValueError(f"movegen must be one of {MOVEGENS}, got {movegen!r}")
+        if observation not in OBSERVATIONS:
+            raise ValueError(f"observation must be one of {OBSERVATIONS}, got {observation!r}")
+        if perspective not in PERSPECTIVES:
+            raise ValueError(f"perspective must be one of {PERSPECTIVES}, got {perspective!r}")
+        self.movegen = movegen
+        self.max_plies = max_plies  # drawn game after this many turns, None for no limit
+        self.check_mobility = check_mobility  # debug: cross-check mobility against full scans
+        self.observation = observation
+        self.perspective = perspective
         self.action_space = Discrete(GRID_ROWS * GRID_COLS)
-        self.turn = "Creationist"  # AI starts first
         self.observation_space = Box(
-            low=-3, high=3, shape=(GRID_ROWS * GRID_COLS + 20,), dtype=np.int32
+            low=OBS_LOW, high=OBS_HIGH, shape=(OBS_SIZE,), dtype=np.int8
         )
+        # Kept up to date by every board, turn and arrival change
+        self._obs = np.zeros((OBS_SIZE,), dtype=np.int8)
+        # The same for the plane observation, only kept in that mode
+        self._planes = self._plane_rows = None
+        if observation == "planes":
+            self.observation_space = Box(
+                low=0, high=1, shape=(NUM_PLANES, GRID_ROWS, GRID_COLS), dtype=np.uint8
+            )
+            self._planes = np.zeros((NUM_PLANES, GRID_ROWS, GRID_COLS), dtype=np.uint8)
+            self._plane_rows = self._planes.reshape(NUM_PLANES, GRID_ROWS * GRID_COLS)
+        self._journal = None  # (square, old code) of each board write while making a move
+        self.turn = "Creationist"  # AI starts first
         self.reset()
 
+    # Man/Woman state lives in lists indexed by piece code
+    creationist_male_pos = _human_slot("_pos", CREATIONIST * MAN)
+    creationist_female_pos = _human_slot("_pos", CREATIONIST * WOMAN)
+    evolutionist_male_pos = _human_slot("_pos", EVOLUTIONIST * MAN)
+    evolutionist_female_pos = _human_slot("_pos", EVOLUTIONIST * WOMAN)
+    creationist_male_dest = _dest_row(CREATIONIST * MAN)
+    creationist_female_dest = _dest_row(CREATIONIST * WOMAN)
+    evolutionist_male_dest = _dest_row(EVOLUTIONIST * MAN)
+    evolutionist_female_dest = _dest_row(EVOLUTIONIST * WOMAN)
+    creationist_male_arrived = _arrived_flag(CREATIONIST * MAN)
+    creationist_female_arrived = _arrived_flag(CREATIONIST * WOMAN)
+    evolutionist_male_arrived = _arrived_flag(EVOLUTIONIST * MAN)
+    evolutionist_female_arrived = _arrived_flag(EVOLUTIONIST * WOMAN)
+
+    @property
+    def turn(self):
+        return self._turn
+
+    @turn.setter
+    def turn(self, faction):
+        self._turn = faction
+        self._obs[TURN_SLOT] = 1 if faction == "Creationist" else -1
+        if self._planes is not None:
+            self._planes[TURN_PLANE] = faction == "Creationist"
+
+    def _set_arrived(self, code, arrived):
+        self._arrived[code] = arrived
+        self._obs[ARRIVED_SLOTS[code]] = 1 if arrived else 0
+        if self._planes is not None:
+            self._planes[ARRIVED_PLANES[code]] = arrived
+
+    def _set_dest(self, code, row):
+        self._dest[code] = row
+        if self._planes is not None:
+            plane = self._planes[DEST_PLANES[code]]
+            plane[:] = 0
+            if row is not None:
+                plane[row] = 1
+
+    @property
+    def board(self):
+        return BoardView(self)
+
+    @board.setter
+    def board(self, rows):
+        self._board = np.array(
+            [[PIECE_CODES[piece] for piece in row] for row in rows], dtype=np.int8
+        )
+        self._sync_state()
+
+    def set_piece(self, row, col, piece):
+        self._put(int(row) * GRID_COLS + int(col), PIECE_CODES[piece])
+
+    def pieces(self, faction):
+        # Squares of every piece of one faction, from the location index
+        return [SQUARES[square] for square in self._side_squares(FACTION_SIGN[faction])]
+
+    def _side_squares(self, sign):
+        return sorted(square for code in FACTION_CODES[sign] for square in self._squares[code])
+
+    def _put(self, square, code):
+        # Every board write goes through here to keep the bitboards, the
+        # piece-location index and the observation in step
+        old = self._flat[square]
+        if self._journal is not None:
+            self._journal.append((square, old))
+        bit = 1 << square
+        bb = self._bb
+        bb[old] ^= bit
+        bb[code] |= bit
+        if old:
+            self._squares[old].discard(square)
+        if code:
+            self._squares[code].add(square)
+        self._flat[square] = code
+        self._obs[square] = code
+        if self._plane_rows is not None:
+            if old:
+                self._plane_rows[PIECE_PLANE[old], square] = 0
+            if code:
+                self._plane_rows[PIECE_PLANE[code], square] = 1
+        self._hash ^= ZOBRIST[square][old] ^ ZOBRIST[square][code]
+        self._mirror_hash ^= MIRROR_ZOBRIST[square][old] ^ MIRROR_ZOBRIST[square][code]
+        self._dirty |= AROUND[square]
+
+    def _sync_state(self):
+        # Rebuild everything derived from the board array after a bulk change
+        self._flat = flat = self._board.reshape(-1)  # flat view, indexed by square
+        self._obs[:TURN_SLOT] = flat
+        if self._plane_rows is not None:
+            self._plane_rows[:TURN_PLANE] = flat == PLANE_CODES[:, None]
+        # One bitboard per piece code (NEUTRAL included)
+        self._bb = [
+            int.from_bytes(np.packbits(flat == code, bitorder="little").tobytes(), "little")
+            for code in _code_table(lambda code: code)
+        ]
+        self._hash = self._mirror_hash = 0
+        for square, code in enumerate(flat.tolist()):
+            self._hash ^= ZOBRIST[square][code]
+            self._mirror_hash ^= MIRROR_ZOBRIST[square][code]
+        # Occupied squares per piece code (the NEUTRAL slot stays empty)
+        self._squares = [
+            set(np.flatnonzero(flat == code).tolist()) if code else set()
+            for code in _code_table(lambda code: code)
+        ]
+        # Pieces with a move, recomputed for dirty squares on demand
+        self._mobile = 0
+        self._dirty = BITBOARDS.full
+        self._mobility_key = None
+
     def reset(self):
-        self.board = [["Neutral"] * GRID_COLS for _ in range(GRID_ROWS)]
-        
+        self._board = np.zeros((GRID_ROWS, GRID_COLS), dtype=np.int8)
+
         # Creationist pieces (top row - AI controlled)
-        self.board[0][0], self.board[0][9] = "Creationist_Earth", "Creationist_Earth"
-        self.board[0][1], self.board[0][8] = "Creationist_Water", "Creationist_Water"
-        self.board[0][2], self.board[0][7] = "Creationist_Fire", "Creationist_Fire"
-        self.board[0][3], self.board[0][6] = "Creationist_Air", "Creationist_Air"
-        self.board[0][4], self.board[0][5] = "Creationist_Woman", "Creationist_Man"
-        
+        self._board[0] = HOME_ROW
+
         # Evolutionist pieces (bottom row - human controlled)
-        self.board[7][0], self.board[7][9] = "Evolutionist_Earth", "Evolutionist_Earth"
-        self.board[7][1], self.board[7][8] = "Evolutionist_Water", "Evolutionist_Water"
-        self.board[7][2], self.board[7][7] = "Evolutionist_Fire", "Evolutionist_Fire"
-        self.board[7][3], self.board[7][6] = "Evolutionist_Air", "Evolutionist_Air"
-        self.board[7][4], self.board[7][5] = "Evolutionist_Woman", "Evolutionist_Man"
-        
+        self._board[GRID_ROWS - 1] = -HOME_ROW
+        self._sync_state()
+
+        self._pos = [None] * len(TYPE_OF)
+        self._dest = [None] * len(TYPE_OF)
+        self._arrived = [False] * len(TYPE_OF)
+        self._obs[TURN_SLOT + 1:] = 0
+        if self._planes is not None:
+            self._planes[TURN_PLANE + 1:] = 0
+        self._undo_stack = []
+        self.plies = 0
+        self.last_outcome = None
+
         # Track positions and destination rows
         self.creationist_male_pos = (0, 5)
         self.creationist_female_pos = (0, 4)
         self.creationist_male_dest = 6  # Day 6 for Creationist
         self.creationist_female_dest = 6
-        
+
         self.evolutionist_male_pos = (7, 5)
         self.evolutionist_female_pos = (7, 4)
         self.evolutionist_male_dest = 1  # 6 million years for Evolutionist
         self.evolutionist_female_dest = 1
-        
-        # Track if male/female have reached destination
-        self.creationist_male_arrived = False
-        self.creationist_female_arrived = False
-        self.evolutionist_male_arrived = False
-        self.evolutionist_female_arrived = False
-        
+
         return self.get_observation()
 
-    def get_observation(self):
-        observation = np.zeros((GRID_ROWS * GRID_COLS + 20,), dtype=np.int32)
-        piece_encoding = {
-            "Neutral": 0,
-            "Creationist_Earth": 1, "Creationist_Water": 2, 
-            "Creationist_Fire": 3, "Creationist_Air": 4,
-            "Creationist_Woman": 5, "Creationist_Man": 6,
-            "Evolutionist_Earth": -1, "Evolutionist_Water": -2,
-            "Evolutionist_Fire": -3, "Evolutionist_Air": -4,
-            "Evolutionist_Woman": -5, "Evolutionist_Man": -6
-        }
-        
-        index = 0
-        for row in range(GRID_ROWS):
-            for col in range(GRID_COLS):
-                observation[index] = piece_encoding.get(self.board[row][col], 0)
-                index += 1
-        
-        # Add game state information
-        observation[index] = 1 if self.turn == "Creationist" else -1
-        index += 1
-        observation[index] = 1 if self.creationist_male_arrived else 0
-        index += 1
-        observation[index] = 1 if self.creationist_female_arrived else 0
-        index += 1
-        observation[index] = 1 if self.evolutionist_male_arrived else 0
-        index += 1
-        observation[index] = 1 if self.evolutionist_female_arrived else 0
-        
+    def get_observation(self, copy=True):
+        # The buffer is updated in place as the game changes; without copy
+        # the caller gets a read-only view that follows the game. A flipped
+        # perspective is always a new array
+        buffer = self._obs if self._planes is None else self._planes
+        if self._flipped():
+            return flip_perspective(buffer, self.observation)
+        if copy:
+            return buffer.copy()
+        observation = buffer.view()
+        observation.flags.writeable = False
         return observation
 
     def step(self, action):
-        # Decode action into row and column
-        row = action // GRID_COLS
-        col = action % GRID_COLS
-        
+        # Decode action into the square of the piece to move
+        return self._play_square(self._absolute_action(action))
+
+    def _flipped(self):
+        return self.perspective == "side_to_move" and self._turn == "Evolutionist"
+
+    def _absolute_action(self, action):
+        # An action as the side to move sees it, on the real board
+        action = int(action)
+        if self._flipped() and 0 <= action < len(self.FLIPPED_ACTIONS):
+            return int(self.FLIPPED_ACTIONS[action])
+        return action
+
+    def _perspective_mask(self, mask):
+        return mask[self.FLIPPED_ACTIONS] if self._flipped() else mask
+
+    def _play_square(self, square, target=None):
+        # One turn for the piece on square: it moves to target, or by default
+        # to its first valid move. Shared by every action encoding
+        row = square // GRID_COLS
+        col = square % GRID_COLS
+
         # Ensure action is within bounds
         if not (0 <= row < GRID_ROWS and 0 <= col < GRID_COLS):
             return self.get_observation(), -1, False, {}
-        
-        # Only proceed if it's a valid piece for the current player
-        piece = self.board[row][col]
-        if (self.turn == "Creationist" and not piece.startswith("Creationist")) or \
-           (self.turn == "Evolutionist" and not piece.startswith("Evolutionist")):
-            return self.get_observation(), -1, False, {}
-        
-        valid_moves = self.get_valid_moves(row, col)
-        
+
+        # Only proceed if it's a valid piece for the current player. A side
+        # whose pieces were all overwritten can't move: any action is its
+        # stalemated turn
+        sign = FACTION_SIGN[self.turn]
+        if FACTION_OF[self._board[row, col]] != sign:
+            if self._side_mask(sign):
+                return self.get_observation(), -1, False, {}
+            valid_moves = []
+        else:
+            valid_moves = self.get_valid_moves(row, col)
+
         if valid_moves:
-            # Choose the first valid move
-            end_row, end_col = valid_moves[0]
+            if target is None:
+                # Choose the first valid move
+                end_row, end_col = valid_moves[0]
+            elif 0 <= target < len(SQUARES) and SQUARES[target] in valid_moves:
+                end_row, end_col = SQUARES[target]
+            else:
+                # A piece that can move, sent somewhere it can't: nothing happens
+                return self.get_observation(), -1, False, {}
             self.move_piece((row, col), (end_row, end_col))
             reward = 1
         else:
             reward = -1
-        
-        done = self.check_game_over()
+
+        result = self.outcome()
+        done = result is not None
         if done:
             reward = 100 if "Creationist" in self.turn else -100
-        
+        self.plies += 1
+        if not done and self.max_plies is not None and self.plies >= self.max_plies:
+            result, done = (0, "turn_limit"), True
+
         # Switch turns
         self.turn = "Evolutionist" if self.turn == "Creationist" else "Creationist"
-        return self.get_observation(), reward, done, {}
+        if not done:
+            return self.get_observation(), reward, False, {}
+        self.last_outcome = GameOutcome(WINNER_NAMES[result[0]], result[1], self.plies)
+        logger.info("Game over after %d plies: %s", self.plies, GAME_OVER_MESSAGES[result])
+        return self.get_observation(), reward, True, {"outcome": self.last_outcome}
+
+    def _arrived_squares(self):
+        return {
+            self._pos[code][0] * GRID_COLS + self._pos[code][1]
+            for code in HUMAN_CODES
+            if self._arrived[code] and self._pos[code] is not None
+        }
+
+    def _arrived_mask(self):
+        mask = 0
+        for square in self._arrived_squares():
+            mask |= 1 << square
+        return mask
+
+    def position_hash(self, mirrored=False):
+        # 64-bit Zobrist hash of the board (kept up to date by _put), the side
+        # to move and the male/female arrived and captured flags; mirrored
+        # gives the hash of the left-right mirror image of the position
+        key = self._mirror_hash if mirrored else self._hash
+        if self.turn == "Creationist":
+            key ^= TURN_KEY
+        for code in HUMAN_CODES:
+            if self._arrived[code]:
+                key ^= ARRIVED_KEYS[code]
+            if self._pos[code] is None:
+                key ^= CAPTURED_KEYS[code]
+        return key
+
+    def snapshot(self):
+        # Picklable copy of the game state, to restore() here or in another process
+        return self._board.copy(), self.turn, list(self._pos), list(self._dest), list(self._arrived)
+
+    def restore(self, state):
+        board, turn, pos, dest, arrived = state
+        self._board = np.array(board, dtype=np.int8)
+        self._sync_state()
+        self._pos, self._dest = list(pos), [None] * len(TYPE_OF)
+        self._arrived = [False] * len(TYPE_OF)
+        for code in HUMAN_CODES:
+            self._set_dest(code, dest[code])
+            self._set_arrived(code, arrived[code])
+        self._undo_stack = []
+        self.turn = turn
+
+    def make_move(self, start, end):
+        """Play a move and switch turns, pushing an undo record.
+
+        The record is (previous turn, (square, old code) for every board write
+        in order, (code, old position, old arrived) for each male/female whose
+        state changed); ``unmake_move`` restores the position from it exactly,
+        so search can walk the tree without copying the board.
+        """
+        turn = self.turn
+        humans = [(code, self._pos[code], self._arrived[code]) for code in HUMAN_CODES]
+        self._journal = writes = []
+        try:
+            self.move_piece(start, end)
+        finally:
+            self._journal = None
+        self.turn = "Evolutionist" if turn == "Creationist" else "Creationist"
+        changed = tuple(
+            (code, pos, arrived) for code, pos, arrived in humans
+            if self._pos[code] != pos or self._arrived[code] != arrived
+        )
+        record = (turn, tuple(writes), changed)
+        self._undo_stack.append(record)
+        return record
+
+    def unmake_move(self, record=None):
+        # Takes back the last move made with make_move
+        top = self._undo_stack.pop()
+        if record is not None and record is not top:
+            self._undo_stack.append(top)
+            raise ValueError("moves must be unmade in reverse order")
+        turn, writes, humans = top
+        for square, code in reversed(writes):
+            self._put(square, code)
+        for code, pos, arrived in humans:
+            self._pos[code] = pos
+            self._set_arrived(code, arrived)
+        self.turn = turn
+        return top
 
     def move_piece(self, start, end):
-        sr, sc = start
-        er, ec = end
-        piece = self.board[sr][sc]
-        faction = "Creationist" if piece.startswith("Creationist") else "Evolutionist"
-    
+        # Plain ints: squares also index Python-int bitboards
+        sr, sc = int(start[0]), int(start[1])
+        er, ec = int(end[0]), int(end[1])
+        flat = self._flat
+        origin = sr * GRID_COLS + sc
+        piece = flat[origin]
+
     # Convert neutral squares along path for elements
-        if any(el in piece for el in ["Earth", "Water", "Fire", "Air"]):
-            dr = 1 if er > sr else -1 if er < sr else 0
-            dc = 1 if ec > sc else -1 if ec < sc else 0
-            r, c = sr + dr, sc + dc
-        
-            element_type = piece.split("_")[-1]
-        
-            while (r, c) != (er, ec):
-                if self.board[r][c] == "Neutral":
-                    self.board[r][c] = f"{faction}_{element_type}"
-                r += dr
-                c += dc
-    
-    # Check if male/female reached destination
-        if piece.endswith("Man"):
-            if faction == "Creationist" and er == self.creationist_male_dest:
-                self.creationist_male_arrived = True
-            elif faction == "Evolutionist" and er == self.evolutionist_male_dest:
-                self.evolutionist_male_arrived = True
-            
-        elif piece.endswith("Woman"):
-            if faction == "Creationist" and er == self.creationist_female_dest:
-                self.creationist_female_arrived = True
-            elif faction == "Evolutionist" and er == self.evolutionist_female_dest:
-                self.evolutionist_female_arrived = True
-    
-    # Handle male/female position tracking
-        if piece.endswith("Man") or piece.endswith("Woman"):
-            if piece == "Creationist_Man":
-                self.creationist_male_pos = (er, ec)
-            elif piece == "Creationist_Woman":
-                self.creationist_female_pos = (er, ec)
-            elif piece == "Evolutionist_Man":
-                self.evolutionist_male_pos = (er, ec)
-            elif piece == "Evolutionist_Woman":
-                self.evolutionist_female_pos = (er, ec)
-    
+        if IS_ELEMENT[piece]:
+            for square in TABLES.between[origin].get(er * GRID_COLS + ec, ()):
+                if flat[square] == NEUTRAL:
+                    self._put(square, piece)
+
+    # Check if male/female reached destination and track its position
+        if IS_HUMAN[piece]:
+            if er == self._dest[piece]:
+                self._set_arrived(piece, True)
+            self._pos[piece] = (er, ec)
+
     # Handle captures along the path
         self.capture_elements(start, end)
-    
+
     # Move the piece
-        self.board[er][ec] = piece
-        self.board[sr][sc] = "Neutral"
-    
+        self._put(er * GRID_COLS + ec, piece)
+        self._put(origin, NEUTRAL)
+
+    def _element_under(self, square):
+        # Element type of the first orthogonally adjacent elemental square
+        for adjacent in TABLES.adjacent[square]:
+            if IS_ELEMENT[self._flat[adjacent]]:
+                return TYPE_OF[self._flat[adjacent]]
+        return NEUTRAL
+
+    def captured_humans(self, origin, target):
+        """Squares of the men/women (either side's) that moving the piece on
+        square origin to square target captures, without playing it.
+
+        As in move_piece, the neutral squares of the path are converted to
+        the moving element before ``capture_elements`` looks under each
+        male/female it passes.
+        """
+        flat = self._flat
+        piece = flat[origin]
+        if not IS_ELEMENT[piece]:
+            return []
+        path = TABLES.between[origin].get(target, ())
+        prey = DOMINATED[TYPE_OF[piece]]
+        captured = []
+        for square in path:
+            if IS_HUMAN[flat[square]]:
+                under = NEUTRAL
+                for adjacent in TABLES.adjacent[square]:
+                    code = piece if flat[adjacent] == NEUTRAL and adjacent in path else flat[adjacent]
+                    if IS_ELEMENT[code]:
+                        under = TYPE_OF[code]
+                        break
+                if under == prey:
+                    captured.append(square)
+        return captured
+
     def capture_elements(self, start, end):
-        sr, sc = start
-        er, ec = end
-        moving_piece = self.board[sr][sc]
-    
+        sr, sc = int(start[0]), int(start[1])
+        er, ec = int(end[0]), int(end[1])
+        flat = self._flat
+        origin = sr * GRID_COLS + sc
+        moving_piece = flat[origin]
+
     # Only elemental pieces can capture
-        if not any(el in moving_piece for el in ["Earth", "Water", "Fire", "Air"]):
+        if not IS_ELEMENT[moving_piece]:
             return
 
-        piece_element = moving_piece.split("_")[-1]
-        faction = "Creationist" if moving_piece.startswith("Creationist") else "Evolutionist"
-    
-        dr = 1 if er > sr else -1 if er < sr else 0
-        dc = 1 if ec > sc else -1 if ec < sc else 0
-        r, c = sr + dr, sc + dc
-    
-        while (r, c) != (er, ec):
-            target = self.board[r][c]
-        
-        # Handle male/female capture
-            if target.endswith("Man") or target.endswith("Woman"):
-            # Get the element under the male/female
-                element_under = None
-            # Check if the square itself is an element (for starting positions)
-                if any(el in self.board[r][c] for el in ["Earth", "Water", "Fire", "Air"]):
-                    element_under = self.board[r][c].split("_")[-1]
-                else:
-                # Check adjacent squares for the element
-                    for dr_check, dc_check in [(-1,0), (1,0), (0,-1), (0,1)]:
-                        nr, nc = r + dr_check, c + dc_check
-                        if 0 <= nr < GRID_ROWS and 0 <= nc < GRID_COLS:
-                            adjacent = self.board[nr][nc]
-                            if any(el in adjacent for el in ["Earth", "Water", "Fire", "Air"]):
-                                element_under = adjacent.split("_")[-1]
-                                break
-            
-            # Only capture if moving element is dominant over the element under
-                if element_under and ELEMENT_POWER[piece_element] == element_under:
-                # Neutralize the square (convert to Neutral)
-                    self.board[r][c] = "Neutral"
-                # Remove the male/female piece
-                    if target == "Creationist_Man":
-                        self.creationist_male_pos = None
-                    elif target == "Creationist_Woman":
-                        self.creationist_female_pos = None
-                    elif target == "Evolutionist_Man":
-                        self.evolutionist_male_pos = None
-                    elif target == "Evolutionist_Woman":
-                        self.evolutionist_female_pos = None
-        
-        # Handle regular element capture
-            elif target != "Neutral":
-                target_element = None
-                for el in ["Earth", "Water", "Fire", "Air"]:
-                    if el in target:
-                        target_element = el
-                        break
-            
-                if target_element:
-                # Stronger element captures weaker
-                    if ELEMENT_POWER[piece_element] == target_element:
-                        self.board[r][c] = "Neutral"
-        
-            r += dr
-            c += dc
-    
+        prey = DOMINATED[TYPE_OF[moving_piece]]
+
+        for square in TABLES.between[origin].get(er * GRID_COLS + ec, ()):
+            target = flat[square]
+
+        # Handle male/female capture: only if moving element dominates the element under it
+            if IS_HUMAN[target]:
+                if self._element_under(square) == prey:
+                    self._put(square, NEUTRAL)
+                    self._pos[target] = None
+
+        # Handle regular element capture: stronger element captures weaker
+            elif TYPE_OF[target] == prey:
+                self._put(square, NEUTRAL)
+
+    def outcome(self, check_moves=True):
+        """(winner, reason) once the game is over, else None.
+
+        ``winner`` is CREATIONIST, EVOLUTIONIST or 0 for a draw; ``reason`` is
+        "arrival", "capture" or "stalemate". Without ``check_moves`` the
+        stalemate test (the costly part) is skipped.
+        """
+        arrived = self._arrived
+        if arrived[CREATIONIST * MAN] and arrived[CREATIONIST * WOMAN]:
+            return CREATIONIST, "arrival"
+        if arrived[EVOLUTIONIST * MAN] and arrived[EVOLUTIONIST * WOMAN]:
+            return EVOLUTIONIST, "arrival"
+
+        # Either side lost its male or female
+        lost = {
+            sign: any(self._pos[sign * code] is None and not arrived[sign * code] for code in (MAN, WOMAN))
+            for sign in (CREATIONIST, EVOLUTIONIST)
+        }
+        if lost[CREATIONIST]:
+            return (0 if lost[EVOLUTIONIST] else EVOLUTIONIST), "capture"
+        if lost[EVOLUTIONIST]:
+            return CREATIONIST, "capture"
+
+        if check_moves and not self.has_valid_moves():
+            return 0, "stalemate"
+        return None
+
     def check_game_over(self):
-        # Check if either side has won
-        if self.creationist_male_arrived and self.creationist_female_arrived:
-            print("Creationists win by reaching destination!")
-            return True
-        if self.evolutionist_male_arrived and self.evolutionist_female_arrived:
-            print("Evolutionists win by reaching destination!")
-            return True
-            
-        # Check if either side has lost their male or female
-        creationist_alive = (self.creationist_male_pos is not None or self.creationist_male_arrived) and \
-                          (self.creationist_female_pos is not None or self.creationist_female_arrived)
-        evolutionist_alive = (self.evolutionist_male_pos is not None or self.evolutionist_male_arrived) and \
-                            (self.evolutionist_female_pos is not None or self.evolutionist_female_arrived)
-        
-        if not creationist_alive:
-            if not evolutionist_alive:
-                print("Game is a draw - both sides lost male or female!")
-            else:
-                print("Evolutionists win - Creationists lost male or female!")
-            return True
-            
-        if not evolutionist_alive:
-            print("Creationists win - Evolutionists lost male or female!")
-            return True
-            
-        # Check for stalemate (no valid moves)
-        if not self.has_valid_moves():
-            print("Game is a draw - no valid moves!")
-            return True
-            
-        return False
+        result = self.outcome()
+        if result is None:
+            return False
+        logger.info(GAME_OVER_MESSAGES[result])
+        return True
 
     def has_valid_moves(self):
-        for row in range(GRID_ROWS):
-            for col in range(GRID_COLS):
-                piece = self.board[row][col]
-                if (self.turn == "Creationist" and piece.startswith("Creationist")) or \
-                   (self.turn == "Evolutionist" and piece.startswith("Evolutionist")):
-                    if self.get_valid_moves(row, col):
-                        return True
+        return self.has_legal_move()
+
+    def legal_moves(self, faction=None):
+        # Every move of one side (default: side to move) as an (n, 2) array of
+        # (from, to) square indices, ordered by from then to square
+        sign = FACTION_SIGN[faction or self.turn]
+        if self.movegen == "bitboard":
+            moves = [
+                (square, target)
+                for square, targets in sorted(self._bitboard_side_targets(sign))
+                for target in iter_bits(targets)
+            ]
+        else:
+            blocked = self._arrived_squares()
+            moves = [
+                (square, target)
+                for square in self._side_squares(sign)
+                for target in sorted(self._scalar_targets(square, blocked))
+            ]
+        return np.array(moves, dtype=np.int16).reshape(-1, 2)
+
+    def has_legal_move(self, faction=None):
+        # Answered from the incrementally kept mobility bitboard
+        sign = FACTION_SIGN[faction or self.turn]
+        found = bool(self._movable_pieces() & self._side_mask(sign))
+        if self.check_mobility and found != self._scan_has_legal_move(sign):
+            raise RuntimeError(f"incremental mobility says {found} for {faction or self.turn}, full scan disagrees")
+        return found
+
+    def _scan_has_legal_move(self, sign):
+        # Full move generation, stopping at the first piece that can move
+        if self.movegen == "bitboard":
+            return self._bitboard_has_moves(sign)
+        blocked = self._arrived_squares()
+        for code in FACTION_CODES[sign]:
+            for square in self._squares[code]:
+                if self._scalar_targets(square, blocked):
+                    return True
+        return False
+
+    def mobility(self, faction=None):
+        # Number of pieces of one side (default: side to move) that have a move
+        return bin(self._movable_pieces() & self._side_mask(FACTION_SIGN[faction or self.turn])).count("1")
+
+    def _side_mask(self, sign):
+        bb = self._bb
+        mask = 0
+        for code in FACTION_CODES[sign]:
+            mask |= bb[code]
+        return mask
+
+    def _movable_pieces(self):
+        # Bitboard of every piece with a move, updated from the squares written
+        # since the last call: a piece's mobility only depends on its square,
+        # its neighbours and where the arrived pieces stand
+        blocked = self._arrived_mask()
+        arrived = tuple(self._arrived[code] for code in HUMAN_CODES)
+        dirty = self._dirty
+        if (blocked, arrived) != self._mobility_key:
+            changed = blocked ^ self._mobility_key[0] if self._mobility_key else BITBOARDS.full
+            for square in iter_bits(changed):
+                dirty |= AROUND[square]
+            for code in HUMAN_CODES:
+                dirty |= self._bb[code]
+            self._mobility_key = (blocked, arrived)
+        if dirty:
+            mobile = self._mobile & ~dirty
+            flat = self._flat
+            for square in iter_bits(dirty & ~self._bb[NEUTRAL]):
+                if self._can_move(square, flat[square], blocked):
+                    mobile |= 1 << square
+            self._mobile = mobile
+            self._dirty = 0
+        if self.check_mobility:
+            scanned = self._bitboard_movable(CREATIONIST) | self._bitboard_movable(EVOLUTIONIST)
+            if scanned != self._mobile:
+                raise RuntimeError(f"incremental mobility differs from a full scan on squares {list(iter_bits(scanned ^ self._mobile))}")
+        return self._mobile
+
+    def _can_move(self, square, piece, blocked):
+        # Whether the piece on square has a move, looking only at its neighbours
+        flat = self._flat
+        if IS_HUMAN[piece]:
+            if self._arrived[piece]:
+                return False
+            for target in TABLES.steps[FACTION_OF[piece]][square]:
+                if IS_ELEMENT[flat[target]] and not blocked >> target & 1:
+                    return True
+            return False
+        prey = DOMINATED[TYPE_OF[piece]]
+        for target in TABLES.neighbours[square]:
+            if blocked >> target & 1:
+                continue
+            code = flat[target]
+            if code == NEUTRAL or code == piece or IS_HUMAN[code] or TYPE_OF[code] == prey:
+                return True
         return False
 
+    def action_masks(self):
+        """Valid actions for sb3-contrib's MaskablePPO: an (80,) bool array,
+        True on the squares of the side to move's pieces that have a move.
+
+        If the side to move is stalemated every one of its pieces is left
+        valid, since choosing one ends the game; with no pieces at all, every
+        square is. Squares are in the env's perspective, like the actions.
+        """
+        side = self._side_mask(FACTION_SIGN[self.turn])
+        if not side:
+            return np.ones(GRID_ROWS * GRID_COLS, dtype=bool)
+        movable = self._movable_pieces() & side
+        return self._perspective_mask(bitboard_to_mask(movable or side, GRID_ROWS * GRID_COLS))
+
     def get_valid_moves(self, row, col):
-        moves = []
+        row, col = int(row), int(col)
         if not (0 <= row < GRID_ROWS and 0 <= col < GRID_COLS):
-            return moves
-        
-        piece = self.board[row][col]
-        faction = "Creationist" if piece.startswith("Creationist") else "Evolutionist"
-        starting_row = 0 if faction == "Creationist" else 7
-    
-    # Male/Female pieces can move to adjacent elemental squares
-        if piece.endswith("Man") or piece.endswith("Woman"):
-        # Check if already arrived at destination
-            if (piece == "Creationist_Man" and self.creationist_male_arrived) or \
-            (piece == "Creationist_Woman" and self.creationist_female_arrived) or \
-            (piece == "Evolutionist_Man" and self.evolutionist_male_arrived) or \
-            (piece == "Evolutionist_Woman" and self.evolutionist_female_arrived):
-                return moves  # Can't move after arriving at destination
-        
-            for dr, dc in [(-1,-1), (-1,0), (-1,1), (0,-1), (0,1), (1,-1), (1,0), (1,1)]:
-                nr, nc = row + dr, col + dc
-            
-            # Check bounds
-                if 0 <= nr < GRID_ROWS and 0 <= nc < GRID_COLS:
-                    target = self.board[nr][nc]
-                
-                # Can only move to elemental squares (not neutral)
-                    if any(el in target for el in ["Earth", "Water", "Fire", "Air"]):
-                    # Strict no-backwards movement (except when capturing bases)
-                        if (faction == "Creationist" and nr <= row and nr != 7) or \
-                        (faction == "Evolutionist" and nr >= row and nr != 0):
-                            continue
-                        
-                    # Can't move through arrived pieces
-                        if ((nr, nc) == self.creationist_male_pos and self.creationist_male_arrived) or \
-                        ((nr, nc) == self.creationist_female_pos and self.creationist_female_arrived) or \
-                        ((nr, nc) == self.evolutionist_male_pos and self.evolutionist_male_arrived) or \
-                        ((nr, nc) == self.evolutionist_female_pos and self.evolutionist_female_arrived):
-                            continue
-                        
-                        moves.append((nr, nc))
-    
-    # Elemental pieces move according to their rules
-        elif any(el in piece for el in ["Earth", "Water", "Fire", "Air"]):
-            directions = [(-1,0), (1,0), (0,-1), (0,1), (-1,-1), (-1,1), (1,-1), (1,1)]
-            for dr, dc in directions:
-                nr, nc = row + dr, col + dc
-                path_clear = True
-            
-                while 0 <= nr < GRID_ROWS and 0 <= nc < GRID_COLS and path_clear:
-                    target = self.board[nr][nc]
-                
-                # Can't move through arrived pieces
-                    if ((nr, nc) == self.creationist_male_pos and self.creationist_male_arrived) or \
-                    ((nr, nc) == self.creationist_female_pos and self.creationist_female_arrived) or \
-                    ((nr, nc) == self.evolutionist_male_pos and self.evolutionist_male_arrived) or \
-                    ((nr, nc) == self.evolutionist_female_pos and self.evolutionist_female_arrived):
-                        path_clear = False
+            return []
+        if self.movegen == "bitboard":
+            return self._bitboard_moves(row, col)
+        targets = self._scalar_targets(row * GRID_COLS + col, self._arrived_squares())
+        return [SQUARES[target] for target in targets]
+
+    def _scalar_targets(self, square, blocked):
+        # blocked: arrived pieces, which can't be moved onto or through
+        targets = []
+        flat = self._flat
+        piece = flat[square]
+
+    # Male/Female pieces can step to adjacent elemental squares, never
+    # backwards (except when capturing bases)
+        if IS_HUMAN[piece]:
+            if self._arrived[piece]:
+                return targets  # Can't move after arriving at destination
+            for target in TABLES.steps[FACTION_OF[piece]][square]:
+                if IS_ELEMENT[flat[target]] and target not in blocked:
+                    targets.append(target)
+
+    # Elemental pieces slide over neutral squares, their own element and
+    # male/female pieces, stopping on an element they dominate
+        elif IS_ELEMENT[piece]:
+            prey = DOMINATED[TYPE_OF[piece]]
+            for ray in TABLES.rays[square]:
+                for target in ray:
+                    if target in blocked:
                         break
-                
-                # Check if target is neutral or same element
-                    if target == "Neutral":
-                        moves.append((nr, nc))
-                        nr += dr
-                        nc += dc
+                    code = flat[target]
+                    if code == NEUTRAL or code == piece or IS_HUMAN[code]:
+                        targets.append(target)
                         continue
-                
-                # Check if target is same element
-                    if target == piece:
-                        moves.append((nr, nc))
-                        nr += dr
-                        nc += dc
-                        continue
-                
-                # Check if target is another element
-                    target_element = None
-                    for el in ["Earth", "Water", "Fire", "Air"]:
-                        if el in target:
-                            target_element = el
-                            break
-                
-                    if target_element:
-                        piece_element = piece.split("_")[-1]
-                    
-                    # Check element hierarchy
-                        if ELEMENT_POWER[piece_element] == target_element:
-                        # Can capture/neutralize weaker element (including at bases)
-                            moves.append((nr, nc))
-                    # Equal elements block movement
-                        elif ELEMENT_POWER[target_element] == piece_element or target_element == piece_element:
-                            path_clear = False
-                        else:
-                        # Weaker element, can't move here
-                            path_clear = False
-                        break
-                
-                # If target is male/female, can move through if we can neutralize the element
-                    if target.endswith("Man") or target.endswith("Woman"):
-                    # Need to check the element under the male/female
-                    # For simplicity, we'll assume they're on an element (not neutral)
-                        moves.append((nr, nc))
-                        nr += dr
-                        nc += dc
-                    else:
-                        path_clear = False
-    
-        return moves
-
-# Game setup
-screen = pygame.display.set_mode((SCREEN_SIZE, SCREEN_SIZE))
-pygame.display.set_caption("Origins Game")
-game_env = OriginsEnv()
-model = PPO("MlpPolicy", game_env, verbose=1)
-
-def draw_board():
-    screen.fill((255, 255, 255))
-    for row in range(GRID_ROWS):
-        for col in range(GRID_COLS):
-            piece = game_env.board[row][col]
-            color = COLORS.get(piece, (200, 200, 200))
-            pygame.draw.rect(screen, color, (col * CELL_SIZE, row * CELL_SIZE, CELL_SIZE, CELL_SIZE))
-            
-            font = pygame.font.SysFont(None, 24)
-            text_content = piece.split("_")[-1] if "_" in piece else piece
-            text = font.render(text_content, True, (0, 0, 0))
-            screen.blit(text, (col * CELL_SIZE + 10, row * CELL_SIZE + 10))
-    
-    # Draw grid
-    for i in range(GRID_ROWS + 1):
-        pygame.draw.line(screen, (0, 0, 0), (0, i * CELL_SIZE), (SCREEN_SIZE, i * CELL_SIZE))
-    for i in range(GRID_COLS + 1):
-        pygame.draw.line(screen, (0, 0, 0), (i * CELL_SIZE, 0), (i * CELL_SIZE, SCREEN_SIZE))
-    
-    # Draw turn indicator
-    font = pygame.font.SysFont(None, 36)
-    turn_text = font.render(f"Current Turn: {game_env.turn}", True, (0, 0, 0))
-    screen.blit(turn_text, (10, SCREEN_SIZE - 30))
-    
-    # Draw destination indicators
-    dest_font = pygame.font.SysFont(None, 24)
-    creationist_dest = dest_font.render("Creationist Dest: Row 6", True, (255, 165, 0))
-    evolutionist_dest = dest_font.render("Evolutionist Dest: Row 1", True, (128, 0, 128))
-    screen.blit(creationist_dest, (SCREEN_SIZE - 200, SCREEN_SIZE - 60))
-    screen.blit(evolutionist_dest, (SCREEN_SIZE - 200, SCREEN_SIZE - 30))
-    
-    pygame.display.flip()
-
-# Main game loop
-# ... (keep all your existing code the same until the main game loop)
-
-# Main game loop
-running = True
-selected_piece = None
-valid_moves = []
-
-while running:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        
-        elif event.type == pygame.MOUSEBUTTONDOWN:
-            x, y = pygame.mouse.get_pos()
-            col, row = x // CELL_SIZE, y // CELL_SIZE
-            
-            # Human player's turn (Evolutionist)
-            if game_env.turn == "Evolutionist":
-                piece = game_env.board[row][col]
-                
-                # If no piece selected yet, try to select an Evolutionist piece
-                if selected_piece is None:
-                    if piece.startswith("Evolutionist"):
-                        selected_piece = (row, col)
-                        valid_moves = game_env.get_valid_moves(row, col)
-                        print(f"Selected {piece} at ({row},{col})")
-                        print(f"Valid moves: {valid_moves}")
-                
-                # If we have a selected piece, try to move it
-                elif selected_piece:
-                    if (row, col) in valid_moves:
-                        print(f"Moving from {selected_piece} to ({row},{col})")
-                        game_env.move_piece(selected_piece, (row, col))
-                        game_env.turn = "Creationist"  # Switch to AI's turn
-                        selected_piece = None
-                        valid_moves = []
-                    else:
-                        # Clicked on invalid square - reset selection
-                        selected_piece = None
-                        valid_moves = []
-    
-    # AI's turn (Creationist)
-    if game_env.turn == "Creationist":
-        # Get all possible Creationist pieces with valid moves
-        possible_moves = []
-        for row in range(GRID_ROWS):
-            for col in range(GRID_COLS):
-                piece = game_env.board[row][col]
-                if piece.startswith("Creationist"):
-                    moves = game_env.get_valid_moves(row, col)
-                    if moves:
-                        for move in moves:
-                            possible_moves.append(((row, col), move))
-        
-        if possible_moves:
-            # Randomly select a move from all possible moves
-            start, end = random.choice(possible_moves)
-            game_env.move_piece(start, end)
-            print(f"AI (Creationist) moved {game_env.board[end[0]][end[1]]} from {start} to {end}")
-            game_env.turn = "Evolutionist"
+                # Can capture/neutralize a weaker element (including at bases); anything else blocks
+                    if TYPE_OF[code] == prey:
+                        targets.append(target)
+                    break
+
+        return targets
+
+    # Bitboard move generation (movegen="bitboard"), same moves and order as above
+
+    def _element_mask(self):
+        bb = self._bb
+        return bb[EARTH] | bb[WATER] | bb[FIRE] | bb[AIR] | bb[-EARTH] | bb[-WATER] | bb[-FIRE] | bb[-AIR]
+
+    def _slide_masks(self, piece, blocked):
+        # Squares an element passes over, and the dominated elements it can stop on
+        bb = self._bb
+        prey = DOMINATED[TYPE_OF[piece]]
+        humans = bb[MAN] | bb[WOMAN] | bb[-MAN] | bb[-WOMAN]
+        empty = (bb[NEUTRAL] | bb[piece] | humans) & ~blocked
+        return empty, (bb[prey] | bb[-prey]) & ~blocked
+
+    def _step_mask(self, piece, row, blocked):
+        # Squares a male/female on row may step onto
+        return self._element_mask() & BITBOARDS.advance[FACTION_OF[piece]][row] & ~blocked
+
+    def _bitboard_moves(self, row, col):
+        if not (0 <= row < GRID_ROWS and 0 <= col < GRID_COLS):
+            return []
+        piece = self._board[row, col]
+        square = row * GRID_COLS + col
+        if IS_HUMAN[piece]:
+            if self._arrived[piece]:
+                return []
+            targets = BITBOARDS.step_targets(square, self._step_mask(piece, row, self._arrived_mask()))
+        elif IS_ELEMENT[piece]:
+            targets = BITBOARDS.slide_targets(square, *self._slide_masks(piece, self._arrived_mask()))
         else:
-            print("AI (Creationist) couldn't find a valid move! Passing turn.")
-            game_env.turn = "Evolutionist"
-    
-    # Draw the board
-    draw_board()
-    
-    # Highlight selected piece and valid moves
-    if selected_piece:
-        row, col = selected_piece
-        pygame.draw.rect(screen, (0, 255, 0), 
-                         (col * CELL_SIZE, row * CELL_SIZE, CELL_SIZE, CELL_SIZE), 3)
-        
-        for move_row, move_col in valid_moves:
-            pygame.draw.rect(screen, (0, 255, 255), 
-                             (move_col * CELL_SIZE, move_row * CELL_SIZE, CELL_SIZE, CELL_SIZE), 3)
-    
-    pygame.display.flip()
-    pygame.time.delay(100)  # Small delay to prevent high CPU usage
-
-pygame.quit()
\ No newline at end of file
+            return []
+        return [divmod(target, GRID_COLS) for target in targets]
+
+    def _bitboard_side_targets(self, sign):
+        # (from square, target bitboard) for every piece of one side; the masks
+        # are shared per piece type and nothing is done per target square
+        bb = self._bb
+        blocked = self._arrived_mask()
+        targets = []
+        for piece_type in (EARTH, WATER, FIRE, AIR):
+            piece = sign * piece_type
+            if bb[piece]:
+                empty, prey = self._slide_masks(piece, blocked)
+                for square in iter_bits(bb[piece]):
+                    targets.append((square, BITBOARDS.slide_mask(square, empty, prey)))
+        for piece_type in (WOMAN, MAN):
+            piece = sign * piece_type
+            if bb[piece] and not self._arrived[piece]:
+                for square in iter_bits(bb[piece]):
+                    allowed = self._step_mask(piece, square // GRID_COLS, blocked)
+                    targets.append((square, BITBOARDS.neighbours[square] & allowed))
+        return targets
+
+    def _bitboard_has_moves(self, sign):
+        # Flood-fills every piece of a type at once, no per-piece work for sliders
+        bb = self._bb
+        blocked = self._arrived_mask()
+        for piece_type in (EARTH, WATER, FIRE, AIR):
+            piece = sign * piece_type
+            if bb[piece] and BITBOARDS.fill_targets(bb[piece], *self._slide_masks(piece, blocked)):
+                return True
+        for piece_type in (WOMAN, MAN):
+            piece = sign * piece_type
+            if bb[piece] and not self._arrived[piece]:
+                for square in iter_bits(bb[piece]):
+                    if BITBOARDS.neighbours[square] & self._step_mask(piece, square // GRID_COLS, blocked):
+                        return True
+        return False
+
+    def _bitboard_movable(self, sign):
+        # Pieces of one side with a move, as a bitboard. A piece that can move
+        # at all can move next door, so for sliders it is enough to grow the
+        # passable-or-prey squares by one step in every direction
+        bb = self._bb
+        blocked = self._arrived_mask()
+        movable = 0
+        for piece_type in (EARTH, WATER, FIRE, AIR):
+            piece = sign * piece_type
+            if bb[piece]:
+                empty, prey = self._slide_masks(piece, blocked)
+                reach = empty | prey
+                grown = 0
+                for d in range(len(SLIDE_DIRECTIONS)):
+                    grown |= BITBOARDS.shift(reach, d)
+                movable |= bb[piece] & grown
+        for piece_type in (WOMAN, MAN):
+            piece = sign * piece_type
+            if bb[piece] and not self._arrived[piece]:
+                for square in iter_bits(bb[piece]):
+                    if BITBOARDS.neighbours[square] & self._step_mask(piece, square // GRID_COLS, blocked):
+                        movable |= 1 << square
+        return movable
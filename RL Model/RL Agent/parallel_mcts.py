@@ -0,0 +1,183 @@
+"""Root-parallel MCTS across processes.
+
+Every worker process grows its own tree (``mcts.MCTS``) from the position
+being searched, with its own root noise, and the root visit counts are
+summed to pick the move. Workers do not run the network: their leaf
+batches go to one inference process, which stacks whatever requests are
+waiting into a single evaluator call and sends each worker its slice back.
+
+Run this file to benchmark simulations/sec per worker count.
+"""
+
+import multiprocessing as mp
+import os
+import queue
+import time
+from collections import Counter
+
+import numpy as np
+
+from mcts import DEFAULT_BATCH, MCTS, PolicyEvaluator, UniformEvaluator
+from origins_env import OriginsEnv
+
+
+def load_policy_evaluator(path):
+    # Evaluator factory for a saved PPO model; runs in the inference process
+    from stable_baselines3 import PPO
+    return PolicyEvaluator(PPO.load(path, device="cpu"))
+
+
+class RemoteEvaluator:
+    """Evaluator for a worker process, forwarding to the inference process."""
+
+    def __init__(self, worker_id, requests, responses):
+        self.worker_id = worker_id
+        self.requests = requests
+        self.responses = responses
+
+    def __call__(self, observations):
+        self.requests.put((self.worker_id, observations))
+        return self.responses.get()
+
+
+def _inference_loop(evaluator_factory, requests, responses, max_batch):
+    evaluator = evaluator_factory()
+    while True:
+        pending = [requests.get()]
+        if pending[0] is None:
+            return
+        # Take every request already waiting, up to max_batch observations
+        size = len(pending[0][1])
+        while size < max_batch:
+            try:
+                request = requests.get_nowait()
+            except queue.Empty:
+                break
+            if request is None:
+                requests.put(None)
+                break
+            pending.append(request)
+            size += len(request[1])
+        probs, values = evaluator(np.concatenate([observations for _, observations in pending]))
+        offset = 0
+        for worker_id, observations in pending:
+            end = offset + len(observations)
+            responses[worker_id].put((probs[offset:end], values[offset:end]))
+            offset = end
+
+
+def _worker_loop(worker_id, tasks, results, requests, response, mcts_kwargs):
+    env = OriginsEnv()
+    search = MCTS(RemoteEvaluator(worker_id, requests, response), seed=worker_id, **mcts_kwargs)
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        state, simulations, time_limit = task
+        env.restore(state)
+        search.simulations, search.time_limit = simulations, time_limit
+        root = search.search(env)
+        visits = {} if not root.moves else {
+            move: float(count) for move, count in zip(root.moves, root.visits)
+        }
+        results.put((worker_id, visits, search.playouts))
+
+
+class ParallelMCTS:
+    """Root-parallel PUCT search over ``workers`` processes.
+
+    ``evaluator_factory`` is called once, in the inference process, to build
+    the evaluator (e.g. ``functools.partial(load_policy_evaluator, path)``);
+    it must be picklable. ``simulations`` is the total over all workers, or
+    ``time_limit`` the wall-clock budget each of them gets. Use as a context
+    manager, or call ``close()``, to stop the processes.
+    """
+
+    def __init__(self, evaluator_factory=UniformEvaluator, workers=None, simulations=800,
+                 time_limit=None, batch_size=DEFAULT_BATCH, root_noise=0.25, **mcts_kwargs):
+        self.workers = workers or os.cpu_count()
+        self.simulations = simulations
+        self.time_limit = time_limit
+        self.playouts = 0
+        ctx = mp.get_context()
+        self._requests = ctx.Queue()
+        self._responses = [ctx.Queue() for _ in range(self.workers)]
+        self._tasks = [ctx.Queue() for _ in range(self.workers)]
+        self._results = ctx.Queue()
+        mcts_kwargs.update(batch_size=batch_size, root_noise=root_noise)
+        self._inference = ctx.Process(
+            target=_inference_loop,
+            args=(evaluator_factory, self._requests, self._responses, batch_size * self.workers),
+            daemon=True,
+        )
+        self._processes = [
+            ctx.Process(
+                target=_worker_loop,
+                args=(i, self._tasks[i], self._results, self._requests, self._responses[i], mcts_kwargs),
+                daemon=True,
+            )
+            for i in range(self.workers)
+        ]
+        self._inference.start()
+        for process in self._processes:
+            process.start()
+
+    def root_visits(self, env):
+        """Search the position in ``env``; visits per (from, to) move summed over workers."""
+        state = env.snapshot()
+        share = -(-self.simulations // self.workers)
+        for tasks in self._tasks:
+            tasks.put((state, share, self.time_limit))
+        visits = Counter()
+        self.playouts = 0
+        for _ in range(self.workers):
+            _, worker_visits, playouts = self._results.get()
+            visits.update(worker_visits)
+            self.playouts += playouts
+        return visits
+
+    def choose_move(self, env):
+        """Return ((row, col), (row, col)) for the side to move, or None if it has no move."""
+        visits = self.root_visits(env)
+        if not visits:
+            return None
+        start, end = max(visits, key=visits.get)
+        cols = env._board.shape[1]
+        return divmod(start, cols), divmod(end, cols)
+
+    def close(self):
+        for tasks in self._tasks:
+            tasks.put(None)
+        for process in self._processes:
+            process.join()
+        self._requests.put(None)
+        self._inference.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def benchmark(worker_counts=None, time_limit=5.0, evaluator_factory=UniformEvaluator):
+    """Simulations/sec of a root-parallel search of the opening, per worker count."""
+    if worker_counts is None:
+        cores = os.cpu_count()
+        worker_counts = sorted({1, *(2 ** i for i in range(1, cores.bit_length()) if 2 ** i <= cores), cores})
+    env = OriginsEnv()
+    rates = {}
+    for workers in worker_counts:
+        with ParallelMCTS(evaluator_factory, workers=workers, time_limit=0.1) as search:
+            search.root_visits(env)  # wait for every process to be up
+            search.time_limit = time_limit
+            start = time.perf_counter()
+            search.root_visits(env)
+            rates[workers] = search.playouts / (time.perf_counter() - start)
+        print(f"{workers:3d} workers: {rates[workers]:9.0f} sims/sec "
+              f"({rates[workers] / rates[worker_counts[0]]:.2f}x)")
+    return rates
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,134 @@
+"""Play Origins against the alpha-beta AI in a pygame window.
+
+Run ``python play.py``; you are the Evolutionist side.
+"""
+
+import logging
+
+import pygame
+from game_log import logger
+from origins_env import OriginsEnv, COLORS, GRID_ROWS, GRID_COLS
+from search import AlphaBetaSearch
+
+# Show game events on the console
+logger.addHandler(logging.StreamHandler())
+logger.setLevel(logging.INFO)
+
+# Initialize Pygame
+pygame.init()
+
+SCREEN_SIZE = 600
+CELL_SIZE = SCREEN_SIZE // GRID_COLS
+
+# Game setup
+screen = pygame.display.set_mode((SCREEN_SIZE, SCREEN_SIZE))
+pygame.display.set_caption("Origins Game")
+game_env = OriginsEnv()
+ai = AlphaBetaSearch(time_limit=1.0)
+
+def draw_board():
+    screen.fill((255, 255, 255))
+    for row in range(GRID_ROWS):
+        for col in range(GRID_COLS):
+            piece = game_env.board[row][col]
+            color = COLORS.get(piece, (200, 200, 200))
+            pygame.draw.rect(screen, color, (col * CELL_SIZE, row * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+            
+            font = pygame.font.SysFont(None, 24)
+            text_content = piece.split("_")[-1] if "_" in piece else piece
+            text = font.render(text_content, True, (0, 0, 0))
+            screen.blit(text, (col * CELL_SIZE + 10, row * CELL_SIZE + 10))
+    
+    # Draw grid
+    for i in range(GRID_ROWS + 1):
+        pygame.draw.line(screen, (0, 0, 0), (0, i * CELL_SIZE), (SCREEN_SIZE, i * CELL_SIZE))
+    for i in range(GRID_COLS + 1):
+        pygame.draw.line(screen, (0, 0, 0), (i * CELL_SIZE, 0), (i * CELL_SIZE, SCREEN_SIZE))
+    
+    # Draw turn indicator
+    font = pygame.font.SysFont(None, 36)
+    turn_text = font.render(f"Current Turn: {game_env.turn}", True, (0, 0, 0))
+    screen.blit(turn_text, (10, SCREEN_SIZE - 30))
+    
+    # Draw destination indicators
+    dest_font = pygame.font.SysFont(None, 24)
+    creationist_dest = dest_font.render("Creationist Dest: Row 6", True, (255, 165, 0))
+    evolutionist_dest = dest_font.render("Evolutionist Dest: Row 1", True, (128, 0, 128))
+    screen.blit(creationist_dest, (SCREEN_SIZE - 200, SCREEN_SIZE - 60))
+    screen.blit(evolutionist_dest, (SCREEN_SIZE - 200, SCREEN_SIZE - 30))
+    
+    pygame.display.flip()
+
+# Main game loop
+# ... (keep all your existing code the same until the main game loop)
+
+# Main game loop
+running = True
+selected_piece = None
+valid_moves = []
+
+while running:
+    for event in pygame.event.get():
+        if event.type == pygame.QUIT:
+            running = False
+        
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            x, y = pygame.mouse.get_pos()
+            col, row = x // CELL_SIZE, y // CELL_SIZE
+            
+            # Human player's turn (Evolutionist)
+            if game_env.turn == "Evolutionist":
+                piece = game_env.board[row][col]
+                
+                # If no piece selected yet, try to select an Evolutionist piece
+                if selected_piece is None:
+                    if piece.startswith("Evolutionist"):
+                        selected_piece = (row, col)
+                        valid_moves = game_env.get_valid_moves(row, col)
+                        logger.debug("Selected %s at (%d,%d)", piece, row, col)
+                        logger.debug("Valid moves: %s", valid_moves)
+                
+                # If we have a selected piece, try to move it
+                elif selected_piece:
+                    if (row, col) in valid_moves:
+                        logger.info("Moving from %s to (%d,%d)", selected_piece, row, col)
+                        game_env.move_piece(selected_piece, (row, col))
+                        game_env.turn = "Creationist"  # Switch to AI's turn
+                        selected_piece = None
+                        valid_moves = []
+                    else:
+                        # Clicked on invalid square - reset selection
+                        selected_piece = None
+                        valid_moves = []
+    
+    # AI's turn (Creationist)
+    if game_env.turn == "Creationist":
+        # Search for the best Creationist move within the time budget
+        move = ai.choose_move(game_env)
+
+        if move is not None:
+            start, end = move
+            game_env.move_piece(start, end)
+            logger.info("AI (Creationist) moved %s from %s to %s", game_env.board[end[0]][end[1]], start, end)
+            game_env.turn = "Evolutionist"
+        else:
+            logger.info("AI (Creationist) couldn't find a valid move! Passing turn.")
+            game_env.turn = "Evolutionist"
+    
+    # Draw the board
+    draw_board()
+    
+    # Highlight selected piece and valid moves
+    if selected_piece:
+        row, col = selected_piece
+        pygame.draw.rect(screen, (0, 255, 0), 
+                         (col * CELL_SIZE, row * CELL_SIZE, CELL_SIZE, CELL_SIZE), 3)
+        
+        for move_row, move_col in valid_moves:
+            pygame.draw.rect(screen, (0, 255, 255), 
+                             (move_col * CELL_SIZE, move_row * CELL_SIZE, CELL_SIZE, CELL_SIZE), 3)
+    
+    pygame.display.flip()
+    pygame.time.delay(100)  # Small delay to prevent high CPU usage
+
+pygame.quit()
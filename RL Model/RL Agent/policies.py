@@ -0,0 +1,30 @@
+"""Stable-Baselines3 network pieces for the plane observation.
+
+``OriginsCNN`` reads the (NUM_PLANES, GRID_ROWS, GRID_COLS) 0/1 planes of
+``OriginsEnv(observation="planes")`` with a stack of same-padded 3x3
+convolutions, so every layer keeps the full 8x10 board and sees adjacency
+directly instead of relearning it from a flat vector:
+
+    model = MaskablePPO("CnnPolicy", env, policy_kwargs=CNN_POLICY_KWARGS)
+"""
+
+from torch import nn
+from stable_baselines3.common.torch_layers import BaseFeaturesExtractor
+
+
+class OriginsCNN(BaseFeaturesExtractor):
+    def __init__(self, observation_space, features_dim=256, channels=64, layers=3):
+        super(OriginsCNN, self).__init__(observation_space, features_dim)
+        planes, rows, cols = observation_space.shape
+        convolutions = []
+        for layer in range(layers):
+            convolutions += [nn.Conv2d(planes if layer == 0 else channels, channels, 3, padding=1), nn.ReLU()]
+        self.cnn = nn.Sequential(*convolutions, nn.Flatten())
+        self.linear = nn.Sequential(nn.Linear(channels * rows * cols, features_dim), nn.ReLU())
+
+    def forward(self, observations):
+        return self.linear(self.cnn(observations))
+
+
+# The planes are already 0/1: no scaling by 255 as for images
+CNN_POLICY_KWARGS = {"features_extractor_class": OriginsCNN, "normalize_images": False}
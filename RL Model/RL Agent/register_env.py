@@ -5,3 +5,20 @@ register(
     id="Origins-v0",  # Unique name for the environment
     entry_point="origins_env:OriginsEnv",  # This should match the module and class name
 )
+
+# Whole-move action encodings, see action_encodings.py
+register(
+    id="OriginsFromTo-v0",  # from_square * 80 + to_square
+    entry_point="action_encodings:FromToOriginsEnv",
+)
+register(
+    id="OriginsDirection-v0",  # piece, direction and distance
+    entry_point="action_encodings:DirectionOriginsEnv",
+)
+
+# One step is the agent's Creationist move plus a scripted reply, see
+# opponents.py; gym.make("OriginsVersus-v0", opponent="greedy")
+register(
+    id="OriginsVersus-v0",
+    entry_point="opponents:make_versus_env",
+)
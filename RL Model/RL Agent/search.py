@@ -0,0 +1,352 @@
+"""Alpha-beta search over ``OriginsEnv``.
+
+Negamax with iterative deepening under a hard per-move time budget. Moves
+are played with ``make_move``/``unmake_move`` on the env itself, so a search
+leaves the position exactly as it found it. Move ordering tries the
+transposition-table move first, then captures (most valuable victim first,
+counting a male/female taken on a slide's path, which ends the game),
+then killer moves and the history heuristic; at the horizon a capture-only
+quiescence search settles pending exchanges before the position is scored.
+"""
+
+import time
+
+import numpy as np
+
+from origins_env import IS_ELEMENT, TABLES
+from transposition import EXACT, LOWER, NO_MOVE, UPPER, TranspositionTable
+
+WIN = 1_000_000
+# Scores beyond this are wins/losses found by the search, not evaluations
+WIN_BOUND = WIN - 1000
+MAX_PLY = 128
+
+# Evaluation weights. Elements are cheap: a slide converts every neutral
+# square on its path, so material swings are large and mostly meaningless
+# next to the race to the destination row.
+ELEMENT_VALUE = 10
+HUMAN_VALUE = 500
+PROGRESS_VALUE = 300
+ARRIVED_VALUE = 400
+STRANDED_VALUE = 5000  # more than any distance to go is worth
+STEP_VALUE = 150  # a male/female with an element square to step onto
+
+# Move ordering bands
+TT_MOVE_ORDER = 1 << 30
+CAPTURE_ORDER = 1 << 28
+KILLER_ORDER = 1 << 27
+
+QUIESCENCE_DEPTH = 2
+DELTA_MARGIN = 200
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class AlphaBetaSearch:
+    """Best-move search for the side to move in an ``OriginsEnv``.
+
+    ``time_limit`` is a hard budget in seconds per ``choose_move`` call:
+    the deepest fully searched iteration is used, overridden only by a move
+    an unfinished iteration had already proven better. After a search,
+    ``depth``, ``score`` and ``nodes`` describe it.
+
+    With ``symmetric`` a position and its left-right mirror image share one
+    transposition-table entry, keyed by the smaller of their hashes with the
+    move stored in that orientation. It is off by default, since mirror
+    images are not exactly equivalent (see ``symmetry.py``).
+    """
+
+    def __init__(self, time_limit=1.0, max_depth=32, tt_size_mb=16, symmetric=False):
+        self.time_limit = time_limit
+        self.symmetric = symmetric
+        self.max_depth = min(max_depth, MAX_PLY - QUIESCENCE_DEPTH - 1)
+        self.tt = TranspositionTable(tt_size_mb)
+        self.depth = self.score = self.nodes = 0
+
+    def choose_move(self, env):
+        """Return ((row, col), (row, col)) for the side to move, or None if it has no move."""
+        self._deadline = time.perf_counter() + self.time_limit
+        moves = [tuple(move) for move in env.legal_moves().tolist()]
+        if not moves:
+            return None
+        self._cols = env._board.shape[1]
+        self._size = env._board.size
+        self.nodes = 0
+        self._killers = [[None, None] for _ in range(MAX_PLY)]
+        self._history = {}
+
+        best, self.depth, self.score = moves[0], 0, 0
+        if len(moves) > 1:
+            # Depth 0: the best child by static evaluation, the move played
+            # if not even depth 1 finishes in time
+            moves = self._static_order(env, moves)
+            best = moves[0]
+            undo_depth = len(env._undo_stack)
+            for depth in range(1, self.max_depth + 1):
+                self._partial = None
+                try:
+                    score, move = self._root(env, moves, best, depth)
+                except SearchTimeout:
+                    # Unwind whatever the interrupted iteration left on the board
+                    while len(env._undo_stack) > undo_depth:
+                        env.unmake_move()
+                    # The previous best move is searched first, so any move
+                    # the unfinished iteration preferred to it is better still
+                    if self._partial is not None:
+                        best, self.score = self._partial[1], self._partial[0]
+                    break
+                best, self.depth, self.score = move, depth, score
+                if abs(score) >= WIN_BOUND:
+                    break
+        return divmod(best[0], self._cols), divmod(best[1], self._cols)
+
+    def _static_order(self, env, moves):
+        # Captures are scored first, so that a pass cut short by the clock
+        # has still seen them; moves it didn't reach keep that order
+        victims = capture_victims(env, moves, _side(env))
+        ranked = sorted(zip(victims, moves), key=lambda item: -_victim_value(item[0]) if item[0] else 0)
+        moves = [move for _, move in ranked]
+        scored = []
+        for move in moves:
+            if time.perf_counter() > self._deadline:
+                break
+            env.make_move(divmod(move[0], self._cols), divmod(move[1], self._cols))
+            result = env.outcome(check_moves=False)
+            score = self._terminal_score(env, result[0], 1) if result is not None else self.evaluate(env)
+            env.unmake_move()
+            scored.append((-score, move))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [move for _, move in scored] + moves[len(scored):]
+
+    def _root(self, env, moves, previous, depth):
+        alpha, best = -WIN, previous
+        ordered = self._order(env, moves, self._encode(previous), 0)
+        for move in ordered:
+            env.make_move(divmod(move[0], self._cols), divmod(move[1], self._cols))
+            score = -self._negamax(env, depth - 1, -WIN, -alpha, 1)
+            env.unmake_move()
+            if score > alpha:
+                alpha, best = score, move
+                self._partial = alpha, best
+        key, mirrored = self._key(env)
+        self.tt.store(key, depth, EXACT, alpha, self._orient(self._encode(best), mirrored))
+        return alpha, best
+
+    def _negamax(self, env, depth, alpha, beta, ply):
+        self._tick()
+        result = env.outcome(check_moves=False)
+        if result is not None:
+            return self._terminal_score(env, result[0], ply)
+        if depth <= 0:
+            return self._quiesce(env, alpha, beta, ply, QUIESCENCE_DEPTH)
+
+        key, mirrored = self._key(env)
+        entry = self.tt.probe(key)
+        tt_move = NO_MOVE
+        if entry is not None:
+            entry_depth, bound, score, tt_move = entry
+            tt_move = self._orient(tt_move, mirrored)
+            if entry_depth >= depth:
+                score = _score_from_tt(score, ply)
+                if bound == EXACT or (bound == LOWER and score >= beta) or (bound == UPPER and score <= alpha):
+                    return score
+
+        moves = [tuple(move) for move in env.legal_moves().tolist()]
+        if not moves:
+            return 0  # stalemate
+
+        original_alpha, best = alpha, NO_MOVE
+        for move in self._order(env, moves, tt_move, ply):
+            env.make_move(divmod(move[0], self._cols), divmod(move[1], self._cols))
+            score = -self._negamax(env, depth - 1, -beta, -alpha, ply + 1)
+            env.unmake_move()
+            if score > alpha:
+                alpha, best = score, self._encode(move)
+                if alpha >= beta:
+                    if not self._is_capture(env, move):
+                        self._remember_cutoff(move, depth, ply)
+                    break
+
+        bound = UPPER if alpha <= original_alpha else LOWER if alpha >= beta else EXACT
+        self.tt.store(key, depth, bound, _score_to_tt(alpha, ply), self._orient(best, mirrored))
+        return alpha
+
+    def _quiesce(self, env, alpha, beta, ply, depth):
+        self._check_time()
+        stand_pat = self.evaluate(env)
+        if stand_pat >= beta or depth == 0:
+            return stand_pat
+        alpha = max(alpha, stand_pat)
+
+        moves = env.legal_moves().tolist()
+        captures = sorted(
+            ((victim, move) for victim, move in zip(capture_victims(env, moves, _side(env)), moves) if victim),
+            key=lambda capture: -_victim_value(capture[0]),
+        )
+        for victim, (start, end) in captures:
+            # Delta pruning: not even winning this victim outright lifts alpha
+            if stand_pat + _victim_value(victim) + DELTA_MARGIN <= alpha:
+                break
+            env.make_move(divmod(start, self._cols), divmod(end, self._cols))
+            self._tick()
+            result = env.outcome(check_moves=False)
+            if result is not None:
+                score = -self._terminal_score(env, result[0], ply + 1)
+            else:
+                score = -self._quiesce(env, -beta, -alpha, ply + 1, depth - 1)
+            env.unmake_move()
+            if score > alpha:
+                alpha = score
+                if alpha >= beta:
+                    break
+        return alpha
+
+    def evaluate(self, env):
+        """Static score of the position for the side to move.
+
+        Material, each male/female's distance to its destination row, a
+        bonus when it has a square to step onto, and a bonus per arrival; a
+        male/female whose square was taken over can no longer arrive and
+        costs more than any distance left to go.
+        """
+        score = 0
+        squares = env._squares
+        for code in range(1, 5):
+            score += ELEMENT_VALUE * (len(squares[code]) - len(squares[-code]))
+        for code in (5, 6, -5, -6):
+            sign = 1 if code > 0 else -1
+            if env._arrived[code]:
+                value = ARRIVED_VALUE
+            elif env._pos[code] is None:
+                continue
+            else:
+                row, col = env._pos[code]
+                square = row * self._cols + col
+                if env._flat[square] != code:
+                    value = -STRANDED_VALUE
+                else:
+                    value = -PROGRESS_VALUE * abs(env._dest[code] - row)
+                    if any(IS_ELEMENT[env._flat[target]] for target in TABLES.steps[sign][square]):
+                        value += STEP_VALUE
+            score += sign * value
+        return score * _side(env)
+
+    def _terminal_score(self, env, winner, ply):
+        if not winner:
+            return 0
+        return WIN - ply if winner == _side(env) else ply - WIN
+
+    def _order(self, env, moves, tt_move, ply):
+        killers = self._killers[ply]
+        history = self._history
+
+        def rank(item):
+            move, victim = item
+            encoded = self._encode(move)
+            if encoded == tt_move:
+                return TT_MOVE_ORDER
+            if victim:
+                return CAPTURE_ORDER + _victim_value(victim)
+            if move in killers:
+                return KILLER_ORDER
+            return history.get(encoded, 0)
+
+        ranked = sorted(zip(moves, capture_victims(env, moves, _side(env))), key=rank, reverse=True)
+        return [move for move, _ in ranked]
+
+    def _remember_cutoff(self, move, depth, ply):
+        killers = self._killers[ply]
+        if killers[0] != move:
+            killers[1], killers[0] = killers[0], move
+        encoded = self._encode(move)
+        self._history[encoded] = self._history.get(encoded, 0) + depth * depth
+
+    def _is_capture(self, env, move):
+        return bool(capture_victims(env, [move], _side(env))[0])
+
+    def _encode(self, move):
+        return move[0] * self._size + move[1]
+
+    def _key(self, env):
+        # (transposition key, whether it is the mirror image's hash)
+        key = env.position_hash()
+        if self.symmetric:
+            mirrored = env.position_hash(mirrored=True)
+            if mirrored < key:
+                return mirrored, True
+        return key, False
+
+    def _orient(self, encoded, mirrored):
+        # An encoded move as seen in the mirror image, if mirrored
+        if not mirrored or encoded == NO_MOVE:
+            return encoded
+        start, end = divmod(encoded, self._size)
+        cols = self._cols
+        return (start + cols - 1 - 2 * (start % cols)) * self._size + end + cols - 1 - 2 * (end % cols)
+
+    def _tick(self):
+        self.nodes += 1
+        self._check_time()
+
+    def _check_time(self):
+        # A clock read costs far less than generating one node's moves, so
+        # every node checks it and a move overruns its budget by about one node
+        if time.perf_counter() > self._deadline:
+            raise SearchTimeout
+
+
+def _side(env):
+    return 1 if env.turn == "Creationist" else -1
+
+
+def capture_victims(env, moves, side):
+    """The most valuable enemy piece (its code) each (from, to) square move by
+    ``side`` takes, 0 for none: the piece it lands on, or a male/female
+    captured on its path."""
+    moves = np.asarray(moves, dtype=np.intp).reshape(-1, 2)
+    flat = env._flat
+    landing = flat[moves[:, 1]]
+    victims = np.where(landing * side < 0, landing, 0)
+    for code in (-side * 5, -side * 6):
+        for square in env._squares[code]:
+            # Only the moves passing over the male/female can capture it
+            for i in np.flatnonzero(_ON_PATH[square][moves[:, 0], moves[:, 1]]).tolist():
+                if abs(victims[i]) < 5 and square in env.captured_humans(int(moves[i, 0]), int(moves[i, 1])):
+                    victims[i] = code
+    return victims.tolist()
+
+
+def _on_path():
+    # _ON_PATH[square][start, end]: square is on the path of a slide from start to end
+    size = len(TABLES.between)
+    table = np.zeros((size, size, size), dtype=bool)
+    for start, paths in enumerate(TABLES.between):
+        for end, path in paths.items():
+            table[list(path), start, end] = True
+    return table
+
+
+_ON_PATH = _on_path()
+
+
+def _victim_value(code):
+    return HUMAN_VALUE if abs(code) >= 5 else ELEMENT_VALUE
+
+
+def _score_to_tt(score, ply):
+    # Win/loss scores are stored relative to the node, not the root
+    if score >= WIN_BOUND:
+        return score + ply
+    if score <= -WIN_BOUND:
+        return score - ply
+    return score
+
+
+def _score_from_tt(score, ply):
+    if score >= WIN_BOUND:
+        return score - ply
+    if score <= -WIN_BOUND:
+        return score + ply
+    return score
@@ -0,0 +1,226 @@
+"""Self-play training where the learning agent only ever plays one side.
+
+``OriginsEnv.step`` plays whichever side is to move and scores the result
+from ``self.turn``, so a single policy stepping it trains on both sides'
+moves. ``SelfPlayVecEnv`` runs N games in process and hands the agent only
+the positions where its own side (``agent_side``) is to move; each game's
+other side is played by an opponent drawn from an ``OpponentPool`` when the
+game starts. Opponent moves are grouped by opponent, so every game facing
+the same frozen policy is answered with one batched forward pass.
+
+With ``agent_side="both"`` the agent plays the Creationists in the even
+games and the Evolutionists in the odd ones. That needs whole-move envs
+built with ``perspective="side_to_move"``, where both sides look like the
+Creationists: one network then learns from both sides' moves, and a frozen
+checkpoint answers the games of both colours in the same batch. In the default
+absolute perspective, checkpoints of the agent play the other side with
+the position flipped (``flip_perspective``), so they see it as the side
+they were trained on.
+
+Rewards are the agent's: +1/-1 for its own moves as in ``OriginsEnv``, and
+at the end of a game +100 for a win, -100 for a loss and 0 for a draw,
+whichever side's move ended it.
+
+``SelfPlayCallback`` saves the learning model into the pool every
+``save_every`` timesteps, so the agent keeps meeting its past selves.
+"""
+
+import os
+
+import numpy as np
+from stable_baselines3.common.callbacks import BaseCallback
+from stable_baselines3.common.vec_env.base_vec_env import VecEnv
+
+from opponents import GreedyCaptureOpponent, PolicyOpponent, RandomOpponent, outcome_reward
+from origins_env import OriginsEnv
+
+
+class OpponentPool:
+    """Scripted bots plus the newest ``max_checkpoints`` frozen policies.
+
+    Opponents are sampled uniformly. ``add`` saves a model under
+    ``checkpoint_dir`` and adds a frozen copy loaded back from disk, so a
+    later run can rebuild the pool with ``load_checkpoints``.
+    """
+
+    def __init__(self, scripted=None, checkpoint_dir="self_play_checkpoints", max_checkpoints=10,
+                 deterministic=False, seed=None):
+        if scripted is None:
+            scripted = [RandomOpponent(seed), GreedyCaptureOpponent(seed)]
+        self.scripted = list(scripted)
+        self.checkpoints = []
+        self.checkpoint_dir = checkpoint_dir
+        self.max_checkpoints = max_checkpoints
+        self.deterministic = deterministic
+        self.rng = np.random.default_rng(seed)
+
+    @property
+    def opponents(self):
+        return self.scripted + self.checkpoints
+
+    def sample(self):
+        opponents = self.opponents
+        return opponents[self.rng.integers(len(opponents))]
+
+    def add(self, model, name=None):
+        """Freeze ``model`` as it is now and add it to the pool."""
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+        path = os.path.join(self.checkpoint_dir, name or f"checkpoint_{model.num_timesteps}")
+        model.save(path)
+        self._add(PolicyOpponent.load(path, type(model), self.deterministic))
+        return path
+
+    def load_checkpoints(self, algorithm):
+        """Add every checkpoint already saved under ``checkpoint_dir``, oldest first."""
+        if not os.path.isdir(self.checkpoint_dir):
+            return
+        paths = [os.path.join(self.checkpoint_dir, name) for name in os.listdir(self.checkpoint_dir)
+                 if name.endswith(".zip")]
+        for path in sorted(paths, key=os.path.getmtime):
+            self._add(PolicyOpponent.load(path, algorithm, self.deterministic))
+
+    def _add(self, opponent):
+        self.checkpoints.append(opponent)
+        del self.checkpoints[:-self.max_checkpoints]
+
+
+class SelfPlayVecEnv(VecEnv):
+    """Stable-Baselines3 ``VecEnv`` of ``num_envs`` games against ``pool`` opponents.
+
+    A game the opponent's first move already ends is left finished, and the
+    next step reports it (done, its outcome and terminal observation)
+    whatever the agent plays there.
+    """
+
+    def __init__(self, num_envs, pool, agent_side="Creationist", env_fn=OriginsEnv):
+        self.envs = [env_fn() for _ in range(num_envs)]
+        super(SelfPlayVecEnv, self).__init__(num_envs, self.envs[0].observation_space, self.envs[0].action_space)
+        if agent_side == "both":
+            if self.envs[0].perspective != "side_to_move":
+                raise ValueError("agent_side='both' needs envs with perspective='side_to_move'")
+            self.agent_sides = ["Creationist", "Evolutionist"] * (num_envs // 2) + ["Creationist"] * (num_envs % 2)
+        else:
+            self.agent_sides = [agent_side] * num_envs
+        self.pool = pool
+        self.agent_side = agent_side
+        self.opponents = [None] * num_envs
+        self._fallback = RandomOpponent()
+        self._actions = None
+        self._ended_on_start = {}
+
+    def _start(self, indices):
+        # New games with fresh opponents, which move first if the agent
+        # doesn't; the games that first move ends wait for the next step
+        for i in indices:
+            self.envs[i].reset()
+            self.opponents[i] = self.pool.sample()
+        first = [i for i in indices if self.envs[i].turn != self.agent_sides[i]]
+        self._ended_on_start.update(self._opponent_moves(first))
+
+    def _opponent_moves(self, indices):
+        # One opponent move in each game, batched per opponent; returns the
+        # games that ended, mapping index -> (observation, info)
+        ended = {}
+        groups = {}
+        for i in indices:
+            groups.setdefault(id(self.opponents[i]), []).append(i)
+        absolute = self.envs[0].perspective == "absolute"
+        for group in groups.values():
+            opponent = self.opponents[group[0]]
+            envs = [self.envs[i] for i in group]
+            if isinstance(opponent, PolicyOpponent) and absolute:
+                results = opponent.play(envs, flip=True)
+            else:
+                results = opponent.play(envs)
+            for i, result in zip(group, results):
+                if not result[2] and self.envs[i].turn != self.agent_sides[i]:
+                    # The opponent picked an action that doesn't count (an
+                    # unmasked policy can); a random legal move stands in for it
+                    result = self._fallback.play([self.envs[i]])[0]
+                observation, _, done, info = result
+                if done:
+                    ended[i] = observation, info
+        return ended
+
+    def reset(self):
+        self._ended_on_start = {}
+        self._start(range(self.num_envs))
+        return self._observations()
+
+    def step_async(self, actions):
+        self._actions = actions
+
+    def step_wait(self):
+        rewards = np.zeros(self.num_envs, dtype=np.float32)
+        dones = np.zeros(self.num_envs, dtype=bool)
+        infos = [{} for _ in range(self.num_envs)]
+        ended = {}
+        replies = []
+        for i, (env, action) in enumerate(zip(self.envs, self._actions)):
+            if i in self._ended_on_start:
+                # Over before the agent's first move: the action is ignored
+                ended[i] = self._ended_on_start.pop(i)
+                continue
+            observation, rewards[i], done, info = env.step(action)
+            if done:
+                ended[i] = observation, info
+            elif env.turn != self.agent_sides[i]:
+                replies.append(i)
+        ended.update(self._opponent_moves(replies))
+        for i, (observation, info) in ended.items():
+            dones[i] = True
+            rewards[i] = outcome_reward(info["outcome"], self.agent_sides[i])
+            infos[i] = dict(info, terminal_observation=observation)
+        if ended:
+            self._start(list(ended))
+        return self._observations(), rewards, dones, infos
+
+    def _observations(self):
+        return np.stack([env.get_observation() for env in self.envs])
+
+    def close(self):
+        for env in self.envs:
+            env.close()
+
+    def seed(self, seed=None):
+        # Only the opponents are random; seed them through the pool, and here
+        # just the fallback for moves that don't count
+        self._fallback.rng = np.random.default_rng(seed)
+        return [None for _ in range(self.num_envs)]
+
+    def get_attr(self, attr_name, indices=None):
+        return [getattr(self.envs[i], attr_name) for i in self._get_indices(indices)]
+
+    def set_attr(self, attr_name, value, indices=None):
+        for i in self._get_indices(indices):
+            setattr(self.envs[i], attr_name, value)
+
+    def action_masks(self):
+        return np.stack([env.action_masks() for env in self.envs])
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        return [
+            getattr(self.envs[i], method_name)(*method_args, **method_kwargs)
+            for i in self._get_indices(indices)
+        ]
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for _ in self._get_indices(indices)]
+
+
+class SelfPlayCallback(BaseCallback):
+    """Adds the learning model to ``pool`` every ``save_every`` timesteps."""
+
+    def __init__(self, pool, save_every=50000, verbose=0):
+        super(SelfPlayCallback, self).__init__(verbose)
+        self.pool = pool
+        self.save_every = save_every
+        self._next = save_every
+
+    def _on_step(self):
+        if self.num_timesteps >= self._next:
+            path = self.pool.add(self.model)
+            self._next += self.save_every
+            if self.verbose:
+                print(f"Added {path} to the opponent pool ({len(self.pool.checkpoints)} checkpoints)")
+        return True
@@ -0,0 +1,248 @@
+"""Multiprocess Origins ``VecEnv`` that steps through shared memory.
+
+``SubprocVecEnv`` pickles every action, observation, reward, done and info
+through a pipe per env per step. ``SharedMemoryVecEnv`` instead gives the
+workers ``multiprocessing.shared_memory`` arrays for actions, observations,
+terminal observations, rewards, dones and action masks. A step writes the
+actions, releases each worker's semaphore and waits on one shared "done"
+semaphore; the workers read their actions and write their results in place.
+
+Each worker runs a contiguous block of envs. The pipe carries only what
+cannot live in a fixed-size array: info dicts, which ``OriginsEnv`` only
+returns when a game ends, exceptions, and ``env_method``/``get_attr``/
+``set_attr`` calls.
+"""
+
+import multiprocessing as mp
+import os
+import traceback
+from multiprocessing import shared_memory
+
+import numpy as np
+from stable_baselines3.common.vec_env.base_vec_env import VecEnv
+
+from origins_env import OriginsEnv
+
+# Commands to the workers
+STEP, RESET, CALL, CLOSE = range(4)
+
+
+def _shared_array(shape, dtype):
+    dtype = np.dtype(dtype)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * dtype.itemsize))
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _attach(spec):
+    name, shape, dtype = spec
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _worker(first, env_fns, specs, go, done, pipe):
+    handles, arrays = zip(*(_attach(spec) for spec in specs))
+    actions, observations, terminal, rewards, dones, masks, command, has_info, failed = arrays
+    envs = [env_fn() for env_fn in env_fns]
+    indices = range(first, first + len(envs))
+
+    def publish(i, env):
+        observations[i] = env.get_observation(copy=False)
+        masks[i] = env.action_masks()
+
+    try:
+        while True:
+            go.acquire()
+            cmd = command[0]
+            if cmd == CLOSE:
+                break
+            if cmd == CALL:
+                kind, name, args, kwargs, targets = pipe.recv()
+                try:
+                    if kind == "env_method":
+                        results = [getattr(envs[i - first], name)(*args, **kwargs) for i in targets]
+                    elif kind == "get_attr":
+                        results = [getattr(envs[i - first], name) for i in targets]
+                    elif kind == "seed":
+                        # Env i gets seed + i; envs with nothing random have no seed()
+                        results = [
+                            envs[i - first].seed(args[0] + i) if hasattr(envs[i - first], "seed") else None
+                            for i in targets
+                        ]
+                    else:
+                        results = [setattr(envs[i - first], name, args[0]) for i in targets]
+                    for i in targets:
+                        publish(i, envs[i - first])
+                    pipe.send((True, results))
+                except Exception:
+                    pipe.send((False, traceback.format_exc()))
+                continue
+            try:
+                infos = []
+                for i, env in zip(indices, envs):
+                    if cmd == STEP:
+                        _, rewards[i], dones[i], info = env.step(actions[i])
+                        if dones[i]:
+                            terminal[i] = env.get_observation(copy=False)
+                            env.reset()
+                        if info:
+                            infos.append((i, info))
+                    else:
+                        env.reset()
+                    has_info[i] = False
+                    publish(i, env)
+                for i, _ in infos:
+                    has_info[i] = True
+                if infos:
+                    pipe.send(infos)
+            except Exception:
+                failed[first] = True
+                pipe.send(traceback.format_exc())
+            done.release()
+    finally:
+        for env in envs:
+            env.close()
+        for shm in handles:
+            shm.close()
+
+
+class SharedMemoryVecEnv(VecEnv):
+    """Stable-Baselines3 ``VecEnv`` running ``num_envs`` games in ``workers`` processes.
+
+    ``env_fn`` builds one env in a worker and must be picklable under the
+    ``start_method`` in use (a class, or a ``functools.partial`` of one).
+    Envs must provide ``get_observation(copy=False)`` and ``action_masks()``
+    like ``OriginsEnv``.
+    """
+
+    def __init__(self, num_envs, workers=None, env_fn=OriginsEnv, start_method=None):
+        workers = min(num_envs, workers or os.cpu_count())
+        template = env_fn()
+        super(SharedMemoryVecEnv, self).__init__(num_envs, template.observation_space, template.action_space)
+        obs_shape = template.get_observation(copy=False).shape
+        obs_dtype = template.get_observation(copy=False).dtype
+        mask_size = len(template.action_masks())
+        template.close()
+
+        self._handles = []
+        arrays = []
+        for shape, dtype in (
+            ((num_envs,), np.int64),  # actions
+            ((num_envs,) + obs_shape, obs_dtype),  # observations
+            ((num_envs,) + obs_shape, obs_dtype),  # terminal observations
+            ((num_envs,), np.float32),  # rewards
+            ((num_envs,), bool),  # dones
+            ((num_envs, mask_size), bool),  # action masks
+            ((1,), np.int8),  # command
+            ((num_envs,), bool),  # an info dict is waiting in the pipe
+            ((num_envs,), bool),  # the worker starting at this env failed
+        ):
+            shm, array = _shared_array(shape, dtype)
+            self._handles.append(shm)
+            arrays.append(array)
+        (self._actions, self._observations, self._terminal, self._rewards, self._dones, self._masks,
+         self._command, self._has_info, self._failed) = arrays
+        specs = [(shm.name, array.shape, array.dtype) for shm, array in zip(self._handles, arrays)]
+
+        ctx = mp.get_context(start_method)
+        self._done = ctx.Semaphore(0)
+        self._workers = []
+        for block in np.array_split(np.arange(num_envs), workers):
+            go = ctx.Semaphore(0)
+            parent, child = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker,
+                args=(int(block[0]), [env_fn] * len(block), specs, go, self._done, child),
+                daemon=True,
+            )
+            process.start()
+            child.close()
+            self._workers.append((block, go, parent, process))
+        self.closed = False
+
+    def _run(self, cmd):
+        self._command[0] = cmd
+        for _, go, _, _ in self._workers:
+            go.release()
+        for _ in self._workers:
+            self._done.acquire()
+        infos = [{} for _ in range(self.num_envs)]
+        errors = []
+        for block, _, pipe, _ in self._workers:
+            if self._failed[block[0]]:
+                errors.append(pipe.recv())
+            elif self._has_info[block].any():
+                for i, info in pipe.recv():
+                    infos[i] = info
+        if errors:
+            raise RuntimeError("Env worker failed:\n" + errors[0])
+        return infos
+
+    def reset(self):
+        self._run(RESET)
+        return self._observations.copy()
+
+    def step_async(self, actions):
+        self._actions[:] = actions
+
+    def step_wait(self):
+        infos = self._run(STEP)
+        for i in np.flatnonzero(self._dones):
+            infos[i]["terminal_observation"] = self._terminal[i].copy()
+        return self._observations.copy(), self._rewards.copy(), self._dones.copy(), infos
+
+    def close(self):
+        if self.closed:
+            return
+        self._command[0] = CLOSE
+        for _, go, _, _ in self._workers:
+            go.release()
+        for _, _, pipe, process in self._workers:
+            process.join()
+            pipe.close()
+        for shm in self._handles:
+            shm.close()
+            shm.unlink()
+        self.closed = True
+
+    def seed(self, seed=None):
+        # OriginsEnv has no randomness, but a wrapper such as VersusOpponentEnv
+        # may; like make_vec_env, env i is seeded with seed + i
+        if seed is None:
+            return [None for _ in range(self.num_envs)]
+        return self._call("seed", "seed", (seed,), {}, None)
+
+    def _call(self, kind, name, args, kwargs, indices):
+        indices = set(self._get_indices(indices))
+        requests = []
+        for block, go, pipe, _ in self._workers:
+            targets = [int(i) for i in block if i in indices]
+            if targets:
+                self._command[0] = CALL
+                pipe.send((kind, name, args, kwargs, targets))
+                go.release()
+                requests.append(pipe)
+        results = []
+        for pipe in requests:
+            ok, result = pipe.recv()
+            if not ok:
+                raise RuntimeError("Env worker failed:\n" + result)
+            results.extend(result)
+        return results
+
+    def get_attr(self, attr_name, indices=None):
+        return self._call("get_attr", attr_name, (), {}, indices)
+
+    def set_attr(self, attr_name, value, indices=None):
+        self._call("set_attr", attr_name, (value,), {}, indices)
+
+    def action_masks(self):
+        return self._masks.copy()
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        if method_name == "action_masks":
+            # Already in shared memory, one row per env as get_action_masks expects
+            return list(self._masks[self._get_indices(indices)])
+        return self._call("env_method", method_name, method_args, method_kwargs, indices)
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for _ in self._get_indices(indices)]
@@ -0,0 +1,100 @@
+"""Left-right mirror symmetry of Origins positions.
+
+Mirroring across the vertical centre line maps square (row, col) to
+(row, GRID_COLS - 1 - col). The starting position is its own mirror image
+apart from the Woman and Man on columns 4 and 5, and slides, steps and
+captures are mirror symmetric, so a mirrored position plays out as the
+mirror image of the original, with two exceptions:
+
+- Whether a slide captures a Man/Woman depends on the element "under" it,
+  the first of its up, down, left and right neighbours. With different
+  elements on its left and right and none above or below, as on the home
+  rows at the start, the mirror image looks at the other one.
+- ``OriginsEnv``'s square actions play a piece's first valid move, which is
+  not the mirror of the mirrored piece's first move. The whole-move
+  encodings of ``action_encodings`` mirror exactly.
+
+This module mirrors boards, game states, observations, actions and action
+masks, doubles training batches with their mirror images (``augment``), and
+gives the canonical (smaller) of a position's and its mirror image's hashes,
+so caches and transposition tables share entries between the two. Because
+of the first exception, a shared entry can be off for positions where such
+a capture is possible.
+"""
+
+import numpy as np
+
+from action_encodings import DIRECTION_MOVES, FROM_TO_MOVES, MAX_DISTANCE
+from origins_env import GRID_COLS, GRID_ROWS, MIRROR_SQUARES, SLIDE_DIRECTIONS, TURN_SLOT
+
+SIZE = GRID_ROWS * GRID_COLS
+MIRROR_SQUARES_T = np.array(MIRROR_SQUARES, dtype=np.intp)
+MIRROR_DIRECTIONS = np.array([SLIDE_DIRECTIONS.index((dr, -dc)) for dr, dc in SLIDE_DIRECTIONS], dtype=np.intp)
+
+
+def _direction_mirror():
+    actions = np.arange(len(DIRECTION_MOVES)).reshape(SIZE, len(SLIDE_DIRECTIONS), MAX_DISTANCE)
+    return actions[MIRROR_SQUARES_T][:, MIRROR_DIRECTIONS].reshape(-1)
+
+
+# MIRROR_ACTIONS[encoding][action] = the mirrored action; each is its own inverse
+MIRROR_ACTIONS = {
+    "square": MIRROR_SQUARES_T,
+    "from_to": MIRROR_SQUARES_T[FROM_TO_MOVES[:, 0]] * SIZE + MIRROR_SQUARES_T[FROM_TO_MOVES[:, 1]],
+    "direction": _direction_mirror(),
+}
+
+
+def mirror_board(board):
+    """Mirror one (GRID_ROWS, GRID_COLS) board or a stack of them."""
+    return np.ascontiguousarray(np.asarray(board)[..., ::-1])
+
+
+def mirror_square(square):
+    return int(MIRROR_SQUARES_T[square])
+
+
+def mirror_state(state):
+    """Mirror an ``OriginsEnv.snapshot()`` for ``restore``."""
+    board, turn, pos, dest, arrived = state
+    pos = [None if p is None else (p[0], GRID_COLS - 1 - p[1]) for p in pos]
+    return mirror_board(board), turn, pos, list(dest), list(arrived)
+
+
+def mirror_observation(observations, observation="flat"):
+    """Mirror one observation or a batch, in either ``OriginsEnv`` encoding."""
+    observations = np.asarray(observations)
+    if observation == "planes":
+        return mirror_board(observations)
+    mirrored = observations.copy()
+    mirrored[..., :TURN_SLOT] = observations[..., MIRROR_SQUARES_T]
+    return mirrored
+
+
+def mirror_actions(actions, encoding="square"):
+    return MIRROR_ACTIONS[encoding][np.asarray(actions, dtype=np.intp)]
+
+
+def mirror_masks(masks, encoding="square"):
+    """Masks over mirrored actions: entry a is the original's entry for mirror(a)."""
+    return np.asarray(masks)[..., MIRROR_ACTIONS[encoding]]
+
+
+def augment(observations, actions, masks=None, encoding="from_to", observation="flat"):
+    """A batch followed by its mirror image, as (observations, actions, masks).
+
+    Anything else stored per sample (rewards, returns, advantages, values)
+    carries over unchanged to the mirrored half: repeat it twice.
+    """
+    observations = np.concatenate([observations, mirror_observation(observations, observation)])
+    actions = np.concatenate([actions, mirror_actions(actions, encoding).astype(np.asarray(actions).dtype)])
+    if masks is not None:
+        masks = np.concatenate([masks, mirror_masks(masks, encoding)])
+    return observations, actions, masks
+
+
+def canonical_hash(env):
+    """(hash, mirrored): the smaller of the position's and its mirror image's
+    hashes, and whether it is the mirror image's."""
+    key, mirrored = env.position_hash(), env.position_hash(mirrored=True)
+    return (mirrored, True) if mirrored < key else (key, False)
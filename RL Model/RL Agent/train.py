@@ -0,0 +1,367 @@
+"""Multi-worker PPO training for Origins.
+
+``main.py`` trains on one env in the main process. This runs ``--workers``
+envs in ``SubprocVecEnv`` subprocesses, seeded ``seed + rank``, and keeps the
+rollout size fixed: each worker collects ``rollout_steps // workers`` steps,
+so changing the worker count changes the wall clock but not what PPO sees
+per update. Settings come from the defaults below, then an optional JSON
+``--config`` file, then command-line flags:
+
+    python train.py --workers 8 --timesteps 1000000
+    python train.py --config ppo.json --learning-rate 1e-4
+
+``--vec-env shared`` steps the workers through shared memory instead of
+pipes (see ``shared_memory_env.py``). ``--self-play`` trains one side
+(``--agent-side``, Creationist by default) against an opponent pool of
+scripted bots and past checkpoints (see ``self_play.py``); ``--opponent
+greedy`` instead answers every agent move with a scripted reply inside the
+env (see ``opponents.py``).
+
+Env-steps/sec of rollout collection alone (without the PPO update) is logged
+as ``time/env_steps_per_sec`` after every rollout and printed at the end;
+``--benchmark 1 2 4 8`` trains briefly at each worker count and prints the
+rates side by side, to pick the count for a machine.
+
+``--observation planes`` trains a CNN (``policies.OriginsCNN``) on the plane
+observation. To compare setups by sample efficiency and wall clock,
+``--target-win-rate 0.9`` evaluates against ``--eval-opponent`` every
+``--eval-every`` steps and reports when the rate was first reached.
+``--mirror-augment`` doubles every rollout with its left-right mirror image
+(see ``symmetry.py``). ``--perspective side_to_move`` shows every position
+as the side to move sees it, so one network plays both sides; with
+``--self-play --agent-side both`` it learns from both sides' games.
+"""
+
+import argparse
+import functools
+import json
+import time
+
+import numpy as np
+from stable_baselines3 import PPO
+from stable_baselines3.common.callbacks import BaseCallback
+from stable_baselines3.common.env_util import make_vec_env
+from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv, VecMonitor
+from sb3_contrib import MaskablePPO
+
+from action_encodings import DirectionOriginsEnv, FromToOriginsEnv
+from buffers import (
+    CompactMaskableRolloutBuffer, CompactRolloutBuffer, MirrorAugment, MirroredMaskableRolloutBuffer,
+    MirroredRolloutBuffer, bytes_per_transition,
+)
+from opponents import OPPONENTS, PolicyOpponent, make_versus_env
+from origins_env import OBSERVATIONS, PERSPECTIVES, OriginsEnv
+from policies import CNN_POLICY_KWARGS
+from self_play import OpponentPool, SelfPlayCallback, SelfPlayVecEnv
+from shared_memory_env import SharedMemoryVecEnv
+
+ENVS = {
+    "square": OriginsEnv,
+    "from_to": FromToOriginsEnv,
+    "direction": DirectionOriginsEnv,
+}
+
+DEFAULTS = {
+    "workers": 4,
+    "timesteps": 100000,
+    "seed": 0,
+    "env": "square",
+    "max_plies": None,
+    "action_masks": True,
+    # "planes" trains a CNN on OriginsEnv(observation="planes")
+    "observation": "flat",
+    # Double every rollout with its mirror image (whole-move envs only)
+    "mirror_augment": False,
+    # "side_to_move" flips Evolutionist positions to look like Creationist
+    # ones (whole-move envs only)
+    "perspective": "absolute",
+    # "subproc" pickles steps through pipes, "shared" uses SharedMemoryVecEnv
+    "vec_env": "subproc",
+    # A scripted Evolutionist reply inside every step (see opponents.py)
+    "opponent": None,
+    # Play only agent_side against an OpponentPool (in process, "workers"
+    # games), adding a checkpoint every self_play_save_every steps; "both"
+    # needs the side_to_move perspective
+    "self_play": False,
+    "agent_side": "Creationist",
+    "self_play_save_every": 50000,
+    "checkpoint_dir": "self_play_checkpoints",
+    # Steps per PPO update summed over all workers
+    "rollout_steps": 2048,
+    "learning_rate": 0.0003,
+    "batch_size": 64,
+    "n_epochs": 10,
+    "gamma": 0.99,
+    "gae_lambda": 0.95,
+    "clip_range": 0.2,
+    "ent_coef": 0.0,
+    # Every eval_every steps play eval_games as Creationist against
+    # eval_opponent, stopping once the win rate reaches target_win_rate
+    "eval_every": 10000,
+    "eval_games": 20,
+    "eval_opponent": "random",
+    "target_win_rate": None,
+    "start_method": None,
+    "tensorboard_log": "./ppo_origins_tensorboard/",
+    "save_path": None,
+}
+
+
+class EnvStepsPerSecond(BaseCallback):
+    """Times rollout collection only, leaving out the PPO update."""
+
+    def __init__(self, verbose=0):
+        super(EnvStepsPerSecond, self).__init__(verbose)
+        self.collect_time = 0.0
+        self.env_steps = 0
+
+    def _on_rollout_start(self):
+        self._start = time.perf_counter()
+        self._start_steps = self.num_timesteps
+
+    def _on_step(self):
+        return True
+
+    def _on_rollout_end(self):
+        self.collect_time += time.perf_counter() - self._start
+        self.env_steps += self.num_timesteps - self._start_steps
+        self.logger.record("time/env_steps_per_sec", int(self.rate))
+
+    @property
+    def rate(self):
+        return self.env_steps / self.collect_time if self.collect_time else 0.0
+
+
+class WinRate(BaseCallback):
+    """Periodic win rate as Creationist against a scripted opponent.
+
+    Logs ``eval/win_rate`` and remembers the timesteps and wall-clock seconds
+    at which ``target`` was first reached, stopping training there. A game
+    not over after ``max_steps`` agent steps counts as not won.
+    """
+
+    def __init__(self, env, every=10000, games=20, target=None, max_steps=1000, verbose=0):
+        super(WinRate, self).__init__(verbose)
+        self.env = env
+        self.every = every
+        self.games = games
+        self.target = target
+        self.max_steps = max_steps
+        self.reached = None  # (timesteps, seconds)
+        self._next = every
+
+    def _on_training_start(self):
+        self._start = time.perf_counter()
+
+    def _on_step(self):
+        if self.num_timesteps < self._next:
+            return True
+        self._next += self.every
+        agent = PolicyOpponent(self.model, deterministic=True)
+        rng = np.random.default_rng(0)
+        wins = 0
+        for _ in range(self.games):
+            self.env.reset()
+            for _ in range(self.max_steps):
+                plies = self.env.plies
+                _, _, done, info = agent.play([self.env])[0]
+                if not done and self.env.plies == plies:
+                    # An unmasked policy picked an action that doesn't count;
+                    # deterministic, it would pick it again forever
+                    _, _, done, info = self.env.step(rng.choice(np.flatnonzero(self.env.action_masks())))
+                if done:
+                    wins += info["outcome"].winner == "Creationist"
+                    break
+        rate = wins / self.games
+        self.logger.record("eval/win_rate", rate)
+        if self.verbose:
+            print(f"{self.num_timesteps} steps: win rate {rate:.2f}")
+        if self.target is not None and rate >= self.target:
+            self.reached = self.num_timesteps, time.perf_counter() - self._start
+            return False
+        return True
+
+
+def make_eval_env(config):
+    # A turn limit makes sure evaluation games end
+    return make_versus_env(
+        config["eval_opponent"], env_class=ENVS[config["env"]],
+        max_plies=config["max_plies"] or 200, observation=config["observation"],
+        perspective=config["perspective"],
+    )
+
+
+def make_env(config, pool=None):
+    """``workers`` seeded envs, in subprocesses unless there is only one.
+
+    With a ``pool`` they are ``workers`` self-play games in this process.
+    """
+    env_class = ENVS[config["env"]]
+    env_kwargs = {"observation": config["observation"], "perspective": config["perspective"]}
+    if config["max_plies"] is not None:
+        env_kwargs["max_plies"] = config["max_plies"]
+    if config["opponent"] is not None:
+        env_kwargs = dict(env_kwargs, opponent=config["opponent"], env_class=env_class)
+        env_class = make_versus_env
+    if pool is not None:
+        env_fn = functools.partial(env_class, **env_kwargs)
+        return VecMonitor(SelfPlayVecEnv(config["workers"], pool, config["agent_side"], env_fn))
+    if config["vec_env"] == "shared":
+        # OriginsEnv is deterministic, but an --opponent's moves are random:
+        # seed env rank with seed + rank, as make_vec_env does
+        env_fn = functools.partial(env_class, **env_kwargs)
+        venv = SharedMemoryVecEnv(config["workers"], config["workers"], env_fn, config["start_method"])
+        venv.seed(config["seed"])
+        return VecMonitor(venv)
+    if config["workers"] > 1:
+        vec_env_cls, vec_env_kwargs = SubprocVecEnv, {"start_method": config["start_method"]}
+    else:
+        vec_env_cls, vec_env_kwargs = DummyVecEnv, None
+    return make_vec_env(
+        env_class,
+        n_envs=config["workers"],
+        seed=config["seed"],
+        env_kwargs=env_kwargs,
+        vec_env_cls=vec_env_cls,
+        vec_env_kwargs=vec_env_kwargs,
+    )
+
+
+def make_model(env, config):
+    workers = config["workers"]
+    n_steps = max(1, config["rollout_steps"] // workers)
+    if n_steps * workers != config["rollout_steps"]:
+        print(f"rollout_steps {config['rollout_steps']} is not a multiple of {workers} workers, "
+              f"using {n_steps * workers}")
+    mirror = config["mirror_augment"]
+    if config["action_masks"]:
+        algorithm = MaskablePPO
+        buffer_class = MirroredMaskableRolloutBuffer if mirror else CompactMaskableRolloutBuffer
+    else:
+        algorithm = PPO
+        buffer_class = MirroredRolloutBuffer if mirror else CompactRolloutBuffer
+    planes = config["observation"] == "planes"
+    model = algorithm(
+        "CnnPolicy" if planes else "MlpPolicy",
+        env,
+        policy_kwargs=CNN_POLICY_KWARGS if planes else None,
+        # Observations stay int8/uint8 in the rollout, cast at the network
+        rollout_buffer_class=buffer_class,
+        rollout_buffer_kwargs={"encoding": config["env"], "observation": config["observation"]} if mirror else None,
+        learning_rate=config["learning_rate"],
+        n_steps=n_steps,
+        batch_size=config["batch_size"],
+        n_epochs=config["n_epochs"],
+        gamma=config["gamma"],
+        gae_lambda=config["gae_lambda"],
+        clip_range=config["clip_range"],
+        ent_coef=config["ent_coef"],
+        seed=config["seed"],
+        verbose=1,
+        tensorboard_log=config["tensorboard_log"],
+    )
+    print(f"Rollout storage: {bytes_per_transition(model.rollout_buffer) * 1e6 / 2 ** 20:.0f} MiB "
+          "per million transitions")
+    return model
+
+
+def train(config):
+    """Train with ``config`` (see ``DEFAULTS``); returns the model and its env-steps/sec."""
+    callbacks = [EnvStepsPerSecond()]
+    win_rate = None
+    if config["target_win_rate"] is not None:
+        win_rate = WinRate(make_eval_env(config), config["eval_every"], config["eval_games"],
+                           config["target_win_rate"], verbose=1)
+        callbacks.append(win_rate)
+    if config["mirror_augment"]:
+        callbacks.append(MirrorAugment())
+    pool = None
+    if config["self_play"]:
+        pool = OpponentPool(checkpoint_dir=config["checkpoint_dir"], seed=config["seed"])
+        pool.load_checkpoints(MaskablePPO if config["action_masks"] else PPO)
+        callbacks.append(SelfPlayCallback(pool, config["self_play_save_every"]))
+    env = make_env(config, pool)
+    try:
+        model = make_model(env, config)
+        model.learn(total_timesteps=config["timesteps"], callback=callbacks)
+    finally:
+        env.close()
+    if config["save_path"]:
+        model.save(config["save_path"])
+    if win_rate is not None:
+        if win_rate.reached:
+            print("Win rate {} reached after {} steps, {:.0f}s".format(config["target_win_rate"], *win_rate.reached))
+        else:
+            print(f"Win rate {config['target_win_rate']} not reached in {config['timesteps']} steps")
+    return model, callbacks[0].rate
+
+
+def benchmark(config, worker_counts):
+    """Env-steps/sec at each worker count, each trained for ``config["timesteps"]``."""
+    rates = {}
+    for workers in worker_counts:
+        _, rates[workers] = train(dict(config, workers=workers, save_path=None, tensorboard_log=None))
+    for workers, rate in rates.items():
+        print(f"{workers:3d} workers: {rate:10.0f} env-steps/s")
+    return rates
+
+
+def parse_config(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--config", help="JSON file of settings, overridden by flags")
+    parser.add_argument("--benchmark", type=int, nargs="+", metavar="WORKERS",
+                        help="only print env-steps/sec for each worker count")
+    for key, default in DEFAULTS.items():
+        flag = "--" + key.replace("_", "-")
+        if isinstance(default, bool):
+            parser.add_argument(flag, action=argparse.BooleanOptionalAction, default=None)
+        elif key == "env":
+            parser.add_argument(flag, choices=sorted(ENVS), default=None)
+        elif key in ("opponent", "eval_opponent"):
+            parser.add_argument(flag, choices=sorted(OPPONENTS), default=None)
+        elif key == "observation":
+            parser.add_argument(flag, choices=OBSERVATIONS, default=None)
+        elif key == "perspective":
+            parser.add_argument(flag, choices=PERSPECTIVES, default=None)
+        elif key == "agent_side":
+            parser.add_argument(flag, choices=["Creationist", "Evolutionist", "both"], default=None)
+        elif key == "vec_env":
+            parser.add_argument(flag, choices=["subproc", "shared"], default=None)
+        else:
+            parser.add_argument(flag, type=type(default) if default is not None else None, default=None)
+    args = parser.parse_args(argv)
+
+    config = dict(DEFAULTS)
+    if args.config:
+        with open(args.config) as f:
+            overrides = json.load(f)
+        unknown = set(overrides) - set(DEFAULTS)
+        if unknown:
+            parser.error(f"unknown settings in {args.config}: {', '.join(sorted(unknown))}")
+        config.update(overrides)
+    config.update({key: value for key, value in vars(args).items() if key in DEFAULTS and value is not None})
+    if config["self_play"] and config["opponent"] is not None:
+        parser.error("self_play and opponent are alternatives, choose one")
+    if config["agent_side"] == "both" and config["perspective"] != "side_to_move":
+        parser.error("agent_side both needs perspective side_to_move")
+    if config["perspective"] == "side_to_move" and config["env"] == "square":
+        parser.error("perspective side_to_move needs a whole-move env (from_to or direction): "
+                     "square actions play the first move in absolute direction order")
+    if config["mirror_augment"] and config["env"] == "square":
+        parser.error("mirror_augment needs a whole-move env (from_to or direction): square actions don't mirror")
+    if config["max_plies"] is not None:
+        config["max_plies"] = int(config["max_plies"])
+    if config["target_win_rate"] is not None:
+        config["target_win_rate"] = float(config["target_win_rate"])
+    if config["save_path"] is None:
+        config["save_path"] = "maskable_ppo_origins" if config["action_masks"] else "ppo_origins"
+    return config, args.benchmark
+
+
+if __name__ == "__main__":
+    config, worker_counts = parse_config()
+    if worker_counts:
+        benchmark(config, worker_counts)
+    else:
+        _, rate = train(config)
+        print(f"{config['workers']} workers: {rate:.0f} env-steps/s")
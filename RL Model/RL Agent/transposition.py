@@ -0,0 +1,99 @@
+"""Transposition table for searches over ``OriginsEnv``.
+
+Entries live in one preallocated NumPy structured array of buckets. Each
+bucket has a depth-preferred slot, kept while nothing deeper arrives, and an
+always-replace slot for everything else. Positions are identified by the
+64-bit ``OriginsEnv.position_hash``.
+"""
+
+import numpy as np
+
+# Bound types
+EMPTY, EXACT, LOWER, UPPER = 0, 1, 2, 3
+NO_MOVE = -1
+
+ENTRY_DTYPE = np.dtype([
+    ("key", np.uint64),
+    ("depth", np.int8),
+    ("bound", np.uint8),
+    ("score", np.int32),
+    ("move", np.int32),
+])
+
+DEPTH_PREFERRED, ALWAYS_REPLACE = 0, 1
+
+
+class TranspositionTable:
+    """Fixed-size table of (depth, bound, score, best move) per position.
+
+    ``size_mb`` sets the memory budget; ``stats()`` reports hits, misses,
+    index collisions (probes that found only other positions in the bucket)
+    and replacements, to size the table for a machine.
+    """
+
+    def __init__(self, size_mb=64):
+        self.n_buckets = max(1, int(size_mb * 2 ** 20) // (2 * ENTRY_DTYPE.itemsize))
+        self.table = np.zeros((self.n_buckets, 2), dtype=ENTRY_DTYPE)
+        # Field views, cheaper to index than records
+        self._keys = self.table["key"]
+        self._depths = self.table["depth"]
+        self._bounds = self.table["bound"]
+        self._scores = self.table["score"]
+        self._moves = self.table["move"]
+        self.hits = self.misses = self.collisions = self.stores = self.replacements = 0
+
+    @property
+    def size_mb(self):
+        return self.table.nbytes / 2 ** 20
+
+    def clear(self):
+        self.table[:] = 0
+        self.hits = self.misses = self.collisions = self.stores = self.replacements = 0
+
+    def probe(self, key):
+        """Return (depth, bound, score, move) stored for ``key``, or None."""
+        bucket = key % self.n_buckets
+        bounds = self._bounds[bucket]
+        for slot in (DEPTH_PREFERRED, ALWAYS_REPLACE):
+            if bounds[slot] != EMPTY and int(self._keys[bucket, slot]) == key:
+                self.hits += 1
+                return (
+                    int(self._depths[bucket, slot]), int(bounds[slot]),
+                    int(self._scores[bucket, slot]), int(self._moves[bucket, slot]),
+                )
+        self.misses += 1
+        if bounds.any():
+            self.collisions += 1
+        return None
+
+    def store(self, key, depth, bound, score, move=NO_MOVE):
+        bucket = key % self.n_buckets
+        keys, bounds = self._keys[bucket], self._bounds[bucket]
+        same = [bounds[slot] != EMPTY and int(keys[slot]) == key for slot in (DEPTH_PREFERRED, ALWAYS_REPLACE)]
+        if bounds[DEPTH_PREFERRED] == EMPTY or same[DEPTH_PREFERRED] \
+                or depth >= self._depths[bucket, DEPTH_PREFERRED]:
+            slot = DEPTH_PREFERRED
+        else:
+            slot = ALWAYS_REPLACE
+        if bounds[slot] != EMPTY and not same[slot]:
+            self.replacements += 1
+        # Keep the best move of a position if the new entry has none
+        if move == NO_MOVE and same[slot]:
+            move = int(self._moves[bucket, slot])
+        self.table[bucket, slot] = (key, depth, bound, score, move)
+        self.stores += 1
+
+    def stats(self):
+        probes = self.hits + self.misses
+        return {
+            "size_mb": self.size_mb,
+            "entries": self.table.size,
+            "filled": int(np.count_nonzero(self._bounds)),
+            "probes": probes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "collisions": self.collisions,
+            "hit_rate": self.hits / probes if probes else 0.0,
+            "stores": self.stores,
+            "replacements": self.replacements,
+        }
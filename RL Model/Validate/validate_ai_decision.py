@@ -37,13 +37,11 @@ class AIDecisionValidator:
         
     def get_ai_moves(self):
         """Get all possible moves for current player"""
-        moves = []
-        for r in range(8):
-            for c in range(10):
-                if self.env.board[r][c].startswith(self.env.turn):
-                    for target in self.env.get_valid_moves(r, c):
-                        moves.append((r, c, target))
-        return moves
+        # legal_moves gives (from, to) square indices; square = row * 10 + col
+        return [
+            divmod(origin, 10) + (divmod(target, 10),)
+            for origin, target in self.env.legal_moves().tolist()
+        ]
         
     def test_capture_prioritization(self):
         """Test if AI prioritizes capturing vulnerable pieces"""
@@ -0,0 +1,7 @@
+# Puts "RL Agent" on the path for pytest, so every test module imports the
+# real engine modules whatever order they run in. Run as scripts, the tests
+# get there through the origins_env stand-in they import first.
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, os.pardir, "RL Agent"))
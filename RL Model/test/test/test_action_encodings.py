@@ -0,0 +1,65 @@
+from origins_env import OriginsEnv, GRID_ROWS, GRID_COLS, SLIDE_DIRECTIONS
+from action_encodings import (
+    DirectionOriginsEnv, FromToOriginsEnv, DIRECTION_ACTIONS, DIRECTION_FLIPPED, DIRECTION_MOVES,
+    FROM_TO_ACTIONS, FROM_TO_FLIPPED, FROM_TO_MOVES, MAX_DISTANCE, SIZE,
+)
+import numpy as np
+
+def test_from_to_tables():
+    assert len(FROM_TO_MOVES) == SIZE * SIZE
+    starts, ends = FROM_TO_MOVES[:, 0], FROM_TO_MOVES[:, 1]
+    assert (FROM_TO_ACTIONS[starts, ends] == np.arange(SIZE * SIZE)).all()
+    assert (FROM_TO_FLIPPED[FROM_TO_FLIPPED] == np.arange(SIZE * SIZE)).all()
+    print("✓ From-to table test passed")
+
+def test_direction_tables():
+    assert len(DIRECTION_MOVES) == SIZE * len(SLIDE_DIRECTIONS) * MAX_DISTANCE
+    for action, (start, end) in enumerate(DIRECTION_MOVES.tolist()):
+        square, rest = divmod(action, len(SLIDE_DIRECTIONS) * MAX_DISTANCE)
+        direction, distance = divmod(rest, MAX_DISTANCE)
+        (dr, dc), distance = SLIDE_DIRECTIONS[direction], distance + 1
+        row, col = divmod(start, GRID_COLS)
+        assert start == square
+        if end == -1:
+            assert not (0 <= row + dr * distance < GRID_ROWS and 0 <= col + dc * distance < GRID_COLS)
+        else:
+            assert end == (row + dr * distance) * GRID_COLS + col + dc * distance
+            assert DIRECTION_ACTIONS[start, end] == action
+    # Every (from, to) pair on a line has exactly one action, the rest none
+    assert (DIRECTION_ACTIONS >= 0).sum() == (DIRECTION_MOVES[:, 1] >= 0).sum()
+    assert (DIRECTION_FLIPPED[DIRECTION_FLIPPED] == np.arange(len(DIRECTION_MOVES))).all()
+    print("✓ Direction table test passed")
+
+def test_masks_mark_exactly_the_legal_moves():
+    rng = np.random.default_rng(0)
+    for env_class in (FromToOriginsEnv, DirectionOriginsEnv):
+        env = env_class()
+        for _ in range(200):
+            mask = env.action_masks()
+            moves = {tuple(move) for move in env.legal_moves().tolist()}
+            assert {env.decode_action(action) for action in np.flatnonzero(mask)} == moves
+            for start, end in moves:
+                action = env.encode_move(divmod(start, GRID_COLS), divmod(end, GRID_COLS))
+                assert env.decode_action(action) == (start, end)
+            obs, reward, done, info = env.step(rng.choice(np.flatnonzero(mask)))
+            if done:
+                env.reset()
+    print("✓ Action mask test passed")
+
+def test_step_plays_the_named_move():
+    env = FromToOriginsEnv()
+    reference = OriginsEnv()
+    env.step(env.encode_move((0, 0), (2, 0)))
+    reference.move_piece((0, 0), (2, 0))
+    assert (env._board == reference._board).all() and env.turn == "Evolutionist"
+    # A legal piece sent to a square it can't reach costs -1 and keeps the turn
+    obs, reward, done, info = env.step(env.encode_move((7, 0), (3, 3)))
+    assert reward == -1 and not done and env.turn == "Evolutionist"
+    print("✓ Action step test passed")
+
+if __name__ == "__main__":
+    test_from_to_tables()
+    test_direction_tables()
+    test_masks_mark_exactly_the_legal_moves()
+    test_step_plays_the_named_move()
+    print("✅ All action encoding tests passed!")
@@ -1,5 +1,9 @@
-from origins_env import OriginsEnv
+from origins_env import OriginsEnv, GRID_COLS, HUMAN_CODES
+from opponents import GreedyCaptureOpponent
+from search import AlphaBetaSearch, capture_victims
+import numpy as np
 import random
+import time
 
 def test_ai_prioritizes_captures():
     env = OriginsEnv()
@@ -29,7 +33,74 @@ def test_ai_avoids_suicide_moves():
     assert (1,1) not in moves, "AI should avoid moves where it would be captured"
     print("✓ AI danger avoidance test passed")
 
+def _random_positions(steps, seed=0):
+    rng = np.random.default_rng(seed)
+    env = OriginsEnv(max_plies=200)
+    for _ in range(steps):
+        yield env
+        _, _, done, _ = env.step(rng.choice(np.flatnonzero(env.action_masks())))
+        if done:
+            env.reset()
+
+def test_captured_humans_matches_make_move():
+    for env in _random_positions(300):
+        for start, end in env.legal_moves().tolist():
+            before = {code: env._pos[code] for code in HUMAN_CODES}
+            predicted = sorted(env.captured_humans(start, end))
+            env.make_move(divmod(start, GRID_COLS), divmod(end, GRID_COLS))
+            taken = sorted(
+                pos[0] * GRID_COLS + pos[1] for code, pos in before.items()
+                if pos is not None and env._pos[code] is None
+            )
+            env.unmake_move()
+            assert predicted == taken, (start, end)
+    print("✓ Captured humans test passed")
+
+def test_path_captures_come_first():
+    # A male/female captured on a slide's path is a capture for the greedy
+    # opponent and the search's move ordering, not a quiet move
+    found = 0
+    search = AlphaBetaSearch(time_limit=0.01)
+    greedy = GreedyCaptureOpponent(seed=0)
+    for env in _random_positions(1000):
+        moves = env.legal_moves().tolist()
+        side = 1 if env.turn == "Creationist" else -1
+        victims = capture_victims(env, moves, side)
+        on_path = [move for move, victim in zip(moves, victims) if victim and env._flat[move[1]] * side >= 0]
+        if not on_path:
+            continue
+        found += 1
+        assert all(env.captured_humans(*move) for move in on_path)
+        # Taking an enemy male/female wins outright
+        (row, col), (to_row, to_col) = search.choose_move(env)
+        assert env.captured_humans(row * GRID_COLS + col, to_row * GRID_COLS + to_col)
+        ordered = search._order(env, moves, -1, 0)
+        quiet = [move for move, victim in zip(moves, victims) if not victim]
+        assert max(map(ordered.index, on_path)) < min(map(ordered.index, quiet), default=len(ordered))
+        assert abs(victims[moves.index(greedy.choose(env).tolist())]) >= 5
+    assert found
+    print("✓ Path capture test passed")
+
+def test_search_keeps_its_time_budget():
+    # The clock is read at every node and during move ordering, so a move
+    # comes back within a small margin of the budget however deep it got
+    search = AlphaBetaSearch(time_limit=0.05)
+    worst = 0
+    for step, env in enumerate(_random_positions(200, seed=1)):
+        if step % 10:
+            continue
+        board = env._board.copy()
+        start = time.perf_counter()
+        search.choose_move(env)
+        worst = max(worst, time.perf_counter() - start)
+        assert (env._board == board).all() and not env._undo_stack
+    assert worst < 0.05 + 0.02, worst
+    print("✓ Search time budget test passed")
+
 if __name__ == "__main__":
     test_ai_prioritizes_captures()
     test_ai_avoids_suicide_moves()
+    test_captured_humans_matches_make_move()
+    test_path_captures_come_first()
+    test_search_keeps_its_time_budget()
     print("✅ All AI decision tests passed!")
\ No newline at end of file
@@ -0,0 +1,85 @@
+from origins_env import OriginsEnv, FACTION_SIGN, GRID_COLS, IS_HUMAN
+from batched_env import OriginsVecEnv, HUMAN_ORDER
+import collections
+import numpy as np
+
+def _load(engine, i, env):
+    # Copy a scalar game's position into game i of the batched engine
+    engine.boards[i] = env._board
+    engine.turn[i] = FACTION_SIGN[env.turn]
+    engine.pos[i] = [
+        -1 if env._pos[code] is None else env._pos[code][0] * GRID_COLS + env._pos[code][1]
+        for code in HUMAN_ORDER
+    ]
+    engine.arrived[i] = [env._arrived[code] for code in HUMAN_ORDER]
+    engine.plies[i] = env.plies
+
+def _scramble(env, rng):
+    # Random whole moves from the start, stopping short of a finished game,
+    # so the square actions below begin from varied mid-game positions
+    env.reset()
+    for _ in range(rng.integers(100)):
+        moves = env.legal_moves()
+        if not len(moves):
+            break
+        start, end = moves[rng.integers(len(moves))].tolist()
+        env.make_move(divmod(start, GRID_COLS), divmod(end, GRID_COLS))
+        if env.outcome(check_moves=True) is not None:
+            env.unmake_move()
+            break
+
+def _lock_step(num_envs, steps, seed, **env_kwargs):
+    rng = np.random.default_rng(seed)
+    venv = OriginsVecEnv(num_envs, **env_kwargs)
+    envs = [OriginsEnv(**env_kwargs) for _ in range(num_envs)]
+    venv.reset()
+    for i, env in enumerate(envs):
+        _scramble(env, rng)
+        _load(venv.engine, i, env)
+    obs = venv.engine.observations()
+    reasons = collections.Counter()
+    for _ in range(steps):
+        masks = venv.action_masks()
+        assert (masks == np.array([env.action_masks() for env in envs])).all()
+        actions = []
+        for mask, env in zip(masks, envs):
+            # Half the time move a man/woman, so games also end by arrival;
+            # now and then an action that doesn't count
+            humans = np.flatnonzero(mask & np.array(IS_HUMAN)[env._flat])
+            if rng.random() < 0.05:
+                actions.append(rng.integers(len(mask)))
+            elif len(humans) and rng.random() < 0.5:
+                actions.append(rng.choice(humans))
+            else:
+                actions.append(rng.choice(np.flatnonzero(mask)))
+        obs, rewards, dones, infos = venv.step(np.array(actions))
+        for i, env in enumerate(envs):
+            expected_obs, reward, done, info = env.step(actions[i])
+            assert rewards[i] == reward and dones[i] == done, i
+            if done:
+                assert (infos[i]["terminal_observation"] == expected_obs).all()
+                assert infos[i]["outcome"] == info["outcome"]
+                reasons[info["outcome"].reason] += 1
+                _scramble(env, rng)
+                _load(venv.engine, i, env)
+                obs[i] = venv.engine.observations([i])[0]
+                expected_obs = env.get_observation()
+            assert (obs[i] == expected_obs).all(), i
+    return reasons
+
+def test_batched_env_matches_single_envs():
+    reasons = _lock_step(64, 500, seed=0, max_plies=200)
+    # Square actions only ever move to a neighbouring square, so they never
+    # capture a man/woman on a slide's path
+    assert reasons["arrival"] and reasons["stalemate"] and reasons["turn_limit"]
+    print("✓ Batched env lock-step test passed")
+
+def test_batched_env_matches_single_envs_planes():
+    reasons = _lock_step(16, 300, seed=1, max_plies=100, observation="planes")
+    assert reasons["arrival"], "Arrivals set the arrived planes"
+    print("✓ Batched env planes lock-step test passed")
+
+if __name__ == "__main__":
+    test_batched_env_matches_single_envs()
+    test_batched_env_matches_single_envs_planes()
+    print("✅ All batched env tests passed!")
@@ -0,0 +1,42 @@
+from origins_env import TABLES, GRID_ROWS, GRID_COLS, SLIDE_DIRECTIONS, KING_DIRECTIONS, ADJACENT_DIRECTIONS
+
+def _on_board(row, col):
+    return 0 <= row < GRID_ROWS and 0 <= col < GRID_COLS
+
+def test_rays_and_paths():
+    for square in range(GRID_ROWS * GRID_COLS):
+        row, col = divmod(square, GRID_COLS)
+        assert TABLES.coords[square] == (row, col)
+        assert len(TABLES.rays[square]) == len(SLIDE_DIRECTIONS)
+        for (dr, dc), ray in zip(SLIDE_DIRECTIONS, TABLES.rays[square]):
+            expected = []
+            r, c = row + dr, col + dc
+            while _on_board(r, c):
+                expected.append(r * GRID_COLS + c)
+                r, c = r + dr, c + dc
+            assert list(ray) == expected, (square, dr, dc)
+            # The path to each square of the ray leaves out both ends
+            for i, target in enumerate(ray):
+                assert TABLES.between[square][target] == ray[:i]
+        reachable = {target for ray in TABLES.rays[square] for target in ray}
+        assert set(TABLES.between[square]) == reachable
+    print("✓ Ray and path table test passed")
+
+def test_neighbours_and_steps():
+    for square in range(GRID_ROWS * GRID_COLS):
+        row, col = divmod(square, GRID_COLS)
+        around = [(row + dr) * GRID_COLS + col + dc for dr, dc in KING_DIRECTIONS if _on_board(row + dr, col + dc)]
+        assert list(TABLES.neighbours[square]) == around
+        adjacent = [(row + dr) * GRID_COLS + col + dc for dr, dc in ADJACENT_DIRECTIONS if _on_board(row + dr, col + dc)]
+        assert list(TABLES.adjacent[square]) == adjacent
+        # Men/women step forwards, or anywhere onto the opponent's home row
+        for sign, home in ((1, GRID_ROWS - 1), (-1, 0)):
+            for target in around:
+                forward = (target // GRID_COLS - row) * sign > 0
+                assert (target in TABLES.steps[sign][square]) == (forward or target // GRID_COLS == home)
+    print("✓ Neighbour and step table test passed")
+
+if __name__ == "__main__":
+    test_rays_and_paths()
+    test_neighbours_and_steps()
+    print("✅ All board table tests passed!")
@@ -0,0 +1,39 @@
+from origins_env import OriginsEnv, GameOutcome
+import numpy as np
+
+def test_turn_limit_outcome_in_info(capsys):
+    env = OriginsEnv(max_plies=4)
+    for ply in range(4):
+        action = np.flatnonzero(env.action_masks())[0]
+        obs, reward, done, info = env.step(action)
+    assert done, "Game should end at the turn limit"
+    assert info["outcome"] == GameOutcome(None, "turn_limit", 4)
+    assert env.last_outcome == info["outcome"]
+    assert capsys.readouterr().out == "", "Stepping the env should not print"
+    print("✓ Turn limit outcome test passed")
+
+def test_capture_outcome():
+    env = OriginsEnv()
+    env.evolutionist_male_pos = None  # Evolutionist man captured
+    action = np.flatnonzero(env.action_masks())[0]
+    obs, reward, done, info = env.step(action)
+    assert done and reward == 100
+    assert info["outcome"] == GameOutcome("Creationist", "capture", 1)
+    print("✓ Capture outcome test passed")
+
+def test_side_with_no_pieces_is_stalemated():
+    env = OriginsEnv()
+    env.turn = "Evolutionist"
+    for r in range(8):
+        for c in range(10):
+            if env.board[r][c].startswith("Evolutionist"):
+                env.board[r][c] = "Neutral"  # overwritten, positions left stale
+    assert env.action_masks().all(), "Every action should end the game"
+    obs, reward, done, info = env.step(0)
+    assert done and info["outcome"].reason == "stalemate"
+    print("✓ No pieces stalemate test passed")
+
+if __name__ == "__main__":
+    test_capture_outcome()
+    test_side_with_no_pieces_is_stalemated()
+    print("✅ All game outcome tests passed!")
@@ -0,0 +1,74 @@
+from origins_env import OriginsEnv, GRID_COLS, IS_HUMAN
+import numpy as np
+
+def _state(env):
+    return (
+        env._board.tobytes(), env.turn, list(env._pos), list(env._arrived), list(env._dest),
+        env.position_hash(), env.position_hash(mirrored=True), env.get_observation().tobytes(),
+        [set(squares) for squares in env._squares], list(env._bb),
+    )
+
+def _play(env, move):
+    start, end = move
+    return env.make_move(divmod(start, GRID_COLS), divmod(end, GRID_COLS))
+
+def test_make_unmake_restores_every_move():
+    # Random whole moves, half of them by a man/woman, reach captures and
+    # arrivals, which square actions rarely do
+    for observation in ("flat", "planes"):
+        env = OriginsEnv(observation=observation)
+        rng = np.random.default_rng(0)
+        captured = arrived = 0
+        for ply in range(200):
+            before = _state(env)
+            moves = env.legal_moves().tolist()
+            for move in moves:
+                _play(env, move)
+                captured += None in env._pos
+                arrived += any(env._arrived)
+                env.unmake_move()
+                assert _state(env) == before, move
+            humans = [move for move in moves if IS_HUMAN[env._flat[move[0]]]]
+            choices = humans if humans and rng.random() < 0.5 else moves
+            if not choices or ply % 100 == 99:
+                env.reset()
+            else:
+                _play(env, choices[rng.integers(len(choices))])
+        assert captured and arrived
+    print("✓ Make/unmake round trip test passed")
+
+def test_unmake_takes_back_a_whole_game():
+    env = OriginsEnv()
+    rng = np.random.default_rng(1)
+    states = []
+    for _ in range(120):
+        moves = env.legal_moves()
+        if not len(moves):
+            break
+        states.append(_state(env))
+        _play(env, moves[rng.integers(len(moves))].tolist())
+    assert len(states) > 10
+    while states:
+        env.unmake_move()
+        assert _state(env) == states.pop()
+    assert not env._undo_stack
+    print("✓ Whole game unmake test passed")
+
+def test_unmake_rejects_out_of_order_records():
+    env = OriginsEnv()
+    first = _play(env, env.legal_moves()[0].tolist())
+    _play(env, env.legal_moves()[0].tolist())
+    try:
+        env.unmake_move(first)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Unmaking an earlier move first should fail")
+    assert len(env._undo_stack) == 2
+    print("✓ Unmake order test passed")
+
+if __name__ == "__main__":
+    test_make_unmake_restores_every_move()
+    test_unmake_takes_back_a_whole_game()
+    test_unmake_rejects_out_of_order_records()
+    print("✅ All make/unmake tests passed!")
@@ -0,0 +1,22 @@
+from origins_env import OriginsEnv
+from mcts import MCTS, UniformEvaluator
+import numpy as np
+
+def test_root_noise_is_drawn_fresh_for_each_search():
+    env = OriginsEnv()
+    search = MCTS(UniformEvaluator(), simulations=32, root_noise=0.25, seed=0)
+    root = search.search(env)
+    clean = root.priors.copy()
+    first = search.root_priors
+    # The same position again reuses the root; its priors stay the network's
+    assert search.search(env) is root
+    assert (root.priors == clean).all()
+    second = search.root_priors
+    assert not np.allclose(first, second)
+    for noisy in (first, second):
+        assert np.isclose(noisy.sum(), 1) and (noisy >= 0.75 * clean - 1e-12).all()
+    print("✓ MCTS root noise test passed")
+
+if __name__ == "__main__":
+    test_root_noise_is_drawn_fresh_for_each_search()
+    print("✅ All MCTS tests passed!")
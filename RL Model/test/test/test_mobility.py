@@ -0,0 +1,26 @@
+from origins_env import OriginsEnv
+import numpy as np
+
+def test_incremental_mobility_matches_full_scan():
+    # check_mobility makes every query cross-check against a full scan
+    env = OriginsEnv(check_mobility=True, max_plies=200)
+    rng = np.random.default_rng(0)
+    for _ in range(400):
+        obs, reward, done, info = env.step(rng.choice(np.flatnonzero(env.action_masks())))
+        assert env.has_legal_move("Creationist") == env._scan_has_legal_move(1)
+        assert env.has_legal_move("Evolutionist") == env._scan_has_legal_move(-1)
+        if done:
+            env.reset()
+    print("✓ Incremental mobility test passed")
+
+def test_mobility_counts_at_start():
+    env = OriginsEnv()
+    # Every element on the home row can move; men/women have no element ahead
+    assert env.mobility("Creationist") == 8
+    assert env.mobility("Evolutionist") == 8
+    print("✓ Starting mobility test passed")
+
+if __name__ == "__main__":
+    test_incremental_mobility_matches_full_scan()
+    test_mobility_counts_at_start()
+    print("✅ All mobility tests passed!")
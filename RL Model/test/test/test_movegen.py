@@ -0,0 +1,43 @@
+from origins_env import OriginsEnv, GRID_ROWS, GRID_COLS, IS_HUMAN
+import numpy as np
+
+def test_bitboard_moves_match_scalar():
+    # Both generators follow random games, half the moves by a man/woman so
+    # that captures, strandings and arrivals come up
+    scalar = OriginsEnv(movegen="scalar")
+    bitboard = OriginsEnv(movegen="bitboard")
+    rng = np.random.default_rng(0)
+    for ply in range(300):
+        for faction in ("Creationist", "Evolutionist"):
+            moves = scalar.legal_moves(faction)
+            assert (bitboard.legal_moves(faction) == moves).all(), faction
+            assert bitboard.has_legal_move(faction) == scalar.has_legal_move(faction) == bool(len(moves))
+        for row in range(GRID_ROWS):
+            for col in range(GRID_COLS):
+                assert bitboard.get_valid_moves(row, col) == scalar.get_valid_moves(row, col), (row, col)
+        assert (bitboard.action_masks() == scalar.action_masks()).all()
+
+        moves = scalar.legal_moves().tolist()
+        humans = [move for move in moves if IS_HUMAN[scalar._board.flat[move[0]]]]
+        choices = humans if humans and rng.random() < 0.5 else moves
+        if not choices or ply % 100 == 99:
+            scalar.reset()
+            bitboard.reset()
+            continue
+        start, end = choices[rng.integers(len(choices))]
+        for env in (scalar, bitboard):
+            env.move_piece(divmod(start, GRID_COLS), divmod(end, GRID_COLS))
+            env.turn = "Evolutionist" if env.turn == "Creationist" else "Creationist"
+    print("✓ Bitboard move generation test passed")
+
+def test_legal_moves_are_sorted_pairs():
+    env = OriginsEnv()
+    moves = env.legal_moves()
+    assert moves.ndim == 2 and moves.shape[1] == 2
+    assert [tuple(move) for move in moves.tolist()] == sorted(map(tuple, moves.tolist()))
+    print("✓ Legal moves order test passed")
+
+if __name__ == "__main__":
+    test_bitboard_moves_match_scalar()
+    test_legal_moves_are_sorted_pairs()
+    print("✅ All move generation tests passed!")
@@ -1,4 +1,4 @@
-from origins_env import OriginsEnv
+from origins_env import OriginsEnv, MAN, PIECE_PLANE, TURN_PLANE, flip_perspective
 
 def test_observation_shape():
     env = OriginsEnv()
@@ -13,7 +13,51 @@ def test_piece_encoding():
     assert obs[74] == -5, "Evolutionist_Woman should encode as -5"
     print("✓ Piece encoding test passed")
 
+def test_observation_space_is_compact():
+    env = OriginsEnv()
+    obs = env.get_observation()
+    assert obs.dtype == "int8", "Observations should be stored as int8"
+    assert env.observation_space.contains(obs), "Piece codes up to ±6 must be in range"
+    print("✓ Compact observation test passed")
+
+def test_plane_observation_follows_moves():
+    env = OriginsEnv(observation="planes")
+    obs = env.get_observation()
+    assert obs.shape == (21, 8, 10) and obs.dtype == "uint8"
+    assert obs[PIECE_PLANE[-5], 7, 4] == 1, "Evolutionist_Woman plane should mark (7, 4)"
+    assert obs[TURN_PLANE].all(), "Creationists move first"
+    env.move_piece((0, 5), (1, 5))
+    obs = env.get_observation()
+    assert obs[PIECE_PLANE[6], 1, 5] == 1 and obs[PIECE_PLANE[6], 0, 5] == 0
+    assert obs[:TURN_PLANE].sum() == 20, "One plane bit per piece"
+    print("✓ Plane observation test passed")
+
+def test_reset_clears_arrived_planes():
+    env = OriginsEnv(observation="planes")
+    start = env.get_observation()
+    env._set_arrived(MAN, True)
+    assert (env.get_observation() != start).any()
+    assert (env.reset() == start).all(), "A new game starts with no arrivals"
+    print("✓ Plane reset test passed")
+
+def test_side_to_move_perspective():
+    env = OriginsEnv(perspective="side_to_move")
+    start = env.get_observation()
+    env.move_piece((0, 5), (1, 5))
+    env.turn = "Evolutionist"
+    obs = env.get_observation()
+    assert obs[80] == 1, "The Evolutionists should see themselves as the Creationists"
+    assert obs[4] == 5 and obs[65] == -6, "Rows flip and factions swap"
+    assert (flip_perspective(obs) == env._obs).all(), "Flipping back gives the absolute observation"
+    assert (obs[:10] == start[:10]).all(), "Evolutionist home row should look like the Creationist one"
+    assert env.action_masks()[0] and not env.action_masks()[70], "Masks follow the flipped board"
+    print("✓ Side-to-move perspective test passed")
+
 if __name__ == "__main__":
     test_observation_shape()
     test_piece_encoding()
+    test_observation_space_is_compact()
+    test_plane_observation_follows_moves()
+    test_reset_clears_arrived_planes()
+    test_side_to_move_perspective()
     print("✅ All observation tests passed!")
\ No newline at end of file
@@ -0,0 +1,87 @@
+from origins_env import GameOutcome, OriginsEnv
+from action_encodings import FromToOriginsEnv
+from self_play import OpponentPool, SelfPlayVecEnv
+from opponents import RandomOpponent, GreedyCaptureOpponent, PolicyOpponent, make_versus_env
+import functools
+import numpy as np
+
+def test_agent_only_plays_its_side():
+    pool = OpponentPool(scripted=[RandomOpponent(0), GreedyCaptureOpponent(1)], seed=0)
+    for side in ("Creationist", "Evolutionist"):
+        venv = SelfPlayVecEnv(4, pool, agent_side=side, env_fn=functools.partial(OriginsEnv, max_plies=30))
+        venv.reset()
+        for _ in range(40):
+            assert all(env.turn == side for env in venv.envs)
+            obs, rewards, dones, infos = venv.step(venv.action_masks().argmax(axis=1))
+            for i in np.flatnonzero(dones):
+                outcome = infos[i]["outcome"]
+                expected = 0 if outcome.winner is None else (100 if outcome.winner == side else -100)
+                assert rewards[i] == expected
+    print("✓ Self-play side test passed")
+
+def test_agent_plays_both_sides_in_its_perspective():
+    pool = OpponentPool(scripted=[RandomOpponent(0)], seed=0)
+    env_fn = functools.partial(FromToOriginsEnv, max_plies=30, perspective="side_to_move")
+    venv = SelfPlayVecEnv(4, pool, agent_side="both", env_fn=env_fn)
+    obs = venv.reset()
+    for _ in range(40):
+        assert [env.turn for env in venv.envs] == ["Creationist", "Evolutionist"] * 2
+        assert (obs[:, 80] == 1).all(), "The side to move should always look like the Creationists"
+        obs, rewards, dones, infos = venv.step(venv.action_masks().argmax(axis=1))
+    print("✓ Self-play both sides test passed")
+
+class SquareZeroModel:
+    # An unmasked policy that always picks square 0 and records what it saw
+    def __init__(self):
+        self.seen = []
+
+    def predict(self, observation, deterministic=False):
+        self.seen.append(observation)
+        return np.zeros(len(observation), dtype=np.int64), None
+
+def test_checkpoint_moves_that_dont_count_are_replaced():
+    model = SquareZeroModel()
+    pool = OpponentPool(scripted=[PolicyOpponent(model)], seed=0)
+    venv = SelfPlayVecEnv(2, pool, env_fn=functools.partial(OriginsEnv, max_plies=30))
+    venv.reset()
+    for _ in range(10):
+        venv.step(venv.action_masks().argmax(axis=1))
+        assert all(env.turn == "Creationist" for env in venv.envs)
+    assert all((seen[:, 80] == 1).all() for seen in model.seen), "Checkpoints should see their own side's view"
+    print("✓ Self-play fallback test passed")
+
+def test_games_the_opponent_ends_at_once_are_reported():
+    # With one ply allowed every game ends on its first move. The turn
+    # carries over a reset, so the opponent's first move ends every other
+    # game, leaving the agent's action on its final position ignored
+    pool = OpponentPool(scripted=[RandomOpponent(0)], seed=0)
+    venv = SelfPlayVecEnv(3, pool, agent_side="Evolutionist", env_fn=functools.partial(OriginsEnv, max_plies=1))
+    obs = venv.reset()
+    at_once = 0
+    for _ in range(4):
+        finished = obs
+        obs, rewards, dones, infos = venv.step(venv.action_masks().argmax(axis=1))
+        assert dones.all() and (rewards == 0).all()
+        for i, info in enumerate(infos):
+            assert info["outcome"] == GameOutcome(None, "turn_limit", 1)
+            at_once += (info["terminal_observation"] == finished[i]).all()
+    assert at_once == 6
+    print("✓ Self-play first move ending test passed")
+
+def test_versus_env_replies_in_the_same_step():
+    env = make_versus_env("greedy", max_plies=30)
+    obs = env.reset()
+    for _ in range(40):
+        obs, reward, done, info = env.step(env.action_masks().argmax())
+        if done:
+            obs = env.reset()
+        assert env.turn == "Creationist", "Every observation should be the agent's turn"
+    print("✓ Versus opponent env test passed")
+
+if __name__ == "__main__":
+    test_agent_only_plays_its_side()
+    test_agent_plays_both_sides_in_its_perspective()
+    test_checkpoint_moves_that_dont_count_are_replaced()
+    test_games_the_opponent_ends_at_once_are_reported()
+    test_versus_env_replies_in_the_same_step()
+    print("✅ All self-play tests passed!")
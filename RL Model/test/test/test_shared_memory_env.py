@@ -0,0 +1,55 @@
+from origins_env import OriginsEnv
+from opponents import make_versus_env
+from shared_memory_env import SharedMemoryVecEnv
+import functools
+
+def test_shared_memory_env_matches_single_envs():
+    env_fn = functools.partial(OriginsEnv, max_plies=20)
+    venv = SharedMemoryVecEnv(4, workers=2, env_fn=env_fn, start_method="fork")
+    envs = [env_fn() for _ in range(4)]
+    try:
+        obs = venv.reset()
+        for _ in range(50):
+            actions = venv.action_masks().argmax(axis=1)
+            obs, rewards, dones, infos = venv.step(actions)
+            for i, env in enumerate(envs):
+                expected_obs, reward, done, info = env.step(actions[i])
+                assert rewards[i] == reward and dones[i] == done
+                if done:
+                    assert (infos[i]["terminal_observation"] == expected_obs).all()
+                    assert infos[i]["outcome"] == info["outcome"]
+                    env.reset()
+                assert (obs[i] == env.get_observation()).all()
+        assert venv.get_attr("plies") == [env.plies for env in envs]
+    finally:
+        venv.close()
+    print("✓ Shared memory env test passed")
+
+def test_shared_memory_env_seeds_each_env():
+    # A random opponent's replies depend on the seed; env i gets seed + i
+    env_fn = functools.partial(make_versus_env, "random", max_plies=30)
+    venv = SharedMemoryVecEnv(3, workers=2, env_fn=env_fn, start_method="fork")
+    envs = [env_fn() for _ in range(3)]
+    try:
+        venv.seed(7)
+        for i, env in enumerate(envs):
+            env.seed(7 + i)
+        obs = venv.reset()
+        assert all((obs[i] == env.reset()).all() for i, env in enumerate(envs))
+        for _ in range(40):
+            actions = venv.action_masks().argmax(axis=1)
+            obs, rewards, dones, infos = venv.step(actions)
+            for i, env in enumerate(envs):
+                expected_obs, reward, done, info = env.step(actions[i])
+                if done:
+                    expected_obs = env.reset()
+                assert rewards[i] == reward and dones[i] == done
+                assert (obs[i] == expected_obs).all()
+    finally:
+        venv.close()
+    print("✓ Shared memory env seeding test passed")
+
+if __name__ == "__main__":
+    test_shared_memory_env_matches_single_envs()
+    test_shared_memory_env_seeds_each_env()
+    print("✅ All shared memory env tests passed!")
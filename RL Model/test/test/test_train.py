@@ -0,0 +1,37 @@
+from origins_env import GRID_COLS, GRID_ROWS
+from opponents import make_versus_env
+from stable_baselines3.common.logger import Logger
+from train import WinRate
+import numpy as np
+
+class EnemySquareModel:
+    # An unmasked deterministic policy that always picks the last square,
+    # an Evolutionist piece at the start: a Creationist move that doesn't count
+    def __init__(self):
+        self.logger = Logger(folder=None, output_formats=[])
+
+    def predict(self, observation, deterministic=False):
+        return np.full(len(observation), GRID_ROWS * GRID_COLS - 1, dtype=np.int64), None
+
+def test_win_rate_games_end_with_moves_that_dont_count():
+    win_rate = WinRate(make_versus_env("random", max_plies=40), every=1, games=3)
+    win_rate.model = EnemySquareModel()
+    win_rate.num_timesteps = 1
+    win_rate._on_training_start()
+    assert win_rate._on_step()
+    assert win_rate.env.plies > 0, "Legal moves should have stood in for the policy's"
+    print("✓ Win rate fallback test passed")
+
+def test_win_rate_caps_steps_per_game():
+    win_rate = WinRate(make_versus_env("random"), every=1, games=2, target=0.5, max_steps=5)
+    win_rate.model = EnemySquareModel()
+    win_rate.num_timesteps = 1
+    win_rate._on_training_start()
+    # Neither game ends in 5 steps, so neither is won and the target isn't reached
+    assert win_rate._on_step() and win_rate.reached is None
+    print("✓ Win rate step cap test passed")
+
+if __name__ == "__main__":
+    test_win_rate_games_end_with_moves_that_dont_count()
+    test_win_rate_caps_steps_per_game()
+    print("✅ All training tests passed!")
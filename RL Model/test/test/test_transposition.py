@@ -0,0 +1,58 @@
+from origins_env import OriginsEnv
+from transposition import EXACT, LOWER, UPPER, NO_MOVE, TranspositionTable
+
+def test_store_and_probe():
+    tt = TranspositionTable(size_mb=1)
+    assert tt.probe(12345) is None
+    tt.store(12345, 3, EXACT, 42, 7)
+    assert tt.probe(12345) == (3, EXACT, 42, 7)
+    assert (tt.hits, tt.misses, tt.collisions, tt.stores) == (1, 1, 0, 1)
+    # A key sharing the bucket is a miss that counts as a collision
+    assert tt.probe(12345 + tt.n_buckets) is None
+    assert tt.collisions == 1
+    print("✓ Transposition store/probe test passed")
+
+def test_replacement_scheme():
+    tt = TranspositionTable(size_mb=1)
+    n = tt.n_buckets
+    a, b, c, d = 5, 5 + n, 5 + 2 * n, 5 + 3 * n  # all in bucket 5
+    tt.store(a, 6, EXACT, 1, 10)
+    # Shallower entries go to the always-replace slot and leave the deep one
+    tt.store(b, 2, LOWER, 2, 20)
+    assert tt.probe(a) == (6, EXACT, 1, 10) and tt.probe(b) == (2, LOWER, 2, 20)
+    tt.store(c, 1, UPPER, 3, 30)
+    assert tt.probe(b) is None and tt.probe(c) == (1, UPPER, 3, 30)
+    assert tt.replacements == 1
+    # As deep or deeper takes over the depth-preferred slot
+    tt.store(d, 6, EXACT, 4, 40)
+    assert tt.probe(a) is None and tt.probe(d) == (6, EXACT, 4, 40)
+    assert tt.replacements == 2
+    # The same position may always be overwritten, even shallower, and keeps
+    # its best move when the new entry has none
+    tt.store(d, 1, LOWER, 5, NO_MOVE)
+    assert tt.probe(d) == (1, LOWER, 5, 40)
+    assert tt.replacements == 2 and tt.stores == 5
+    stats = tt.stats()
+    assert stats["filled"] == 2 and stats["entries"] == 2 * n
+    assert stats["probes"] == stats["hits"] + stats["misses"]
+    tt.clear()
+    assert tt.probe(d) is None and tt.stats()["filled"] == 0 and tt.stores == 0
+    print("✓ Transposition replacement test passed")
+
+def test_position_hash_follows_the_game():
+    env = OriginsEnv()
+    start = env.position_hash()
+    env.make_move((0, 0), (1, 0))
+    moved = env.position_hash()
+    assert moved != start
+    env.unmake_move()
+    assert env.position_hash() == start
+    env.turn = "Evolutionist"
+    assert env.position_hash() != start, "The side to move is part of the key"
+    print("✓ Position hash test passed")
+
+if __name__ == "__main__":
+    test_store_and_probe()
+    test_replacement_scheme()
+    test_position_hash_follows_the_game()
+    print("✅ All transposition table tests passed!")